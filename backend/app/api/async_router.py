@@ -0,0 +1,87 @@
+import inspect
+from typing import Any, Callable, Dict
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+
+# 同步依赖 -> 异步依赖 映射
+ASYNC_DEPENDENCIES: Dict[Callable, Callable] = {
+    deps.get_db: deps.get_async_db,
+    deps.get_current_user: deps.get_current_user_async,
+    deps.get_current_user_claims: deps.get_current_user_claims_async,
+}
+
+# add_api_route 中与 APIRoute 属性同名的参数（按签名获取，随 FastAPI 版本增减）
+ROUTE_OPTIONS = [
+    name for name in inspect.signature(APIRouter.add_api_route).parameters
+    if name not in ("self", "path", "endpoint")
+]
+
+
+def _async_dependency(dependency: DependsParam) -> DependsParam:
+    if dependency.dependency in ASYNC_DEPENDENCIES:
+        return Depends(ASYNC_DEPENDENCIES[dependency.dependency], use_cache=dependency.use_cache)
+    return dependency
+
+
+def to_async_endpoint(endpoint: Callable) -> Callable:
+    """
+    将同步接口函数包装为异步接口
+
+    依赖替换为异步版本，函数体通过 AsyncSession.run_sync 执行：
+    ORM 调用走异步驱动，不再占用 Starlette 线程池，接口逻辑只需维护一份。
+    不使用数据库的接口仍放到线程池执行，避免阻塞事件循环。
+    """
+    signature = inspect.signature(endpoint)
+    parameters = []
+    db_param = None
+    for param in signature.parameters.values():
+        default = param.default
+        if isinstance(default, DependsParam) and default.dependency in ASYNC_DEPENDENCIES:
+            if default.dependency is deps.get_db:
+                db_param = param.name
+                param = param.replace(annotation=AsyncSession)
+            param = param.replace(default=_async_dependency(default))
+        parameters.append(param)
+
+    async def async_endpoint(**kwargs: Any) -> Any:
+        if db_param is None:
+            return await run_in_threadpool(endpoint, **kwargs)
+        async_db: AsyncSession = kwargs[db_param]
+
+        def call(session) -> Any:
+            kwargs[db_param] = session
+            return endpoint(**kwargs)
+
+        return await async_db.run_sync(call)
+
+    async_endpoint.__signature__ = signature.replace(parameters=parameters)
+    async_endpoint.__name__ = endpoint.__name__
+    async_endpoint.__doc__ = endpoint.__doc__
+    return async_endpoint
+
+
+def to_async_router(router: APIRouter) -> APIRouter:
+    """
+    生成路由的异步版本（原本就是 async 的接口保持不变）
+    路由的全部配置（依赖、标签、response_model_* 选项等）原样复制，路由级依赖同样替换为异步版本
+    """
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+        endpoint = route.endpoint
+        if not inspect.iscoroutinefunction(endpoint):
+            endpoint = to_async_endpoint(endpoint)
+        options = {name: getattr(route, name) for name in ROUTE_OPTIONS if hasattr(route, name)}
+        options.update(
+            methods=list(route.methods),
+            dependencies=[_async_dependency(dependency) for dependency in route.dependencies],
+            route_class_override=type(route),
+        )
+        async_router.add_api_route(route.path, endpoint, **options)
+    return async_router
@@ -1,12 +1,16 @@
-from typing import Generator
-from fastapi import Depends, HTTPException, status
+import secrets
+from typing import AsyncGenerator, Generator
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.core import security
+from app.core.cache import user_cache, token_version_cache
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, AsyncSessionLocal
 from app.models.user import User
 from app.schemas.user import TokenPayload
 
@@ -14,27 +18,115 @@ reuseable_oauth = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
 )
 
-def get_db() -> Generator:
+# 只读请求：配置从库时路由到从库
+READ_ONLY_METHODS = ("GET", "HEAD")
+
+def get_db(request: Request) -> Generator:
     try:
         db = SessionLocal()
+        db.info["read_only"] = request.method in READ_ONLY_METHODS
         yield db
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reuseable_oauth)
-) -> User:
+async def get_async_db(request: Request) -> AsyncGenerator:
+    """异步 Session 依赖（DB_ASYNC_MODE 开启时使用）"""
+    async with AsyncSessionLocal() as db:
+        db.info["read_only"] = request.method in READ_ONLY_METHODS
+        yield db
+
+def decode_token(token: str) -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
+
+def _check_token_version(token_data: TokenPayload, current_version: int) -> None:
+    """令牌版本校验：修改密码后旧版本令牌失效"""
+    if token_data.ver is not None and token_data.ver != current_version:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token has been revoked",
+        )
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reuseable_oauth)
+) -> User:
+    token_data = decode_token(token)
+    # 记录当前用户，供读写分离判断 read-your-writes 粘滞
+    db.info["user_id"] = token_data.sub
+    snapshot = user_cache.get(token_data.sub)
+    if snapshot is not None:
+        _check_token_version(token_data, snapshot["token_version"])
+        # 命中缓存：由快照重建实例并挂到当前 Session（load=False 不会发出 SELECT）
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
     user = db.query(User).filter(User.id == token_data.sub).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    user_cache.set(user.id, user_snapshot(user))
+    _check_token_version(token_data, user.token_version)
     return user
+
+def get_current_user_claims(
+    db: Session = Depends(get_db), token: str = Depends(reuseable_oauth)
+) -> User:
+    """
+    只读接口使用的鉴权依赖
+
+    开启 AUTH_CLAIMS_MODE 时直接由令牌中的声明构造用户（不查询 user 表），
+    仅通过令牌版本号做吊销检查；返回的 User 未绑定 Session，只含 id、username 等
+    不可变字段（昵称、头像需使用 get_current_user 读取最新值）。
+    未开启或令牌不含声明时回退到 get_current_user。
+    """
+    token_data = decode_token(token)
+    if not settings.AUTH_CLAIMS_MODE or token_data.ver is None:
+        return get_current_user(db=db, token=token)
+
+    db.info["user_id"] = token_data.sub
+    current_version = token_version_cache.get(token_data.sub)
+    if current_version is None:
+        current_version = db.query(User.token_version).filter(User.id == token_data.sub).scalar()
+        if current_version is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        token_version_cache.set(token_data.sub, current_version)
+    _check_token_version(token_data, current_version)
+
+    return User(
+        id=token_data.sub,
+        username=token_data.username,
+        token_version=token_data.ver,
+    )
+
+def require_internal_token(x_internal_token: str = Header(None)) -> None:
+    """内部接口鉴权：未配置 INTERNAL_STATS_TOKEN 时接口不存在，令牌不符时拒绝访问"""
+    if not settings.INTERNAL_STATS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_internal_token or not secrets.compare_digest(
+        x_internal_token.encode(), settings.INTERNAL_STATS_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+def user_snapshot(user: User) -> dict:
+    """提取用户的列字段快照，用于缓存"""
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reuseable_oauth)
+) -> User:
+    """get_current_user 的异步版本，复用同步逻辑，通过 run_sync 在异步 Session 上执行"""
+    return await db.run_sync(lambda session: get_current_user(db=session, token=token))
+
+async def get_current_user_claims_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reuseable_oauth)
+) -> User:
+    """get_current_user_claims 的异步版本"""
+    return await db.run_sync(lambda session: get_current_user_claims(db=session, token=token))
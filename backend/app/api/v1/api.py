@@ -1,12 +1,21 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import login, users, notes, todos, checkin, weight, images, recipes
+from app.api.v1.endpoints import login, users, notes, todos, checkin, weight, images, recipes, search
+from app.core.config import settings
+
+def _router(router: APIRouter) -> APIRouter:
+    """DB_ASYNC_MODE 开启时使用接口模块的异步版本"""
+    if settings.DB_ASYNC_MODE:
+        from app.api.async_router import to_async_router
+        return to_async_router(router)
+    return router
 
 api_router = APIRouter()
-api_router.include_router(login.router, tags=["login"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(notes.router, prefix="/notes", tags=["notes"])
-api_router.include_router(todos.router, prefix="/todos", tags=["todos"])
-api_router.include_router(checkin.router, prefix="/checkin", tags=["checkin"])
-api_router.include_router(weight.router, prefix="/weight", tags=["weight"])
-api_router.include_router(images.router, prefix="/images", tags=["images"])
-api_router.include_router(recipes.router, prefix="/recipes", tags=["recipes"])
+api_router.include_router(_router(login.router), tags=["login"])
+api_router.include_router(_router(users.router), prefix="/users", tags=["users"])
+api_router.include_router(_router(notes.router), prefix="/notes", tags=["notes"])
+api_router.include_router(_router(todos.router), prefix="/todos", tags=["todos"])
+api_router.include_router(_router(checkin.router), prefix="/checkin", tags=["checkin"])
+api_router.include_router(_router(weight.router), prefix="/weight", tags=["weight"])
+api_router.include_router(_router(images.router), prefix="/images", tags=["images"])
+api_router.include_router(_router(recipes.router), prefix="/recipes", tags=["recipes"])
+api_router.include_router(_router(search.router), prefix="/search", tags=["search"])
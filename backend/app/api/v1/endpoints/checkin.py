@@ -1,5 +1,5 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, case
 from datetime import date, datetime
@@ -11,6 +11,10 @@ from app.schemas.checkin import (
     CheckinRecordCreate, CheckinRecordOut,
     DailyCheckinResponse, DailyCheckinItem, DailyCheckinStat
 )
+from app.utils.csv_export import csv_response
+from app.utils.etag import check_not_modified
+from app.utils.fast_json import fast_response, json_response, schema_fields
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
@@ -18,11 +22,17 @@ router = APIRouter()
 
 @router.get("/item/list", response_model=List[CheckinItemOut])
 def get_checkin_items(
+    request: Request,
+    response: Response,
     status: Optional[int] = Query(None, description="按状态筛选：1=启用, 0=禁用"),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
-    """获取打卡项列表，包含累计完成次数统计"""
+    """获取打卡项列表，包含累计完成次数统计，支持 If-None-Match 条件请求"""
+    # 累计完成次数来自打卡记录，版本同时依赖打卡项和打卡记录
+    cached = check_not_modified(db, request, response, current_user.id, CheckinItem, CheckinRecord)
+    if cached is not None:
+        return cached
     # 使用 case 表达式进行跨数据库兼容的计数（MySQL 不支持 .filter() 传给聚合函数）
     query = db.query(
         CheckinItem,
@@ -36,13 +46,11 @@ def get_checkin_items(
         
     results = query.group_by(CheckinItem.id).all()
     
-    out_items = []
-    for item, count in results:
-        item_out = CheckinItemOut.model_validate(item)
-        item_out.complete_count = count
-        out_items.append(item_out)
-    
-    return out_items
+    fields = [name for name in schema_fields(CheckinItemOut) if name != "complete_count"]
+    return json_response([
+        dict({name: getattr(item, name) for name in fields}, complete_count=int(count))
+        for item, count in results
+    ], response)
 
 @router.post("/item/add", response_model=CheckinItemOut)
 def create_checkin_item(
@@ -102,7 +110,7 @@ def delete_checkin_item(
 def get_daily_checkin(
     target_date: date = Path(...),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """获取指定日期的打卡列表及当日统计数据"""
     # 1. 获取所有启用的打卡项
@@ -182,13 +190,15 @@ def save_checkin_record(
 
 @router.get("/record/history", response_model=List[CheckinRecordOut])
 def get_checkin_history(
+    response: Response,
     item_id: Optional[int] = Query(None),
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1),
+    cursor: Optional[str] = Query(None, description="游标分页：上一页响应头 X-Next-Cursor 的值"),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """获取打卡历史记录，支持筛选和分页"""
     query = db.query(CheckinRecord).filter(CheckinRecord.user_id == current_user.id)
@@ -200,4 +210,23 @@ def get_checkin_history(
     if end_date:
         query = query.filter(CheckinRecord.check_date <= end_date)
         
-    return query.order_by(desc(CheckinRecord.check_date)).offset(skip).limit(limit).all()
+    sort_keys = [(CheckinRecord.check_date, True), (CheckinRecord.id, True)]
+    return fast_response(paginate(query, sort_keys, response, cursor, skip, limit), CheckinRecordOut, response)
+
+@router.get("/record/export")
+def export_checkin_records(
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """导出所有打卡记录为 CSV（流式输出）"""
+    user_id = current_user.id
+    return csv_response(
+        "checkin_records",
+        ["打卡日期", "打卡项", "状态(0=未完成,1=已完成)", "备注", "录入时间"],
+        lambda db: db.query(
+            CheckinRecord.check_date, CheckinItem.item_name, CheckinRecord.check_status,
+            CheckinRecord.item_remark, CheckinRecord.create_time,
+        ).join(CheckinItem, CheckinItem.id == CheckinRecord.item_id).filter(
+            CheckinRecord.user_id == user_id
+        ).order_by(desc(CheckinRecord.check_date), CheckinRecord.id),
+        user_id,
+    )
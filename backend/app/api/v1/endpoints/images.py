@@ -1,57 +1,91 @@
 import os
 import secrets
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.core.config import settings
 from app.models.user import User
+from app.utils.file_response import REVALIDATE_CACHE_CONTROL, immutable_file_response
+from app.utils.image_derivatives import get_derivative, schedule_derivatives
+from app.utils.upload_store import (
+    cached_upload_path, object_path, objects_tmp_dir, quota_bytes, register_upload,
+    resolve_upload_path, user_usage,
+)
+from app.utils.uploads import max_upload_bytes, stream_to_temp
 
 router = APIRouter()
 
-UPLOAD_DIR = "upload"
-
 @router.post("/upload")
 async def upload_image(
     file: UploadFile = File(...),
+    db: Session = Depends(deps.get_db),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """
     上传图片接口
+    分块写入临时文件并计算内容哈希，超过 UPLOAD_MAX_SIZE_MB 返回 413；
+    相同内容只存储一份（内容寻址），超出用户配额返回 413
     """
     # 校验文件类型
     if not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="只能上传图片文件")
     
-    # 确保用户目录存在
-    user_dir = os.path.join(UPLOAD_DIR, str(current_user.id))
-    if not os.path.exists(user_dir):
-        os.makedirs(user_dir)
-        
     # 生成随机文件名
-    file_ext = os.path.splitext(file.filename)[1]
+    file_ext = os.path.splitext(file.filename)[1].lower()[:10]
     random_name = f"{secrets.token_hex(8)}{file_ext}"
-    file_path = os.path.join(user_dir, random_name)
     
     # 保存文件
-    with open(file_path, "wb") as f:
-        content = await file.read()
-        f.write(content)
+    tmp_path, size, sha256 = await stream_to_temp(file, objects_tmp_dir(), max_upload_bytes())
+    deduplicated = await run_in_threadpool(
+        register_upload, db, current_user.id, random_name, file_ext, tmp_path, size, sha256
+    )
+    if not deduplicated:
+        # 后台预生成缩略图及标准宽度
+        schedule_derivatives(object_path(sha256, file_ext))
         
     # 返回可访问的 URL (假设后端静态文件挂载在 /upload)
     return {
         "url": f"/api/v1/images/file/{current_user.id}/{random_name}",
-        "filename": random_name
+        "filename": random_name,
+        "size": size,
+        "deduplicated": deduplicated,
     }
 
-from fastapi.responses import FileResponse
+@router.get("/usage")
+def get_upload_usage(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """
+    获取当前用户的存储用量（按去重后的文件大小计算）
+    """
+    return {
+        "used_bytes": user_usage(db, current_user.id),
+        "quota_bytes": quota_bytes() if settings.UPLOAD_QUOTA_MB else None,
+    }
 
 @router.get("/file/{user_id}/{filename}")
-def get_image(user_id: int, filename: str):
+async def get_image(
+    request: Request,
+    user_id: int,
+    filename: str,
+    w: Optional[int] = Query(None, ge=1, le=4096, description="期望宽度（像素），按标准宽度向上取整返回缩略图"),
+    db: Session = Depends(deps.get_db),
+):
     """
     查看图片接口
+    通过上传映射定位内容寻址存储中的文件（无映射的旧文件按原路径访问）
+    文件内容不可变：长期缓存 + 强 ETag，支持 304 和 Range 请求
     """
-    file_path = os.path.join(UPLOAD_DIR, str(user_id), filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="图片不存在")
-    return FileResponse(file_path)
+    file_path = cached_upload_path(user_id, filename)
+    if file_path is None:
+        file_path = await run_in_threadpool(resolve_upload_path, db, user_id, filename)
+    if w:
+        derivative = await get_derivative(file_path, w)
+        if derivative is None:
+            # 没有生成缩略图时回退原图；同一 URL 之后可能返回缩略图，因此不能长期缓存
+            return immutable_file_response(request, file_path, REVALIDATE_CACHE_CONTROL)
+        file_path = derivative
+    return immutable_file_response(request, file_path)
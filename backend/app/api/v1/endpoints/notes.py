@@ -1,34 +1,58 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.note import Note
 from app.models.user import User
 from app.schemas.note import NoteCreate, NoteOut, NoteUpdate
+from app.utils.csv_export import csv_response
+from app.utils.etag import check_not_modified
+from app.utils.fast_json import fast_response
+from app.utils.note_search import search_notes
+from app.utils.pagination import paginate
+from app.utils.sparse_fields import select_fields, sparse_options, sparse_response
+from app.utils.upload_store import update_references
 
 router = APIRouter()
 
 @router.get("/", response_model=List[NoteOut])
 def read_notes(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="游标分页：上一页响应头 X-Next-Cursor 的值"),
     category_path: Optional[str] = None,
     keyword: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如：id,title,update_time"),
+    excerpt: Optional[int] = Query(None, ge=10, le=500, description="摘要模式：返回内容前 N 个字符（excerpt 字段），不返回完整内容"),
 ) -> Any:
     """
     获取笔记列表，支持分类筛选和关键词搜索
+    支持稀疏字段（fields）和摘要模式（excerpt），此时不加载完整内容
+    支持 If-None-Match 条件请求，数据未变化时返回 304
     """
+    cached = check_not_modified(db, request, response, current_user.id, Note)
+    if cached is not None:
+        return cached
     query = db.query(Note).filter(Note.user_id == current_user.id, Note.is_delete == 0)
+    selected = select_fields(fields, NoteOut, excerpt, large_fields=("content",))
+    if selected is not None:
+        query = query.options(*sparse_options(Note, selected, ("id", "update_time"), Note.content, excerpt))
     
     if category_path:
         query = query.filter(Note.category_path == category_path)
     if keyword:
-        query = query.filter(Note.title.contains(keyword) | Note.content.contains(keyword))
-        
-    notes = query.order_by(Note.update_time.desc()).offset(skip).limit(limit).all()
-    return notes
+        # 全文检索，按相关度排序（不支持游标分页）
+        notes = search_notes(db, query, current_user.id, keyword, skip, limit)
+    else:
+        sort_keys = [(Note.update_time, True), (Note.id, True)]
+        notes = paginate(query, sort_keys, response, cursor, skip, limit)
+    if selected is not None:
+        return sparse_response(notes, selected, excerpt, response)
+    return fast_response(notes, NoteOut, response)
 
 @router.post("/", response_model=NoteOut)
 def create_note(
@@ -45,15 +69,31 @@ def create_note(
         user_id=current_user.id
     )
     db.add(db_obj)
+    update_references(db, [], [db_obj.content])
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+@router.get("/export")
+def export_notes(
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """导出所有笔记为 CSV（流式输出）"""
+    user_id = current_user.id
+    return csv_response(
+        "notes",
+        ["标题", "分类", "内容格式", "内容", "创建时间", "更新时间"],
+        lambda db: db.query(
+            Note.title, Note.category_path, Note.content_type, Note.content, Note.create_time, Note.update_time,
+        ).filter(Note.user_id == user_id, Note.is_delete == 0).order_by(Note.id.desc()),
+        user_id,
+    )
+
 @router.get("/{note_id}", response_model=NoteOut)
 def read_note(
     note_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """
     获取单条笔记详情
@@ -78,9 +118,12 @@ def update_note(
     if not db_obj:
         raise HTTPException(status_code=404, detail="Note not found")
     
+    old_content = db_obj.content
     update_data = note_in.model_dump(exclude_unset=True)
     for field in update_data:
         setattr(db_obj, field, update_data[field])
+    if "content" in update_data:
+        update_references(db, [old_content], [db_obj.content])
     
     db.add(db_obj)
     db.commit()
@@ -102,6 +145,7 @@ def delete_note(
         raise HTTPException(status_code=404, detail="Note not found")
     
     db_obj.is_delete = 1
+    update_references(db, [db_obj.content], [])
     db.add(db_obj)
     db.commit()
     return {"status": "ok"}
@@ -1,28 +1,50 @@
 from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.recipe import Recipe
 from app.models.user import User
-from app.schemas.recipe import RecipeCreate, RecipeOut, RecipeUpdate
+from app.schemas.recipe import RecipeCreate, RecipeOut, RecipeUpdate, RecipeIngredientMatch
+from app.utils.csv_export import csv_response
+from app.utils.etag import check_not_modified
+from app.utils.fast_json import fast_response
+from app.utils.pagination import paginate
+from app.utils.sparse_fields import select_fields, sparse_options, sparse_response
+from app.utils.recipe_ingredients import search_by_ingredients, sync_recipe_ingredients
+from app.utils.upload_store import update_references
 
 router = APIRouter()
 
 # Recipe Endpoints
 @router.get("/", response_model=List[RecipeOut])
 def read_recipes(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="游标分页：上一页响应头 X-Next-Cursor 的值"),
     category: Optional[str] = None,
     keyword: Optional[str] = None,
     is_starred: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="只返回指定字段，逗号分隔，如：id,name,image_url"),
+    excerpt: Optional[int] = Query(None, ge=10, le=500, description="摘要模式：返回食材清单前 N 个字符（excerpt 字段），不返回食材和步骤"),
 ) -> Any:
     """
     获取菜谱列表，支持分类筛选和关键词搜索
+    支持稀疏字段（fields）和摘要模式（excerpt），此时不加载食材清单和烹饪步骤
+    支持 If-None-Match 条件请求，数据未变化时返回 304
     """
+    cached = check_not_modified(db, request, response, current_user.id, Recipe)
+    if cached is not None:
+        return cached
     query = db.query(Recipe).filter(Recipe.user_id == current_user.id, Recipe.is_delete == 0)
+    selected = select_fields(fields, RecipeOut, excerpt, large_fields=("ingredients", "steps"))
+    if selected is not None:
+        query = query.options(*sparse_options(
+            Recipe, selected, ("id", "is_starred", "update_time"), Recipe.ingredients, excerpt
+        ))
     
     if category:
         query = query.filter(Recipe.category == category)
@@ -35,8 +57,40 @@ def read_recipes(
             Recipe.remark.contains(keyword)
         )
         
-    recipes = query.order_by(Recipe.is_starred.desc(), Recipe.update_time.desc()).offset(skip).limit(limit).all()
-    return recipes
+    sort_keys = [(Recipe.is_starred, True), (Recipe.update_time, True), (Recipe.id, True)]
+    recipes = paginate(query, sort_keys, response, cursor, skip, limit)
+    if selected is not None:
+        return sparse_response(recipes, selected, excerpt, response)
+    return fast_response(recipes, RecipeOut, response)
+
+@router.get("/search/ingredients", response_model=List[RecipeIngredientMatch])
+def search_recipes_by_ingredients(
+    items: str = Query(..., description="食材，多个用逗号分隔，如：鸡蛋,西红柿"),
+    match_all: bool = Query(False, description="是否要求包含全部食材"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """
+    按食材检索菜谱（走食材索引），按覆盖度排序
+    """
+    wanted = [name for name in items.replace("，", ",").split(",") if name.strip()]
+    ranked = search_by_ingredients(db, current_user.id, wanted, match_all=match_all, limit=limit)
+    if not ranked:
+        return []
+    recipes = {
+        r.id: r for r in db.query(Recipe).filter(Recipe.id.in_([rid for rid, _, _ in ranked])).all()
+    }
+    requested = len({name.strip().lower() for name in wanted})
+    return [
+        RecipeIngredientMatch(
+            recipe=recipes[rid],
+            matched_ingredients=sorted(names),
+            coverage=round(len(names) / requested, 4),
+            ingredient_count=total,
+        )
+        for rid, names, total in ranked if rid in recipes
+    ]
 
 @router.post("/", response_model=RecipeOut)
 def create_recipe(
@@ -53,15 +107,34 @@ def create_recipe(
         user_id=current_user.id
     )
     db.add(db_obj)
+    db.flush()
+    sync_recipe_ingredients(db, db_obj)
+    update_references(db, [], [db_obj.image_url])
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+@router.get("/export")
+def export_recipes(
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """导出所有菜谱为 CSV（流式输出）"""
+    user_id = current_user.id
+    return csv_response(
+        "recipes",
+        ["菜谱名称", "分类", "食材清单", "烹饪步骤", "烹饪时长(分钟)", "难度", "备注", "是否收藏", "创建时间"],
+        lambda db: db.query(
+            Recipe.name, Recipe.category, Recipe.ingredients, Recipe.steps, Recipe.duration,
+            Recipe.difficulty, Recipe.remark, Recipe.is_starred, Recipe.create_time,
+        ).filter(Recipe.user_id == user_id, Recipe.is_delete == 0).order_by(Recipe.id.desc()),
+        user_id,
+    )
+
 @router.get("/{recipe_id}", response_model=RecipeOut)
 def read_recipe(
     recipe_id: int,
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """
     获取单条菜谱详情
@@ -86,9 +159,14 @@ def update_recipe(
     if not db_obj:
         raise HTTPException(status_code=404, detail="Recipe not found")
     
+    old_image_url = db_obj.image_url
     update_data = recipe_in.model_dump(exclude_unset=True)
     for field in update_data:
         setattr(db_obj, field, update_data[field])
+    if "ingredients" in update_data:
+        sync_recipe_ingredients(db, db_obj)
+    if "image_url" in update_data:
+        update_references(db, [old_image_url], [db_obj.image_url])
     
     db.add(db_obj)
     db.commit()
@@ -110,6 +188,8 @@ def delete_recipe(
         raise HTTPException(status_code=404, detail="Recipe not found")
     
     db_obj.is_delete = 1
+    sync_recipe_ingredients(db, db_obj)
+    update_references(db, [db_obj.image_url], [])
     db.add(db_obj)
     db.commit()
     return {"status": "ok"}
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.api import deps
+from app.core.config import settings
+from app.db import session as db_session
+from app.models.checkin import CheckinItem
+from app.models.note import Note
+from app.models.recipe import Recipe
+from app.models.todo import Todo
+from app.models.user import User
+from app.schemas.search import SearchHit, SearchResponse
+from app.utils.note_search import search_notes
+from app.utils.query_timeout import statement_timeout
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+SEARCH_TYPES = ("note", "todo", "recipe", "checkin")
+
+
+def _snippet(text: Optional[str], keyword: str, width: int = 60) -> Optional[str]:
+    """截取关键词附近的文本片段"""
+    if not text:
+        return None
+    pos = text.lower().find(keyword.lower())
+    start = max(pos - width // 3, 0) if pos >= 0 else 0
+    snippet = text[start:start + width]
+    return ("…" if start > 0 else "") + snippet + ("…" if start + width < len(text) else "")
+
+
+def _score(rank: int, title: str, keyword: str) -> float:
+    """合并排序分数：模块内排名越靠前分数越高，标题命中额外加分"""
+    score = 1.0 / (1 + rank)
+    if keyword.lower() in (title or "").lower():
+        score += 1.0
+    return round(score, 4)
+
+
+def _search_notes(db: Session, user_id: int, keyword: str, limit: int) -> List[SearchHit]:
+    query = db.query(Note).filter(Note.user_id == user_id, Note.is_delete == 0)
+    notes = search_notes(db, query, user_id, keyword, 0, limit)
+    return [
+        SearchHit(type="note", id=n.id, title=n.title, snippet=_snippet(n.content, keyword),
+                  update_time=n.update_time, score=_score(i, n.title, keyword))
+        for i, n in enumerate(notes)
+    ]
+
+
+def _search_todos(db: Session, user_id: int, keyword: str, limit: int) -> List[SearchHit]:
+    todos = db.query(Todo).filter(
+        Todo.user_id == user_id,
+        or_(Todo.title.contains(keyword), Todo.remark.contains(keyword)),
+    ).order_by(Todo.status.asc(), Todo.update_time.desc()).limit(limit).all()
+    return [
+        SearchHit(type="todo", id=t.id, title=t.title, snippet=_snippet(t.remark, keyword),
+                  update_time=t.update_time, score=_score(i, t.title, keyword))
+        for i, t in enumerate(todos)
+    ]
+
+
+def _search_recipes(db: Session, user_id: int, keyword: str, limit: int) -> List[SearchHit]:
+    recipes = db.query(Recipe).filter(
+        Recipe.user_id == user_id,
+        Recipe.is_delete == 0,
+        Recipe.name.contains(keyword) | Recipe.ingredients.contains(keyword) | Recipe.remark.contains(keyword),
+    ).order_by(Recipe.is_starred.desc(), Recipe.update_time.desc()).limit(limit).all()
+    return [
+        SearchHit(type="recipe", id=r.id, title=r.name, snippet=_snippet(r.ingredients, keyword),
+                  update_time=r.update_time, score=_score(i, r.name, keyword))
+        for i, r in enumerate(recipes)
+    ]
+
+
+def _search_checkin(db: Session, user_id: int, keyword: str, limit: int) -> List[SearchHit]:
+    items = db.query(CheckinItem).filter(
+        CheckinItem.user_id == user_id,
+        CheckinItem.item_name.contains(keyword),
+    ).order_by(CheckinItem.status.desc(), CheckinItem.update_time.desc()).limit(limit).all()
+    return [
+        SearchHit(type="checkin", id=c.id, title=c.item_name, snippet=None,
+                  update_time=c.update_time, score=_score(i, c.item_name, keyword))
+        for i, c in enumerate(items)
+    ]
+
+
+SEARCHERS: Dict[str, Callable[[Session, int, str, int], List[SearchHit]]] = {
+    "note": _search_notes,
+    "todo": _search_todos,
+    "recipe": _search_recipes,
+    "checkin": _search_checkin,
+}
+
+
+async def _run_search(
+    searcher: Callable, user_id: int, keyword: str, limit: int, timeout_ms: int
+) -> List[SearchHit]:
+    """
+    每个模块使用独立的只读 Session 并发执行
+    语句执行时间在数据库侧限制为时间预算：取消等待后线程中的查询也会随之终止并释放连接
+    """
+    def search(session: Session) -> List[SearchHit]:
+        with statement_timeout(session, timeout_ms):
+            return searcher(session, user_id, keyword, limit)
+
+    if settings.DB_ASYNC_MODE:
+        async with db_session.AsyncSessionLocal() as db:
+            db.info.update(read_only=True, user_id=user_id)
+            return await db.run_sync(search)
+
+    def run() -> List[SearchHit]:
+        db = db_session.SessionLocal()
+        try:
+            db.info.update(read_only=True, user_id=user_id)
+            return search(db)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(run)
+
+
+@router.get("/", response_model=SearchResponse)
+async def search_all(
+    q: str = Query(..., min_length=1, description="搜索关键词"),
+    types: Optional[str] = Query(None, description="限定模块，逗号分隔：note,todo,recipe,checkin"),
+    limit_per_type: int = Query(10, ge=1, le=50),
+    budget_ms: Optional[int] = Query(None, ge=50, le=5000, description="时间预算（毫秒），默认取配置"),
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """
+    统一搜索：并发查询笔记、待办、菜谱、打卡项，合并后按相关度排序
+    超出时间预算的模块直接跳过，返回部分结果
+    """
+    keyword = q.strip()
+    wanted = [t for t in (types.split(",") if types else SEARCH_TYPES) if t in SEARCHERS]
+    budget_ms = budget_ms or settings.SEARCH_TIME_BUDGET_MS
+    tasks = {
+        asyncio.ensure_future(_run_search(SEARCHERS[t], current_user.id, keyword, limit_per_type, budget_ms)): t
+        for t in wanted
+    }
+    done, pending = await asyncio.wait(tasks, timeout=budget_ms / 1000)
+    for task in pending:
+        task.cancel()
+
+    items: List[SearchHit] = []
+    timed_out = sorted(tasks[task] for task in pending)
+    failed = []
+    for task in done:
+        if task.exception() is not None:
+            failed.append(tasks[task])
+            logger.warning("搜索模块 %s 失败（用户 %s）", tasks[task], current_user.id, exc_info=task.exception())
+            continue
+        items.extend(task.result())
+    if timed_out:
+        logger.warning("搜索模块 %s 超出时间预算 %sms（用户 %s）", ",".join(timed_out), budget_ms, current_user.id)
+    items.sort(key=lambda hit: (-hit.score, hit.type, -hit.id))
+
+    return SearchResponse(
+        keyword=keyword,
+        items=items,
+        partial=bool(timed_out or failed),
+        timed_out=timed_out,
+        failed=sorted(failed),
+    )
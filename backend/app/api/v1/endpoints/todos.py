@@ -1,28 +1,25 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import or_
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.models.todo import Todo
 from app.models.user import User
-from app.schemas.todo import TodoCreate, TodoOut, TodoUpdate
+from app.schemas.todo import TodoCreate, TodoOut, TodoPage, TodoUpdate
+from app.utils.csv_export import csv_response
+from app.utils.etag import check_not_modified
 
 router = APIRouter()
 
-@router.get("/", response_model=List[TodoOut])
-def read_todos(
-    db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+def _filter_todos(
+    query,
     category_path: Optional[str] = None,
     status: Optional[int] = None,
     is_starred: Optional[int] = None,
     priority: Optional[int] = None,
     q: Optional[str] = None,
-) -> Any:
-    """
-    获取待办列表
-    """
-    query = db.query(Todo).filter(Todo.user_id == current_user.id)
+):
     if category_path:
         query = query.filter(Todo.category_path == category_path)
     if status is not None:
@@ -33,8 +30,92 @@ def read_todos(
         query = query.filter(Todo.priority == priority)
     if q:
         query = query.filter(or_(Todo.title.contains(q), Todo.remark.contains(q)))
-        
-    return query.order_by(Todo.status.asc(), Todo.priority.asc(), Todo.deadline.asc()).all()
+    return query
+
+@router.get("/", response_model=TodoPage)
+def read_todos(
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user_claims),
+    category_path: Optional[str] = None,
+    status: Optional[int] = None,
+    is_starred: Optional[int] = None,
+    priority: Optional[int] = None,
+    q: Optional[str] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    completed_within_days: int = Query(
+        7, ge=0, description="隐藏完成于 N 天前（按自然日）的待办，0 表示显示全部已完成"
+    ),
+    created_order: Optional[str] = Query(
+        None, pattern="^(asc|desc)$", description="按创建时间排序，默认按状态、优先级、截止时间"
+    ),
+) -> Any:
+    """
+    分页获取待办列表，同时返回按状态、分类的计数，支持 If-None-Match 条件请求
+    """
+    since = None
+    if completed_within_days:
+        # 边界取到自然日，结果只随数据变化和日期变化，可以参与 ETag；
+        # 日期按数据库时钟计算，与数据库写入的 update_time 一致（SQLite 的 CURRENT_TIMESTAMP 为 UTC）
+        today = db.query(func.now()).scalar().date()
+        since = datetime.combine(today - timedelta(days=completed_within_days), time.min)
+    cached = check_not_modified(
+        db, request, response, current_user.id, Todo, extra=since.isoformat() if since else ""
+    )
+    if cached is not None:
+        return cached
+
+    base = db.query(Todo).filter(Todo.user_id == current_user.id)
+    base = _filter_todos(base, is_starred=is_starred, priority=priority, q=q)
+    if since is not None:
+        base = base.filter(or_(Todo.status == 0, Todo.update_time >= since))
+
+    # 一次分组查询得到 (状态, 分类) 的计数，再汇总出各维度计数和当前筛选的总数
+    groups = base.with_entities(
+        Todo.status, Todo.category_path, func.count(Todo.id)
+    ).group_by(Todo.status, Todo.category_path).all()
+    status_counts: Dict[int, int] = {}
+    category_counts: Dict[str, int] = {}
+    total = 0
+    for row_status, row_category, count in groups:
+        status_counts[row_status] = status_counts.get(row_status, 0) + count
+        category_counts[row_category or ""] = category_counts.get(row_category or "", 0) + count
+        if (status is None or row_status == status) and (not category_path or row_category == category_path):
+            total += count
+
+    if created_order == "asc":
+        order = (Todo.create_time.asc(), Todo.id.asc())
+    elif created_order == "desc":
+        order = (Todo.create_time.desc(), Todo.id.desc())
+    else:
+        order = (Todo.status.asc(), Todo.priority.asc(), Todo.deadline.asc(), Todo.id.asc())
+    items = _filter_todos(base, category_path=category_path, status=status).order_by(
+        *order
+    ).offset(skip).limit(limit).all()
+    return TodoPage(
+        items=items,
+        total=total,
+        status_counts=status_counts,
+        category_counts=category_counts,
+    )
+
+@router.get("/export")
+def export_todos(
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """导出所有待办为 CSV（流式输出）"""
+    user_id = current_user.id
+    return csv_response(
+        "todos",
+        ["标题", "分类", "备注", "截止时间", "优先级(1=高,2=中,3=低)", "状态(0=未完成,1=已完成)", "是否星标", "创建时间"],
+        lambda db: db.query(
+            Todo.title, Todo.category_path, Todo.remark, Todo.deadline,
+            Todo.priority, Todo.status, Todo.is_starred, Todo.create_time,
+        ).filter(Todo.user_id == user_id).order_by(Todo.id.desc()),
+        user_id,
+    )
 
 @router.post("/", response_model=TodoOut)
 def create_todo(
@@ -1,15 +1,18 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.api import deps
 from app.core import security
+from app.core.cache import user_cache, token_version_cache
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut, UserUpdate
+from app.utils.upload_store import update_references
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserOut)
-def register_user(
+async def register_user(
     *,
     db: Session = Depends(deps.get_db),
     user_in: UserCreate
@@ -17,16 +20,23 @@ def register_user(
     """
     新用户注册
     """
-    user = db.query(User).filter(User.username == user_in.username).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == user_in.username).first()
+    )
     if user:
         raise HTTPException(
             status_code=400,
             detail="该账号已注册",
         )
     
+    hashed_password = await security.get_password_hash_async(user_in.password)
+    return await run_in_threadpool(_create_user, db, user_in, hashed_password)
+
+def _create_user(db: Session, user_in: UserCreate, hashed_password: str) -> User:
+    """创建用户及默认菜单（同步数据库操作，在线程池中执行）"""
     db_user = User(
         username=user_in.username,
-        password=security.get_password_hash(user_in.password),
+        password=hashed_password,
         nickname=user_in.nickname or user_in.username,
     )
     db.add(db_user)
@@ -82,7 +92,7 @@ def read_user_me(
     return current_user
 
 @router.put("/me", response_model=UserOut)
-def update_user_me(
+async def update_user_me(
     *,
     db: Session = Depends(deps.get_db),
     user_in: UserUpdate,
@@ -91,14 +101,27 @@ def update_user_me(
     """
     更新当前用户信息
     """
+    hashed_password = None
+    if user_in.password is not None:
+        hashed_password = await security.get_password_hash_async(user_in.password)
+    return await run_in_threadpool(_update_user, db, current_user, user_in, hashed_password)
+
+def _update_user(db: Session, current_user: User, user_in: UserUpdate, hashed_password: str = None) -> User:
+    """更新用户字段并提交（同步数据库操作，在线程池中执行）"""
     if user_in.nickname is not None:
         current_user.nickname = user_in.nickname
-    if user_in.password is not None:
-        current_user.password = security.get_password_hash(user_in.password)
+    if hashed_password is not None:
+        current_user.password = hashed_password
+        # 修改密码后递增令牌版本，使已签发的令牌失效
+        current_user.token_version = (current_user.token_version or 0) + 1
     if user_in.avatar is not None:
+        update_references(db, [current_user.avatar], [user_in.avatar])
         current_user.avatar = user_in.avatar
     
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    # 用户信息已变更，使缓存失效
+    user_cache.invalidate(current_user.id)
+    token_version_cache.invalidate(current_user.id)
     return current_user
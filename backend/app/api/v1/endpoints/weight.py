@@ -1,11 +1,9 @@
+import logging
 from typing import Any, List, Optional
-import csv
-import io
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
-from datetime import date, timedelta, datetime
+from sqlalchemy import desc
+from datetime import date, timedelta
 from app.api import deps
 from app.models.weight import WeightRecord, WeightTarget
 from app.models.user import User
@@ -13,39 +11,55 @@ from app.schemas.weight import (
     WeightCreate, WeightUpdate, WeightOut,
     WeightTargetCreate, WeightTargetOut,
     WeeklyWeightData, DailyWeightStat,
-    WeightBatchDelete
+    WeightBatchDelete, WeightImportResult, WeightPeriodStat, WeightSeriesPoint, WeightTrend
 )
+from app.utils.csv_export import csv_response
+from app.utils.downsample import lttb
+from app.utils.etag import check_not_modified
+from app.core.cache import weight_trend_cache
+from app.utils.fast_json import fast_response, json_response
+from app.utils.pagination import paginate
+from app.utils.weight_stats import (
+    PERIOD_MONTH, PERIOD_WEEK, diff_from, get_week_num, month_range, period_stats, previous_month,
+    refresh_rollups, stat_from_weights, year_series
+)
+from app.utils.weight_import import import_weight_csv
+from app.utils.weight_trend import get_trend, project_target_date
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-def get_week_num(d: date) -> str:
-    """获取日期所属自然周 (ISO标准)"""
-    isoyear, week, _ = d.isocalendar()
-    return f"{isoyear}{week:02d}"
+router = APIRouter()
 
 # --- 体重记录接口 ---
 
 @router.get("/record/history", response_model=List[WeightOut])
 def get_weight_history(
+    request: Request,
+    response: Response,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1),
+    cursor: Optional[str] = Query(None, description="游标分页：上一页响应头 X-Next-Cursor 的值"),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
-    """获取体重历史记录，支持筛选和分页"""
+    """获取体重历史记录，支持筛选和分页，支持 If-None-Match 条件请求"""
+    cached = check_not_modified(db, request, response, current_user.id, WeightRecord)
+    if cached is not None:
+        return cached
     query = db.query(WeightRecord).filter(WeightRecord.user_id == current_user.id)
     if start_date:
         query = query.filter(WeightRecord.record_date >= start_date)
     if end_date:
         query = query.filter(WeightRecord.record_date <= end_date)
-    return query.order_by(desc(WeightRecord.record_date)).offset(skip).limit(limit).all()
+    sort_keys = [(WeightRecord.record_date, True), (WeightRecord.id, True)]
+    return fast_response(paginate(query, sort_keys, response, cursor, skip, limit), WeightOut, response)
 
 @router.get("/record/today", response_model=Optional[WeightOut])
 def get_today_weight(
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """获取今日体重记录"""
     return db.query(WeightRecord).filter(
@@ -57,7 +71,7 @@ def get_today_weight(
 def get_weekly_weight(
     week_num: Optional[str] = Query(None, description="格式 YYYYWW，默认当前周"),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """获取指定周的体重数据及统计"""
     if not week_num:
@@ -71,32 +85,20 @@ def get_weekly_weight(
     if not records:
         return WeeklyWeightData(week_num=week_num, records=[])
     
-    weights = [float(r.weight) for r in records]
-    avg_weight = round(sum(weights) / len(weights), 1)
-    
-    # 获取上周平均体重用于对比
+    # 本周与上周的统计直接读取周期汇总行；汇总行缺失时由已加载的记录计算
     year = int(week_num[:4])
     week = int(week_num[4:])
-    last_week_date = date.fromisocalendar(year, week, 1) - timedelta(days=7)
-    last_week_num = get_week_num(last_week_date)
-    
-    last_week_records = db.query(WeightRecord).filter(
-        WeightRecord.user_id == current_user.id,
-        WeightRecord.week_num == last_week_num
-    ).all()
-    
-    diff_last_week = 0.0
-    if last_week_records:
-        last_avg = sum([float(r.weight) for r in last_week_records]) / len(last_week_records)
-        diff_last_week = round(avg_weight - last_avg, 1)
+    last_week_num = get_week_num(date.fromisocalendar(year, week, 1) - timedelta(days=7))
+    stats = period_stats(db, current_user.id, PERIOD_WEEK, [week_num, last_week_num])
+    current = stats.get(week_num) or stat_from_weights(r.weight for r in records)
         
     return WeeklyWeightData(
         week_num=week_num,
         records=records,
-        avg_weight=avg_weight,
-        max_weight=max(weights),
-        min_weight=min(weights),
-        diff_last_week=diff_last_week
+        avg_weight=round(current[0], 1),
+        max_weight=current[2],
+        min_weight=current[1],
+        diff_last_week=diff_from(current, stats.get(last_week_num))
     )
 
 @router.get("/record/month", response_model=WeeklyWeightData)
@@ -104,14 +106,11 @@ def get_monthly_weight(
     year: int = Query(..., ge=2000),
     month: int = Query(..., ge=1, le=12),
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """获取指定月的体重数据及统计 (复用 WeeklyWeightData 结构)"""
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end_date = date(year, month + 1, 1) - timedelta(days=1)
+    month_key = f"{year}{month:02d}"
+    start_date, end_date = month_range(year, month)
         
     records = db.query(WeightRecord).filter(
         WeightRecord.user_id == current_user.id,
@@ -120,39 +119,69 @@ def get_monthly_weight(
     ).order_by(WeightRecord.record_date.asc()).all()
     
     if not records:
-        return WeeklyWeightData(week_num=f"{year}{month:02d}", records=[])
-    
-    weights = [float(r.weight) for r in records]
-    avg_weight = round(sum(weights) / len(weights), 1)
-    
-    # 获取上月平均体重用于对比
-    if month == 1:
-        last_month_start = date(year - 1, 12, 1)
-        last_month_end = date(year, 1, 1) - timedelta(days=1)
-    else:
-        last_month_start = date(year, month - 1, 1)
-        last_month_end = date(year, month, 1) - timedelta(days=1)
-        
-    last_month_records = db.query(WeightRecord).filter(
-        WeightRecord.user_id == current_user.id,
-        WeightRecord.record_date >= last_month_start,
-        WeightRecord.record_date <= last_month_end
-    ).all()
+        return WeeklyWeightData(week_num=month_key, records=[])
     
-    diff_last_week = 0.0 # 这里复用字段名，实际表示较上月
-    if last_month_records:
-        last_avg = sum([float(r.weight) for r in last_month_records]) / len(last_month_records)
-        diff_last_week = round(avg_weight - last_avg, 1)
+    # 本月与上月的统计直接读取周期汇总行；汇总行缺失时由已加载的记录计算
+    last_year, last_month = previous_month(year, month)
+    last_month_key = f"{last_year}{last_month:02d}"
+    stats = period_stats(db, current_user.id, PERIOD_MONTH, [month_key, last_month_key])
+    current = stats.get(month_key) or stat_from_weights(r.weight for r in records)
         
     return WeeklyWeightData(
-        week_num=f"{year}{month:02d}",
+        week_num=month_key,
         records=records,
-        avg_weight=avg_weight,
-        max_weight=max(weights),
-        min_weight=min(weights),
-        diff_last_week=diff_last_week
+        avg_weight=round(current[0], 1),
+        max_weight=current[2],
+        min_weight=current[1],
+        diff_last_week=diff_from(current, stats.get(last_month_key))  # 这里复用字段名，实际表示较上月
     )
 
+@router.get("/record/range", response_model=List[WeightPeriodStat])
+def get_weight_range(
+    year: int = Query(..., ge=2000),
+    period: str = Query(PERIOD_WEEK, pattern=f"^({PERIOD_WEEK}|{PERIOD_MONTH})$", description="week=按周, month=按月"),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """获取全年按周（ISO 周年）或按月的体重统计序列，只返回有记录的周期，按周期升序"""
+    series = year_series(db, current_user.id, period, year)
+    return [
+        WeightPeriodStat(
+            period=key,
+            avg_weight=round(avg, 1),
+            min_weight=min_weight,
+            max_weight=max_weight,
+            count=count,
+        )
+        for key, (avg, min_weight, max_weight, count) in sorted(series.items())
+    ]
+
+@router.get("/record/series", response_model=List[WeightSeriesPoint])
+def get_weight_series(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    points: int = Query(500, ge=3, le=5000, description="返回的最大点数"),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """获取日期范围内的体重曲线，超过 points 个点时按 LTTB 降采样（保留峰谷形状），默认全部历史"""
+    query = db.query(WeightRecord.record_date, WeightRecord.weight).filter(
+        WeightRecord.user_id == current_user.id
+    )
+    if start_date:
+        query = query.filter(WeightRecord.record_date >= start_date)
+    if end_date:
+        query = query.filter(WeightRecord.record_date <= end_date)
+    rows = query.order_by(WeightRecord.record_date.asc()).all()
+    if not rows:
+        return json_response([])
+    first = rows[0][0]
+    xs = [(d - first).days for d, _ in rows]
+    ys = [float(w) for _, w in rows]
+    return json_response([
+        {"record_date": rows[i][0], "weight": ys[i]} for i in lttb(xs, ys, points)
+    ])
+
 @router.post("/record/add", response_model=WeightOut)
 def create_weight_record(
     *,
@@ -175,7 +204,9 @@ def create_weight_record(
         week_num=get_week_num(weight_in.record_date)
     )
     db.add(db_obj)
+    refresh_rollups(db, current_user.id, [db_obj.record_date])
     db.commit()
+    weight_trend_cache.invalidate(current_user.id)
     db.refresh(db_obj)
     return db_obj
 
@@ -200,7 +231,9 @@ def update_weight_record(
         setattr(db_obj, field, value)
     
     db.add(db_obj)
+    refresh_rollups(db, current_user.id, [db_obj.record_date])
     db.commit()
+    weight_trend_cache.invalidate(current_user.id)
     db.refresh(db_obj)
     return db_obj
 
@@ -219,7 +252,9 @@ def delete_weight_record(
     if not db_obj:
         raise HTTPException(status_code=404, detail="记录不存在")
     db.delete(db_obj)
+    refresh_rollups(db, current_user.id, [db_obj.record_date])
     db.commit()
+    weight_trend_cache.invalidate(current_user.id)
     return {"status": "ok"}
 
 @router.post("/record/batch-delete")
@@ -230,55 +265,51 @@ def batch_delete_weight_records(
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
     """批量删除体重记录"""
-    db.query(WeightRecord).filter(
+    query = db.query(WeightRecord).filter(
         WeightRecord.id.in_(data.ids),
         WeightRecord.user_id == current_user.id
-    ).delete(synchronize_session=False)
+    )
+    dates = [record_date for (record_date,) in query.with_entities(WeightRecord.record_date)]
+    query.delete(synchronize_session=False)
+    refresh_rollups(db, current_user.id, dates)
     db.commit()
+    weight_trend_cache.invalidate(current_user.id)
     return {"status": "ok", "deleted_count": len(data.ids)}
 
 @router.get("/record/export")
 def export_weight_records(
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """导出所有体重记录为 CSV（流式输出）"""
+    user_id = current_user.id
+    return csv_response(
+        "weight_history",
+        ["日期", "体重(kg)", "备注", "所属周", "录入时间"],
+        lambda db: db.query(
+            WeightRecord.record_date, WeightRecord.weight, WeightRecord.remark,
+            WeightRecord.week_num, WeightRecord.create_time,
+        ).filter(WeightRecord.user_id == user_id).order_by(desc(WeightRecord.record_date)),
+        user_id,
+    )
+
+@router.post("/record/import", response_model=WeightImportResult)
+def import_weight_records(
+    *,
     db: Session = Depends(deps.get_db),
+    file: UploadFile = File(..., description="CSV 文件，格式与导出一致"),
     current_user: User = Depends(deps.get_current_user),
 ) -> Any:
-    """导出所有体重记录为 CSV"""
-    records = db.query(WeightRecord).filter(
-        WeightRecord.user_id == current_user.id
-    ).order_by(desc(WeightRecord.record_date)).all()
-    
-    output = io.StringIO()
-    # 写入 BOM 以支持 Excel 打开中文
-    output.write('\ufeff')
-    writer = csv.writer(output)
-    writer.writerow(["日期", "体重(kg)", "备注", "所属周", "录入时间"])
-    
-    for r in records:
-        writer.writerow([
-            r.record_date,
-            r.weight,
-            r.remark or "",
-            r.week_num,
-            r.create_time.strftime("%Y-%m-%d %H:%M:%S")
-        ])
-    
-    output.seek(0)
-    
-    filename = f"weight_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            'Content-Disposition': f'attachment; filename="{filename}"'
-        }
-    )
+    """批量导入体重记录（CSV），已有日期覆盖，返回逐行错误报告"""
+    result = import_weight_csv(db, current_user.id, file.file)
+    weight_trend_cache.invalidate(current_user.id)
+    return result
 
 # --- 体重目标接口 ---
 
 @router.get("/target/get", response_model=Optional[WeightTargetOut])
 def get_active_target(
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """获取当前活跃的体重目标"""
     return db.query(WeightTarget).filter(
@@ -311,9 +342,7 @@ def set_weight_target(
         db.refresh(db_obj)
         return db_obj
     except Exception as e:
-        print(f"Error in set_weight_target: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("设置体重目标失败（用户 %s）", current_user.id)
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
@@ -322,7 +351,7 @@ def set_weight_target(
 @router.get("/stat/today", response_model=DailyWeightStat)
 def get_today_stat(
     db: Session = Depends(deps.get_db),
-    current_user: User = Depends(deps.get_current_user),
+    current_user: User = Depends(deps.get_current_user_claims),
 ) -> Any:
     """获取今日体重统计 (与昨日对比、与目标对比)"""
     today = date.today()
@@ -356,3 +385,23 @@ def get_today_stat(
         diff_yesterday=diff_yesterday,
         target_diff=target_diff
     )
+
+@router.get("/stat/trend", response_model=WeightTrend)
+def get_weight_trend(
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_user_claims),
+) -> Any:
+    """获取体重趋势：7/30 天移动平均、指数平滑、最近 30 天变化速率及目标达成日期推算"""
+    trend = get_trend(db, current_user.id)
+    target = db.query(WeightTarget.target_weight).filter(
+        WeightTarget.user_id == current_user.id,
+        WeightTarget.is_active == 1
+    ).first()
+    target_weight = float(target[0]) if target else None
+    return json_response({
+        "points": trend["points"],
+        "rate_per_week": trend["rate_per_week"],
+        "smoothed_weight": trend["smoothed_weight"],
+        "target_weight": target_weight,
+        "projected_date": project_target_date(trend, target_weight) if target_weight is not None else None,
+    })
@@ -1,12 +1,17 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Dict, Optional, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
+def create_access_token(
+    subject: Union[str, Any], expires_delta: timedelta = None, claims: Optional[Dict[str, Any]] = None
+) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -14,6 +19,8 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
+    if claims:
+        to_encode.update(claims)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -22,3 +29,78 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+# --- bcrypt 独立进程池 ---
+# bcrypt 是 CPU 密集操作，放到独立的有界进程池中执行，
+# 避免登录高峰占满 FastAPI 线程池而拖慢其他接口。
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_semaphore: Optional[asyncio.Semaphore] = None
+_hash_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+_hash_metrics: Dict[str, Any] = {
+    "in_flight": 0,        # 正在进程池中执行的任务数
+    "waiting": 0,          # 排队等待进入进程池的任务数（队列深度）
+    "max_waiting": 0,      # 历史最大队列深度
+    "completed": 0,
+    "total_wait_ms": 0.0,  # 累计排队等待时间
+}
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _hash_pool
+
+def _get_hash_semaphore() -> asyncio.Semaphore:
+    """并发限制器，按事件循环创建（信号量不能跨事件循环使用）"""
+    global _hash_semaphore, _hash_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _hash_semaphore is None or _hash_semaphore_loop is not loop:
+        _hash_semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+        _hash_semaphore_loop = loop
+    return _hash_semaphore
+
+async def _run_in_hash_pool(func, *args) -> Any:
+    semaphore = _get_hash_semaphore()
+    if semaphore.locked():
+        # 进程池已满，进入排队
+        _hash_metrics["waiting"] += 1
+        _hash_metrics["max_waiting"] = max(_hash_metrics["max_waiting"], _hash_metrics["waiting"])
+        start = time.perf_counter()
+        try:
+            await semaphore.acquire()
+        finally:
+            _hash_metrics["waiting"] -= 1
+        _hash_metrics["total_wait_ms"] += (time.perf_counter() - start) * 1000
+    else:
+        await semaphore.acquire()
+    _hash_metrics["in_flight"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_pool(), func, *args)
+    finally:
+        _hash_metrics["in_flight"] -= 1
+        _hash_metrics["completed"] += 1
+        semaphore.release()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """在 bcrypt 进程池中校验密码"""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """在 bcrypt 进程池中生成密码哈希"""
+    return await _run_in_hash_pool(get_password_hash, password)
+
+def hash_pool_stats() -> Dict[str, Any]:
+    completed = _hash_metrics["completed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        **_hash_metrics,
+        "avg_wait_ms": round(_hash_metrics["total_wait_ms"] / completed, 2) if completed else 0.0,
+    }
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False)
+        _hash_pool = None
@@ -3,5 +3,6 @@ from app.models.user import User
 from app.models.note import Note
 from app.models.todo import Todo
 from app.models.checkin import CheckinItem, CheckinRecord
-from app.models.weight import WeightRecord
-from app.models.recipe import Recipe
+from app.models.weight import WeightRecord, WeightRollup
+from app.models.recipe import Recipe, RecipeIngredient
+from app.models.upload import StoredObject, UserUpload
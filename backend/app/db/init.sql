@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS `user` (
     `password` VARCHAR(100) NOT NULL COMMENT 'bcrypt加密后的密码',
     `nickname` VARCHAR(50) DEFAULT NULL COMMENT '用户昵称',
     `avatar` VARCHAR(255) DEFAULT NULL COMMENT '头像文件路径',
+    `token_version` INT NOT NULL DEFAULT 0 COMMENT '令牌版本号，修改密码时递增',
     `create_time` DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '账号创建时间',
     `update_time` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '信息更新时间',
     INDEX `idx_username` (`username`)
@@ -29,7 +30,8 @@ CREATE TABLE IF NOT EXISTS `note` (
     `create_time` DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
     `update_time` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '修改时间',
     INDEX `idx_user_id` (`user_id`),
-    INDEX `idx_category_path` (`category_path`)
+    INDEX `idx_category_path` (`category_path`),
+    FULLTEXT INDEX `ft_note_title_content` (`title`, `content`) WITH PARSER ngram
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
 
 -- 4.5 待办表
@@ -130,6 +132,55 @@ CREATE TABLE IF NOT EXISTS `recipe` (
     INDEX `idx_category` (`category`)
 ) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
 
+-- 4.11 菜谱食材索引表
+CREATE TABLE IF NOT EXISTS `recipe_ingredient` (
+    `id` BIGINT AUTO_INCREMENT PRIMARY KEY COMMENT '索引唯一ID',
+    `user_id` BIGINT NOT NULL COMMENT '关联用户ID',
+    `recipe_id` BIGINT NOT NULL COMMENT '关联菜谱ID',
+    `ingredient` VARCHAR(50) NOT NULL COMMENT '食材名称（规范化后）',
+    UNIQUE INDEX `uk_recipe_ingredient` (`recipe_id`, `ingredient`),
+    INDEX `idx_user_ingredient` (`user_id`, `ingredient`),
+    CONSTRAINT `fk_recipe_ingredient_recipe` FOREIGN KEY (`recipe_id`) REFERENCES `recipe` (`id`) ON DELETE CASCADE
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+
+-- 4.12 内容寻址存储对象表（上传文件按内容去重）
+CREATE TABLE IF NOT EXISTS `stored_object` (
+    `id` BIGINT AUTO_INCREMENT PRIMARY KEY COMMENT '存储对象唯一ID',
+    `sha256` CHAR(64) NOT NULL COMMENT '文件内容 SHA-256',
+    `size` BIGINT NOT NULL COMMENT '文件大小（字节）',
+    `ext` VARCHAR(10) NOT NULL DEFAULT '' COMMENT '文件扩展名',
+    `upload_count` INT NOT NULL DEFAULT 0 COMMENT '映射数（user_upload 条数），降为 0 时删除文件',
+    `create_time` DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+    UNIQUE INDEX `uk_sha256` (`sha256`)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+
+-- 4.13 上传映射表（对外文件 URL -> 存储对象）
+CREATE TABLE IF NOT EXISTS `user_upload` (
+    `id` BIGINT AUTO_INCREMENT PRIMARY KEY COMMENT '映射唯一ID',
+    `user_id` BIGINT NOT NULL COMMENT '关联用户ID',
+    `filename` VARCHAR(100) NOT NULL COMMENT '对外文件名（随机生成）',
+    `object_id` BIGINT NOT NULL COMMENT '关联存储对象ID',
+    `ref_count` INT NOT NULL DEFAULT 0 COMMENT '被菜谱图片、笔记内容、头像引用的次数',
+    `create_time` DATETIME DEFAULT CURRENT_TIMESTAMP COMMENT '上传时间',
+    UNIQUE INDEX `uk_user_filename` (`user_id`, `filename`),
+    INDEX `idx_object_id` (`object_id`),
+    CONSTRAINT `fk_user_upload_object` FOREIGN KEY (`object_id`) REFERENCES `stored_object` (`id`)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+
+-- 4.14 体重周期汇总表（每周 / 每月一行，随体重记录同步维护）
+CREATE TABLE IF NOT EXISTS `weight_rollup` (
+    `id` BIGINT AUTO_INCREMENT PRIMARY KEY COMMENT '汇总唯一ID',
+    `user_id` BIGINT NOT NULL COMMENT '关联用户ID',
+    `period_type` VARCHAR(5) NOT NULL COMMENT '周期类型：week / month',
+    `period_key` VARCHAR(10) NOT NULL COMMENT '周期：YYYYWW / YYYYMM',
+    `record_count` INT NOT NULL DEFAULT 0 COMMENT '记录数',
+    `weight_sum` DECIMAL(10, 1) NOT NULL DEFAULT 0 COMMENT '体重之和（kg）',
+    `min_weight` DECIMAL(5, 1) NOT NULL COMMENT '最低体重（kg）',
+    `max_weight` DECIMAL(5, 1) NOT NULL COMMENT '最高体重（kg）',
+    `update_time` DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+    UNIQUE INDEX `uk_user_period` (`user_id`, `period_type`, `period_key`)
+) ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+
 -- --- 模拟数据 ---
 
 -- 1. 默认用户 (admin / 123456)
@@ -11,6 +11,10 @@ from app.db.session import engine, SessionLocal
 from app.db.base import Base
 from app.core import security
 from app.models.user import User
+from app.utils.recipe_ingredients import rebuild_ingredient_index
+from app.utils.upload_gc import recount_references
+from app.utils.upload_store import import_legacy_uploads
+from app.utils.weight_stats import rebuild_rollups
 
 def run_init_sql() -> None:
     """读取并执行 init.sql 脚本"""
@@ -93,6 +97,20 @@ def init_db() -> None:
             print("数据库初始化完成！")
         else:
             print("数据库已存在初始化数据，跳过。")
+
+        # 3. 为 init.sql 写入的菜谱建立食材索引
+        count = rebuild_ingredient_index(db)
+        print(f"已重建 {count} 个菜谱的食材索引")
+
+        # 4. 旧上传文件迁移到内容寻址存储（旧 URL 通过映射继续可用）
+        stats = import_legacy_uploads(db)
+        print(f"已迁移 {stats['files']} 个上传文件，其中重复 {stats['deduplicated']} 个，节省 {stats['bytes_saved']} 字节")
+        count = recount_references(db)
+        print(f"已统计上传引用数，被引用的上传 {count} 个")
+
+        # 5. 为 init.sql 写入的体重记录建立周期汇总
+        count = rebuild_rollups(db)
+        print(f"已重建 {count} 条体重周期汇总")
     finally:
         db.close()
 
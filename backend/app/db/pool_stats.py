@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """连接池指标：获取连接的等待耗时、超时次数，以及池的实时占用情况"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=window)  # 最近 N 次获取连接的耗时（ms）
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.pool = None
+
+    def record_checkout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._recent_waits.append(wait_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent_waits)
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "p95_wait_ms": round(recent[int(len(recent) * 0.95) - 1], 3) if recent else 0.0,
+            }
+        if self.pool is not None:
+            data.update({
+                "pool_size": self.pool.size(),
+                "checked_in": self.pool.checkedin(),
+                "in_use": self.pool.checkedout(),
+                "overflow": max(self.pool.overflow(), 0),
+                "max_overflow": self.pool.max_overflow,
+                "timeout": self.pool.timeout(),
+            })
+        return data
+
+
+class _InstrumentedPoolMixin:
+    """在获取连接处计时，记录等待耗时与超时"""
+
+    stats: PoolStats = None
+
+    def __init__(self, *args, max_overflow: int = 10, **kwargs):
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # QueuePool 只以私有属性保存溢出上限，这里记录构造参数供指标读取（recreate 会原样传入）
+        self.max_overflow = max_overflow
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.record_timeout()
+            raise
+        if self.stats is not None:
+            self.stats.record_checkout((time.perf_counter() - start) * 1000)
+        return conn
+
+    def recreate(self):
+        # pool_pre_ping / 连接失效时会重建连接池，指标需沿用到新池
+        new_pool = super().recreate()
+        new_pool.stats = self.stats
+        if self.stats is not None:
+            self.stats.pool = new_pool
+        return new_pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, stats: PoolStats) -> None:
+    """将指标对象绑定到引擎的连接池上"""
+    pool = engine.pool
+    if isinstance(pool, _InstrumentedPoolMixin):
+        pool.stats = stats
+        stats.pool = pool
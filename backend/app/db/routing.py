@@ -0,0 +1,62 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# 读写分离粘滞窗口：用户写入后的一段时间内，其读请求仍走主库（read-your-writes）
+sticky_users = TTLCache(max_size=10000, ttl=settings.REPLICA_STICKY_SECONDS)
+# session.info 标记：本事务执行过写入
+WROTE_KEY = "wrote"
+
+
+def make_routing_session(primary, replica):
+    """
+    生成读写分离的 Session 类
+
+    session.info["read_only"] 为真（GET 请求）且当前用户不在粘滞窗口内时走从库，
+    其余情况（写请求、flush、写语句、刚写入过的用户）一律走主库。
+
+    写入后标记粘滞：flush（工作单元）、绕过工作单元的写语句（query().update/delete、
+    execute(insert/update/delete)），以及执行过写入的 Session 提交时（从提交时刻重新计时）。
+    """
+
+    class RoutingSession(Session):
+        def get_bind(self, mapper=None, clause=None, **kwargs):
+            if self._flushing or not self.info.get("read_only"):
+                return primary
+            if clause is not None and getattr(clause, "is_dml", False):
+                return primary
+            user_id = self.info.get("user_id")
+            if user_id is not None and sticky_users.get(user_id) is not None:
+                return primary
+            return replica
+
+    def _mark_sticky(session):
+        user_id = session.info.get("user_id")
+        if user_id is not None:
+            sticky_users.set(user_id, True)
+
+    def _wrote(session):
+        session.info[WROTE_KEY] = True
+        _mark_sticky(session)
+
+    @event.listens_for(RoutingSession, "after_flush")
+    def _after_flush(session, flush_context):
+        _wrote(session)
+
+    @event.listens_for(RoutingSession, "do_orm_execute")
+    def _on_write_statement(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            _wrote(orm_execute_state.session)
+
+    @event.listens_for(RoutingSession, "after_bulk_update")
+    @event.listens_for(RoutingSession, "after_bulk_delete")
+    def _after_bulk(update_context):
+        _wrote(update_context.session)
+
+    @event.listens_for(RoutingSession, "after_commit")
+    def _after_commit(session):
+        if session.info.pop(WROTE_KEY, False):
+            _mark_sticky(session)
+
+    return RoutingSession
@@ -1,9 +1,109 @@
+from typing import Optional
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
-
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True, # 检查连接是否可用
+from app.db.pool_stats import (
+    PoolStats, InstrumentedQueuePool, InstrumentedAsyncQueuePool, instrument_engine
 )
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.db.routing import make_routing_session
+
+def _pool_options(url: str, pool_class) -> dict:
+    """连接池参数（内存 SQLite 使用单连接池，不适用）"""
+    if ":memory:" in url or url.rstrip("/").endswith("sqlite:"):
+        return {}
+    return {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+def _create_engine(url: str, stats: PoolStats):
+    db_engine = create_engine(
+        url,
+        pool_pre_ping=True, # 检查连接是否可用
+        **_pool_options(url, InstrumentedQueuePool),
+    )
+    instrument_engine(db_engine, stats)
+    return db_engine
+
+pool_stats = PoolStats()
+engine = _create_engine(settings.DATABASE_URL, pool_stats)
+
+# 只读从库（可选）
+replica_pool_stats = None
+replica_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_pool_stats = PoolStats()
+    replica_engine = _create_engine(settings.DATABASE_REPLICA_URL, replica_pool_stats)
+    SessionLocal = sessionmaker(
+        autocommit=False, autoflush=False, class_=make_routing_session(engine, replica_engine)
+    )
+else:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def to_async_database_url(url: str) -> str:
+    """同步驱动连接串转为异步驱动（pymysql -> aiomysql，sqlite -> aiosqlite）"""
+    if url.startswith("mysql+pymysql://"):
+        return url.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+    if url.startswith("sqlite://"):
+        return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    return url
+
+def get_async_database_url() -> str:
+    """异步驱动连接串：未显式配置时由 DATABASE_URL 推导"""
+    return settings.ASYNC_DATABASE_URL or to_async_database_url(settings.DATABASE_URL)
+
+def get_async_replica_url() -> Optional[str]:
+    if settings.ASYNC_DATABASE_REPLICA_URL:
+        return settings.ASYNC_DATABASE_REPLICA_URL
+    if settings.DATABASE_REPLICA_URL:
+        return to_async_database_url(settings.DATABASE_REPLICA_URL)
+    return None
+
+# 异步数据库栈（DB_ASYNC_MODE 开启时创建，避免未安装异步驱动时导入失败）
+async_engine = None
+async_replica_engine = None
+AsyncSessionLocal = None
+async_pool_stats = None
+async_replica_pool_stats = None
+if settings.DB_ASYNC_MODE:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    def _create_async_engine(url: str, stats: PoolStats):
+        db_engine = create_async_engine(
+            url,
+            pool_pre_ping=True,
+            **_pool_options(url, InstrumentedAsyncQueuePool),
+        )
+        instrument_engine(db_engine.sync_engine, stats)
+        return db_engine
+
+    async_pool_stats = PoolStats()
+    async_engine = _create_async_engine(get_async_database_url(), async_pool_stats)
+    # expire_on_commit=False：提交后响应序列化不再触发懒加载
+    async_session_options = {"class_": AsyncSession, "autoflush": False, "expire_on_commit": False}
+    async_replica_url = get_async_replica_url()
+    if async_replica_url:
+        async_replica_pool_stats = PoolStats()
+        async_replica_engine = _create_async_engine(async_replica_url, async_replica_pool_stats)
+        AsyncSessionLocal = async_sessionmaker(
+            sync_session_class=make_routing_session(
+                async_engine.sync_engine, async_replica_engine.sync_engine
+            ),
+            **async_session_options,
+        )
+    else:
+        AsyncSessionLocal = async_sessionmaker(bind=async_engine, **async_session_options)
+
+def get_pool_stats() -> dict:
+    data = {"primary": pool_stats.snapshot()}
+    for name, stats in (
+        ("replica", replica_pool_stats),
+        ("async", async_pool_stats),
+        ("async_replica", async_replica_pool_stats),
+    ):
+        if stats is not None:
+            data[name] = stats.snapshot()
+    return data
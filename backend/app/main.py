@@ -1,7 +1,14 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.api.deps import require_internal_token
 from app.api.v1.api import api_router
+from app.core import security
+from app.core.cache import user_cache, token_version_cache
 from app.core.config import settings
+from app.db.session import get_pool_stats
+from app.utils.image_derivatives import shutdown_derivative_pool
+from app.utils.uploads import content_length_exceeds, max_upload_bytes, too_large_detail
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -9,6 +16,16 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
 )
 
+# 上传大小限制（在 CORS 之前注册，保证 413 响应也带 CORS 头）
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """图片上传：根据 Content-Length 提前拒绝超限请求，不接收请求体"""
+    if request.method == "POST" and request.url.path.endswith("/images/upload"):
+        max_bytes = max_upload_bytes()
+        if content_length_exceeds(request.headers.get("content-length"), max_bytes):
+            return JSONResponse(status_code=413, content={"detail": too_large_detail(max_bytes)})
+    return await call_next(request)
+
 # 设置 CORS
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -17,10 +34,16 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag"],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("shutdown")
+def shutdown_event():
+    security.shutdown_hash_pool()
+    shutdown_derivative_pool()
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Personal Note & Todo API"}
@@ -28,3 +51,13 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+@app.get("/internal/stats", dependencies=[Depends(require_internal_token)], include_in_schema=False)
+def internal_stats():
+    """内部运行指标（缓存命中率、密码哈希进程池、数据库连接池），需携带 X-Internal-Token"""
+    return {
+        "user_cache": user_cache.stats(),
+        "token_version_cache": token_version_cache.stats(),
+        "password_hash": security.hash_pool_stats(),
+        "db_pool": get_pool_stats(),
+    }
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, SmallInteger, func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, SmallInteger, Index, func
+from sqlalchemy.orm import query_expression
 from app.db.base_class import Base
 
 class Note(Base):
@@ -11,3 +12,13 @@ class Note(Base):
     is_delete = Column(SmallInteger, default=0, comment="是否删除：0=未删除，1=已删除")
     create_time = Column(DateTime, server_default=func.now())
     update_time = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # 列表摘要模式：查询时通过 with_expression 填充内容截取，非数据库列
+    excerpt = query_expression()
+
+    __table_args__ = (
+        # 全文索引（ngram 解析器支持中文），仅 MySQL 创建
+        Index(
+            "ft_note_title_content", "title", "content",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
+    )
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, SmallInteger, func, BigInteger
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, SmallInteger, func, BigInteger, Index, UniqueConstraint
+from sqlalchemy.orm import query_expression
 from app.db.base_class import Base
 
+# SQLite 仅 INTEGER PRIMARY KEY 支持自增，本地 SQLite 环境下主键使用 Integer
+BigIntegerPK = BigInteger().with_variant(Integer, "sqlite")
+
 class Recipe(Base):
-    id = Column(BigInteger, primary_key=True, index=True, autoincrement=True)
+    id = Column(BigIntegerPK, primary_key=True, index=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey("user.id"), index=True, nullable=False)
     name = Column(String(50), nullable=False, comment="菜谱名称")
     category = Column(String(50), nullable=False, comment="所属分类")
@@ -16,3 +20,21 @@ class Recipe(Base):
     is_delete = Column(SmallInteger, default=0, comment="是否删除：0=未删除，1=已删除")
     create_time = Column(DateTime, server_default=func.now())
     update_time = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # 列表摘要模式：查询时通过 with_expression 填充食材清单截取，非数据库列
+    excerpt = query_expression()
+
+class RecipeIngredient(Base):
+    """
+    菜谱食材倒排索引：由 Recipe.ingredients 解析而来，用于按食材检索菜谱
+    """
+    __tablename__ = "recipe_ingredient"
+
+    id = Column(BigIntegerPK, primary_key=True, autoincrement=True)
+    user_id = Column(BigInteger, ForeignKey("user.id"), nullable=False, comment="关联用户ID")
+    recipe_id = Column(BigInteger, ForeignKey("recipe.id", ondelete="CASCADE"), index=True, nullable=False, comment="关联菜谱ID")
+    ingredient = Column(String(50), nullable=False, comment="食材名称（规范化后）")
+
+    __table_args__ = (
+        UniqueConstraint("recipe_id", "ingredient", name="uk_recipe_ingredient"),
+        Index("idx_user_ingredient", "user_id", "ingredient"),
+    )
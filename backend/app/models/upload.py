@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger, UniqueConstraint, func
+from app.db.base_class import Base
+
+class StoredObject(Base):
+    """
+    内容寻址存储对象：相同内容的上传文件只保存一份（按 SHA-256 去重）
+    """
+    __tablename__ = "stored_object"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sha256 = Column(String(64), unique=True, nullable=False, comment="文件内容 SHA-256")
+    size = Column(BigInteger, nullable=False, comment="文件大小（字节）")
+    ext = Column(String(10), nullable=False, default="", comment="文件扩展名（首次上传时的扩展名）")
+    upload_count = Column(Integer, nullable=False, default=0, comment="映射数（user_upload 条数），降为 0 时删除文件")
+    create_time = Column(DateTime, server_default=func.now())
+
+class UserUpload(Base):
+    """
+    上传映射：对外 URL /images/file/{user_id}/{filename} -> 存储对象
+    每次上传生成一条映射，菜谱图片、笔记图片、头像通过该 URL 引用
+    """
+    __tablename__ = "user_upload"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False, comment="关联用户ID")
+    filename = Column(String(100), nullable=False, comment="对外文件名（随机生成）")
+    object_id = Column(Integer, ForeignKey("stored_object.id"), index=True, nullable=False, comment="关联存储对象ID")
+    ref_count = Column(Integer, nullable=False, default=0, comment="被菜谱图片、笔记内容、头像引用的次数")
+    create_time = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "filename", name="uk_user_filename"),
+    )
@@ -7,5 +7,6 @@ class User(Base):
     password = Column(String(100), nullable=False, comment="bcrypt加密后的密码")
     nickname = Column(String(50), nullable=True, comment="用户昵称")
     avatar = Column(String(255), nullable=True, comment="头像文件路径")
+    token_version = Column(Integer, nullable=False, default=0, server_default="0", comment="令牌版本号，修改密码时递增")
     create_time = Column(DateTime, server_default=func.now(), comment="账号创建时间")
     update_time = Column(DateTime, server_default=func.now(), onupdate=func.now(), comment="信息更新时间")
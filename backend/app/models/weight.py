@@ -40,3 +40,24 @@ class WeightTarget(Base):
         # 移除 is_active 的唯一索引，允许存在多条历史记录 (is_active=0)
         # 代码层保证同一时间只有一个 is_active=1
     )
+
+class WeightRollup(Base):
+    """
+    体重周期汇总：每个用户每周（YYYYWW）/ 每月（YYYYMM）一行，
+    随体重记录的增删改在同一事务内更新，周期视图只读取汇总行
+    """
+    __tablename__ = "weight_rollup"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("user.id"), nullable=False, comment="关联用户ID")
+    period_type = Column(String(5), nullable=False, comment="周期类型：week / month")
+    period_key = Column(String(10), nullable=False, comment="周期：YYYYWW / YYYYMM")
+    record_count = Column(Integer, nullable=False, default=0, comment="记录数")
+    weight_sum = Column(Numeric(10, 1), nullable=False, default=0, comment="体重之和（kg）")
+    min_weight = Column(Numeric(5, 1), nullable=False, comment="最低体重（kg）")
+    max_weight = Column(Numeric(5, 1), nullable=False, comment="最高体重（kg）")
+    update_time = Column(DateTime, server_default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "period_type", "period_key", name="uk_user_period"),
+    )
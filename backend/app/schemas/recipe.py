@@ -38,3 +38,10 @@ class RecipeOut(RecipeBase):
     model_config = {
         "from_attributes": True
     }
+
+class RecipeIngredientMatch(BaseModel):
+    """按食材检索的结果"""
+    recipe: RecipeOut
+    matched_ingredients: List[str]
+    coverage: float  # 命中食材数 / 查询食材数
+    ingredient_count: int  # 菜谱食材总数
@@ -0,0 +1,20 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+class SearchHit(BaseModel):
+    """统一搜索的单条结果"""
+    type: str = Field(..., description="结果类型：note / todo / recipe / checkin")
+    id: int
+    title: str
+    snippet: Optional[str] = None
+    update_time: Optional[datetime] = None
+    score: float = 0.0
+
+class SearchResponse(BaseModel):
+    """统一搜索响应"""
+    keyword: str
+    items: List[SearchHit]
+    partial: bool = Field(False, description="是否有模块未返回结果（超时或出错）")
+    timed_out: List[str] = []
+    failed: List[str] = []
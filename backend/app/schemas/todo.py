@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -32,3 +32,10 @@ class TodoOut(TodoBase):
     model_config = {
         "from_attributes": True
     }
+
+class TodoPage(BaseModel):
+    """分页待办列表，附带按状态/分类的计数"""
+    items: List[TodoOut]
+    total: int = 0
+    status_counts: Dict[int, int] = {}
+    category_counts: Dict[str, int] = {}
@@ -32,3 +32,7 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[int] = None
+    # claims-only 模式下携带的令牌版本号及不可变的身份字段
+    # （昵称、头像可随时修改，不放入令牌，避免签发后内容过期）
+    ver: Optional[int] = None
+    username: Optional[str] = None
@@ -22,6 +22,17 @@ class WeightBatchDelete(BaseModel):
     """批量删除体重记录"""
     ids: List[int]
 
+class WeightImportError(BaseModel):
+    """导入失败的行"""
+    line: int
+    error: str
+
+class WeightImportResult(BaseModel):
+    """批量导入结果"""
+    imported: int  # 写入（新增或覆盖）的日期数
+    failed: int
+    errors: List[WeightImportError]  # 最多列出前 100 行
+
 class WeightOut(WeightBase):
     """体重记录输出"""
     id: int
@@ -65,6 +76,35 @@ class WeeklyWeightData(BaseModel):
     min_weight: float = 0.0
     diff_last_week: float = 0.0  # 与上周平均体重的差值
 
+class WeightPeriodStat(BaseModel):
+    """周期统计（周 YYYYWW / 月 YYYYMM）"""
+    period: str
+    avg_weight: float
+    min_weight: float
+    max_weight: float
+    count: int
+
+class WeightSeriesPoint(BaseModel):
+    """降采样序列数据点"""
+    record_date: date
+    weight: float
+
+class WeightTrendPoint(BaseModel):
+    """趋势数据点"""
+    record_date: date
+    weight: float
+    ma7: float       # 7 天移动平均
+    ma30: float      # 30 天移动平均
+    smoothed: float  # 指数平滑值
+
+class WeightTrend(BaseModel):
+    """体重趋势"""
+    points: List[WeightTrendPoint]
+    rate_per_week: Optional[float] = None   # 最近 30 天线性回归的变化速率（kg/周）
+    smoothed_weight: Optional[float] = None  # 当前平滑体重
+    target_weight: Optional[float] = None
+    projected_date: Optional[date] = None   # 预计达成目标日期（无法推算时为空）
+
 class DailyWeightStat(BaseModel):
     """今日统计数据"""
     today_weight: Optional[float] = None
@@ -0,0 +1,43 @@
+from typing import List, Sequence
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Largest-Triangle-Three-Buckets 降采样，返回保留点的下标（升序）
+    保留首尾点；中间点均分为 threshold - 2 个桶，每个桶选出与“上一个保留点、下一个桶平均点”
+    构成三角形面积最大的点，从而保留峰谷等形状特征
+    xs 需升序；点数不超过 threshold 时原样返回全部下标
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    selected = [0]
+    buckets = threshold - 2
+
+    def bucket_start(i: int) -> int:
+        # 整数运算划分桶边界，避免浮点误差漏掉点
+        return i * (n - 2) // buckets + 1
+
+    a = 0
+    for i in range(buckets):
+        start = bucket_start(i)
+        end = bucket_start(i + 1)
+        # 下一个桶的平均点（最后一个桶以末点为准）
+        next_start = end
+        next_end = min(bucket_start(i + 2), n)
+        if next_start >= n - 1:
+            avg_x, avg_y = xs[n - 1], ys[n - 1]
+        else:
+            count = next_end - next_start
+            avg_x = sum(xs[next_start:next_end]) / count
+            avg_y = sum(ys[next_start:next_end]) / count
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
@@ -0,0 +1,59 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+# 列表接口条件请求：以用户在该模块下的 max(update_time) + 行数作为版本，
+# 客户端携带 If-None-Match 且版本未变时直接返回 304，不执行列表查询和序列化
+#
+# 软删除、更新都会刷新 update_time，新增/物理删除会改变行数；
+# 行数统计包含已软删除的行，保证软删除也能改变版本
+
+
+def list_etag(db: Session, request: Request, user_id: int, *models: Any, extra: str = "") -> Optional[str]:
+    """
+    计算列表版本标签（弱 ETag），查询参数也计入标签
+    models：列表内容依赖的模型（需有 user_id、update_time 列）
+    extra：其它影响结果的内容（如随日期变化的筛选边界）
+
+    update_time 精度为秒：最近一次写入发生在当前这一秒内时，同一秒内的后续写入无法改变版本，
+    此时返回 None（本次响应不带 ETag）
+    """
+    parts = [request.url.path, str(request.url.query), str(user_id), extra]
+    for model in models:
+        latest, count, now = db.query(
+            func.max(model.update_time), func.count(model.id), func.now()
+        ).filter(model.user_id == user_id).one()
+        if latest is not None and latest >= now:
+            return None
+        parts.append(f"{model.__tablename__}:{latest}:{count}")
+    digest = hashlib.md5("|".join(parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def check_not_modified(
+    db: Session, request: Request, response: Response, user_id: int, *models: Any, extra: str = ""
+) -> Optional[Response]:
+    """
+    设置 ETag 响应头；请求头 If-None-Match 命中时返回 304 响应，否则返回 None（继续正常查询）
+    """
+    etag = list_etag(db, request, user_id, *models, extra=extra)
+    if etag is None:
+        response.headers["Cache-Control"] = "no-store"
+        return None
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    # 弱比较：忽略 W/ 前缀
+    tags = {_opaque(tag) for tag in if_none_match.split(",")}
+    if "*" in tags or _opaque(etag) in tags:
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
@@ -0,0 +1,53 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+# 列表接口快速序列化：ORM 对象按输出 Schema 的字段直接转 dict，再由 orjson 编码为 JSON 字节
+# 跳过 FastAPI 对 response_model 的逐行校验（数据来自数据库，已满足 Schema 约束），response_model 仅用于文档
+
+
+def _default(obj: Any) -> Any:
+    # Numeric 列（如体重）读出为 Decimal，与 Schema 中的 float 输出保持一致
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def schema_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def to_dicts(rows: Iterable[Any], fields: Iterable[str]) -> List[Dict[str, Any]]:
+    """按字段名从 ORM 对象取值"""
+    fields = tuple(fields)
+    return [{name: getattr(row, name) for name in fields} for row in rows]
+
+
+def fast_response(
+    rows: Iterable[Any], schema: Type[BaseModel], response: Optional[Response] = None
+) -> FastJSONResponse:
+    """
+    ORM 对象列表直接输出为 JSON 响应
+    沿用依赖注入 Response 上设置的响应头（如 X-Next-Cursor）
+    """
+    return json_response(to_dicts(rows, schema_fields(schema)), response)
+
+
+def json_response(content: Any, response: Optional[Response] = None) -> FastJSONResponse:
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content=content, headers=headers)
@@ -0,0 +1,149 @@
+import mimetypes
+import os
+import stat
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+import anyio
+from fastapi import HTTPException, Request, Response
+from starlette.types import Receive, Scope, Send
+
+# 不可变文件（上传文件名随机生成，内容不会变化）的高效输出：
+# - 长期缓存：Cache-Control immutable + 强 ETag + Last-Modified，命中 If-None-Match/If-Modified-Since 返回 304
+# - 单段 Range 请求（206 / 416），支持 If-Range
+# - ASGI 服务器支持 zerocopysend / pathsend 扩展时走 sendfile 零拷贝，否则分块读取
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 内容可能变化的响应（如缩略图尚未生成时回退的原图）：可缓存，但每次使用前需用 ETag 重新验证
+REVALIDATE_CACHE_CONTROL = "no-cache"
+CHUNK_SIZE = 64 * 1024
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """强 ETag：文件不可变，大小 + 修改时间即可唯一标识内容"""
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def _parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    解析 Range 请求头，返回闭区间 (start, end)
+    不支持的格式（多段、非 bytes 单位）返回 None，按完整文件输出；无法满足的范围抛出 416
+    """
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # 后缀范围：bytes=-N 表示最后 N 个字节
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(status_code=416, detail="Range Not Satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    if start > end or start < 0:
+        return None
+    return start, min(end, size - 1)
+
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        # If-None-Match 使用弱比较
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _if_range_matches(request: Request, etag: str, last_modified: str) -> bool:
+    # If-Range 要求强匹配：ETag 完全一致或 Last-Modified 完全一致
+    if_range = request.headers.get("if-range")
+    return if_range is None or if_range.strip() in (etag, last_modified)
+
+
+class FileRangeResponse(Response):
+    """输出文件的 [start, end] 字节区间"""
+
+    def __init__(self, path: str, start: int, end: int, status_code: int, headers: dict, media_type: str):
+        self.path = path
+        self.start = start
+        self.length = end - start + 1
+        headers["content-length"] = str(self.length)
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions:
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.fileno(),
+                    "offset": self.start,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+        if "http.response.pathsend" in extensions and self.status_code == 200:
+            await send({"type": "http.response.pathsend", "path": self.path})
+            return
+
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def immutable_file_response(request: Request, path: str, cache_control: str = IMMUTABLE_CACHE_CONTROL) -> Response:
+    """输出不可变文件：处理条件请求与 Range 请求；cache_control 可覆盖默认的长期缓存策略"""
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+        raise HTTPException(status_code=404, detail="图片不存在")
+
+    etag = file_etag(stat_result)
+    last_modified = formatdate(stat_result.st_mtime, usegmt=True)
+    headers = {
+        "etag": etag,
+        "last-modified": last_modified,
+        "cache-control": cache_control,
+        "accept-ranges": "bytes",
+    }
+    if _not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    size = stat_result.st_size
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and _if_range_matches(request, etag, last_modified):
+        byte_range = _parse_range(range_header, size)
+    if byte_range is None:
+        return FileRangeResponse(path, 0, size - 1, 200, headers, media_type)
+    start, end = byte_range
+    headers["content-range"] = f"bytes {start}-{end}/{size}"
+    return FileRangeResponse(path, start, end, 206, headers, media_type)
@@ -0,0 +1,126 @@
+import asyncio
+import glob
+import os
+import shutil
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional
+from PIL import Image, ImageOps
+from app.core.config import settings
+
+# 图片衍生尺寸（缩略图 / 标准宽度）：
+# - 上传后在后台进程池中预生成各标准宽度
+# - 访问时按请求宽度向上取标准宽度，磁盘缓存未命中则即时生成（同一文件的并发请求只生成一次）
+# - 衍生图存放于 <UPLOAD_DIR>/.derived/ 下与原图相同的相对路径，原图删除时一并清理
+# - 无法生成时（非位图、图片损坏）调用方回退到原图，此时不能按不可变文件长期缓存
+
+RESIZABLE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+DERIVED_DIR = ".derived"
+
+_pool: Optional[ProcessPoolExecutor] = None
+# 生成中的任务：衍生图路径 -> Future
+_pending: Dict[str, Future] = {}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_DERIVATIVE_WORKERS)
+    return _pool
+
+
+def derivative_path(src: str, width: int) -> str:
+    """衍生图路径：<UPLOAD_DIR>/.derived/<原图相对路径去扩展名>_w<宽度><扩展名>"""
+    stem, ext = os.path.splitext(os.path.relpath(src, settings.UPLOAD_DIR))
+    return os.path.join(settings.UPLOAD_DIR, DERIVED_DIR, f"{stem}_w{width}{ext}")
+
+
+def standard_width(requested: int) -> int:
+    """请求宽度向上取最近的标准宽度，超过最大标准宽度时取最大值"""
+    widths = sorted(settings.IMAGE_DERIVATIVE_WIDTHS)
+    for width in widths:
+        if width >= requested:
+            return width
+    return widths[-1]
+
+
+def is_resizable(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in RESIZABLE_EXTENSIONS
+
+
+def _render(src: str, dst: str, width: int) -> None:
+    """在进程池中执行：生成指定宽度的衍生图；原图不超过该宽度时硬链接原图"""
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.part"
+    with Image.open(src) as image:
+        image_format = image.format
+        if image.width <= width:
+            image = None
+        else:
+            image = ImageOps.exif_transpose(image)
+            height = max(round(image.height * width / image.width), 1)
+            image = image.resize((width, height), Image.LANCZOS)
+    if image is None:
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+    else:
+        options = {"quality": 85} if image_format in ("JPEG", "WEBP") else {}
+        image.save(tmp, format=image_format, optimize=True, **options)
+    os.replace(tmp, dst)
+
+
+def _submit(src: str, dst: str, width: int) -> Future:
+    future = _pending.get(dst)
+    if future is None:
+        future = _get_pool().submit(_render, src, dst, width)
+        _pending[dst] = future
+        future.add_done_callback(lambda _: _pending.pop(dst, None))
+    return future
+
+
+def schedule_derivatives(src: str) -> None:
+    """上传完成后调用：后台预生成全部标准宽度，不等待结果"""
+    if not is_resizable(src):
+        return
+    for width in settings.IMAGE_DERIVATIVE_WIDTHS:
+        dst = derivative_path(src, width)
+        if not os.path.exists(dst):
+            _submit(src, dst, width)
+
+
+async def get_derivative(src: str, width: int) -> Optional[str]:
+    """返回指定宽度衍生图的路径；无法生成（非位图、图片损坏）时返回 None"""
+    if not is_resizable(src) or not os.path.isfile(src):
+        return None
+    width = standard_width(width)
+    dst = derivative_path(src, width)
+    if os.path.exists(dst):
+        return dst
+    try:
+        await asyncio.wrap_future(_submit(src, dst, width))
+    except Exception:
+        return None
+    return dst
+
+
+def evict_derivatives(src: str) -> int:
+    """删除原图时调用：清理该图片的全部衍生图，返回释放的字节数"""
+    stem, ext = os.path.splitext(os.path.relpath(src, settings.UPLOAD_DIR))
+    prefix = os.path.join(settings.UPLOAD_DIR, DERIVED_DIR, stem)
+    pattern = f"{glob.escape(prefix)}_w*{glob.escape(ext)}"
+    freed = 0
+    for path in glob.glob(pattern):
+        try:
+            freed += os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return freed
+
+
+def shutdown_derivative_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False)
+        _pool = None
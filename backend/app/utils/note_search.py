@@ -0,0 +1,183 @@
+import math
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import case, func
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session
+from app.models.note import Note
+
+# 与 MySQL ngram 解析器默认的 ngram_token_size 保持一致
+NGRAM_SIZE = 2
+# 进程内索引检索结果按该批次大小到数据库过滤（分类、软删除等条件），只加载当前页的笔记
+RANKED_BATCH_SIZE = 500
+
+_CJK_RE = re.compile(r"[㐀-鿿豈-﫿]+")
+_WORD_RE = re.compile(r"[a-z0-9_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """分词：中文按 2-gram 切分（与 MySQL ngram 一致），英文/数字按单词切分"""
+    text = (text or "").lower()
+    tokens = []
+    for run in _CJK_RE.findall(text):
+        if len(run) < NGRAM_SIZE:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + NGRAM_SIZE] for i in range(len(run) - NGRAM_SIZE + 1))
+    tokens.extend(_WORD_RE.findall(_CJK_RE.sub(" ", text)))
+    return tokens
+
+
+class NoteSearchIndex:
+    """
+    进程内笔记倒排索引（非 MySQL 数据库的全文检索回退方案）
+
+    按用户懒加载：首次搜索时加载该用户全部未删除笔记建立索引。之后每次搜索先查询
+    该用户笔记的版本（未删除条数、最大 update_time），增量应用 update_time 不早于
+    上次同步位置的笔记（含其他进程写入的修改和软删除），条数仍对不上时全量重建。
+    检索使用 BM25 打分。
+
+    数据库查询都在锁外执行（异步模式下查询运行在事件循环线程上，持锁等待 I/O 会阻塞整个循环），
+    锁只保护内存中索引的读写。
+    """
+
+    K1 = 1.2
+    B = 0.75
+    # 增量同步的回看窗口（秒）：update_time 取语句执行时间，提交较晚的事务可能早于已同步位置
+    SYNC_OVERLAP_SECONDS = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # user_id -> {"postings": {term: {note_id: tf}}, "lengths": {note_id: 文档词数},
+        #             "terms": {note_id: 词列表}, "synced_at": 已同步的最大 update_time}
+        self._users: Dict[int, dict] = {}
+
+    def _add(self, user_index: dict, note_id: int, title: str, content: str) -> None:
+        # 标题权重更高：标题词计两次
+        terms = Counter(tokenize(title) * 2 + tokenize(content))
+        user_index["lengths"][note_id] = sum(terms.values())
+        user_index["terms"][note_id] = list(terms)
+        for term, tf in terms.items():
+            user_index["postings"].setdefault(term, {})[note_id] = tf
+
+    def _remove(self, user_index: dict, note_id: int) -> None:
+        user_index["lengths"].pop(note_id, None)
+        for term in user_index["terms"].pop(note_id, ()):
+            docs = user_index["postings"].get(term)
+            if docs is None:
+                continue
+            docs.pop(note_id, None)
+            if not docs:
+                del user_index["postings"][term]
+
+    def _version(self, db: Session, user_id: int) -> Tuple[int, Optional[datetime]]:
+        """（未删除笔记数, 全部笔记的最大 update_time），软删除也会刷新 update_time"""
+        live_count, latest = db.query(
+            func.count(case((Note.is_delete == 0, 1))), func.max(Note.update_time)
+        ).filter(Note.user_id == user_id).one()
+        return live_count, latest
+
+    def _load_user(self, db: Session, user_id: int, synced_at: Optional[datetime]) -> dict:
+        # synced_at 须在读取笔记之前查询：期间的写入最多在下次搜索时被重复应用，不会遗漏
+        user_index = {"postings": {}, "lengths": {}, "terms": {}, "synced_at": synced_at}
+        rows = db.query(Note.id, Note.title, Note.content).filter(
+            Note.user_id == user_id, Note.is_delete == 0
+        ).all()
+        for note_id, title, content in rows:
+            self._add(user_index, note_id, title, content)
+        return user_index
+
+    def _changed_rows(self, db: Session, user_id: int, since: datetime) -> list:
+        return db.query(
+            Note.id, Note.title, Note.content, Note.is_delete, Note.update_time
+        ).filter(
+            Note.user_id == user_id,
+            Note.update_time >= since - timedelta(seconds=self.SYNC_OVERLAP_SECONDS),
+        ).all()
+
+    def _sync(self, db: Session, user_id: int) -> dict:
+        """将该用户的索引与数据库对齐，返回可检索的索引"""
+        live_count, latest = self._version(db, user_id)
+        with self._lock:
+            user_index = self._users.get(user_id)
+            since = user_index["synced_at"] if user_index is not None else None
+
+        if user_index is not None and latest is not None and since is not None:
+            rows = self._changed_rows(db, user_id, since)
+            with self._lock:
+                for note_id, title, content, is_delete, update_time in rows:
+                    self._remove(user_index, note_id)
+                    if not is_delete:
+                        self._add(user_index, note_id, title, content)
+                    if update_time is not None and update_time > user_index["synced_at"]:
+                        user_index["synced_at"] = update_time
+                if len(user_index["lengths"]) == live_count:
+                    return user_index
+        elif user_index is not None and latest == since:
+            return user_index
+
+        user_index = self._load_user(db, user_id, latest)
+        with self._lock:
+            self._users[user_id] = user_index
+        return user_index
+
+    def search(self, db: Session, user_id: int, keyword: str) -> List[int]:
+        """返回按相关度降序排列的笔记ID"""
+        user_index = self._sync(db, user_id)
+        with self._lock:
+            lengths = user_index["lengths"]
+            total_docs = len(lengths)
+            if not total_docs:
+                return []
+            avg_length = sum(lengths.values()) / total_docs
+            scores: Dict[int, float] = {}
+            for term in set(tokenize(keyword)):
+                docs = user_index["postings"].get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (total_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for note_id, tf in docs.items():
+                    norm = self.K1 * (1 - self.B + self.B * lengths[note_id] / avg_length)
+                    scores[note_id] = scores.get(note_id, 0.0) + idf * tf * (self.K1 + 1) / (tf + norm)
+        return sorted(scores, key=lambda note_id: (-scores[note_id], -note_id))
+
+
+note_index = NoteSearchIndex()
+
+
+def search_notes(db: Session, query, user_id: int, keyword: str, skip: int, limit: int) -> List[Note]:
+    """
+    全文检索笔记，结果按相关度排序
+    - MySQL：FULLTEXT 索引（ngram 解析器）MATCH ... AGAINST
+    - 其他数据库（本地 SQLite）：进程内倒排索引
+    - 关键词短于 ngram 长度时无法走索引，回退为 LIKE 匹配
+    """
+    if len(keyword.strip()) < NGRAM_SIZE:
+        query = query.filter(Note.title.contains(keyword) | Note.content.contains(keyword))
+        return query.order_by(Note.update_time.desc(), Note.id.desc()).offset(skip).limit(limit).all()
+
+    if db.get_bind().dialect.name == "mysql":
+        score = match(Note.title, Note.content, against=keyword)
+        return query.filter(score > 0).order_by(
+            score.desc(), Note.id.desc()
+        ).offset(skip).limit(limit).all()
+
+    # 按相关度顺序分批用查询条件过滤 ID，凑够 skip + limit 条即停止，最后只加载当前页
+    ranked_ids = note_index.search(db, user_id, keyword)
+    matched: List[int] = []
+    for start in range(0, len(ranked_ids), RANKED_BATCH_SIZE):
+        batch = ranked_ids[start:start + RANKED_BATCH_SIZE]
+        found = {note_id for (note_id,) in query.filter(Note.id.in_(batch)).with_entities(Note.id)}
+        matched.extend(note_id for note_id in batch if note_id in found)
+        if len(matched) >= skip + limit:
+            break
+    page_ids = matched[skip:skip + limit]
+    if not page_ids:
+        return []
+    rank = {note_id: i for i, note_id in enumerate(page_ids)}
+    notes = query.filter(Note.id.in_(page_ids)).all()
+    notes.sort(key=lambda note: rank[note.id])
+    return notes
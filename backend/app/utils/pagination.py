@@ -0,0 +1,127 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import DateTime, and_, false, func, or_
+
+# 游标分页：下一页游标通过响应头返回，响应体保持原有列表结构
+# - NULL 视为最小值（与 MySQL / SQLite 默认的 NULL 排序一致）：升序排在最前，降序排在最后
+# - SQLite 以文本保存 DATETIME：server_default 写入 'YYYY-MM-DD HH:MM:SS'，而绑定参数为
+#   'YYYY-MM-DD HH:MM:SS.ffffff'，直接比较会把同一时刻判为不等，游标无法前进；
+#   因此在 SQLite 上排序与比较都先统一成同一文本格式（精确到毫秒）
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# 排序键：(列, 是否降序)
+SortKey = Tuple[Any, bool]
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _load_value(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_dump_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_keys: Sequence[SortKey]) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(sort_keys):
+            raise ValueError(cursor)
+        return [_load_value(column, v) for (column, _), v in zip(sort_keys, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _dialect_name(query) -> str:
+    return query.session.get_bind().dialect.name
+
+
+def _is_datetime(column: Any) -> bool:
+    return isinstance(column.type, DateTime)
+
+
+def _sort_expr(column: Any, dialect_name: str) -> Any:
+    if dialect_name == "sqlite" and _is_datetime(column):
+        return func.strftime("%Y-%m-%d %H:%M:%f", column)
+    return column
+
+
+def _bind_value(column: Any, value: Any, dialect_name: str) -> Any:
+    """游标值按排序表达式的格式绑定"""
+    if value is not None and dialect_name == "sqlite" and _is_datetime(column):
+        return value.strftime("%Y-%m-%d %H:%M:%S.") + f"{value.microsecond // 1000:03d}"
+    return value
+
+
+def _after(expr: Any, value: Any, descending: bool) -> Any:
+    """严格位于 value 之后（NULL 为最小值）"""
+    if value is None:
+        return false() if descending else expr.isnot(None)
+    if descending:
+        return or_(expr < value, expr.is_(None))
+    return expr > value
+
+
+def _equals(expr: Any, value: Any) -> Any:
+    return expr.is_(None) if value is None else expr == value
+
+
+def keyset_order_by(sort_keys: Sequence[SortKey], dialect_name: str = "") -> list:
+    exprs = [(_sort_expr(column, dialect_name), descending) for column, descending in sort_keys]
+    return [expr.desc() if descending else expr.asc() for expr, descending in exprs]
+
+
+def apply_keyset(query, sort_keys: Sequence[SortKey], cursor: Optional[str]):
+    """
+    按排序键对查询做游标过滤：取严格位于游标之后的行
+    (a, b, id) 之后 = a 之后 OR (a 相等 AND b 之后) OR (a、b 相等 AND id 之后)
+    """
+    if not cursor:
+        return query
+    dialect_name = _dialect_name(query)
+    values = decode_cursor(cursor, sort_keys)
+    exprs = [_sort_expr(column, dialect_name) for column, _ in sort_keys]
+    binds = [_bind_value(column, value, dialect_name) for (column, _), value in zip(sort_keys, values)]
+    conditions = []
+    for i, (_, descending) in enumerate(sort_keys):
+        equals = [_equals(exprs[j], binds[j]) for j in range(i)]
+        conditions.append(and_(*equals, _after(exprs[i], binds[i], descending)))
+    return query.filter(or_(*conditions))
+
+
+def paginate(
+    query, sort_keys: Sequence[SortKey], response: Response,
+    cursor: Optional[str], skip: int, limit: int,
+) -> list:
+    """
+    执行分页查询：传 cursor 时走游标分页（忽略 skip），否则兼容原 offset 分页
+    满页时在响应头 X-Next-Cursor 中返回下一页游标
+    """
+    query = query.order_by(*keyset_order_by(sort_keys, _dialect_name(query)))
+    if cursor:
+        rows = apply_keyset(query, sort_keys, cursor).limit(limit).all()
+    else:
+        rows = query.offset(skip).limit(limit).all()
+    if len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, column.key) for column, _ in sort_keys]
+        )
+    return rows
@@ -0,0 +1,51 @@
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+# 语句执行时间上限（在数据库侧生效：调用方放弃等待后，查询也会按时停止并释放连接）：
+# - MySQL：会话变量 max_execution_time（毫秒，只作用于 SELECT）；MariaDB 为 max_statement_time（秒）
+#   结束后恢复为全局默认值，连接归还连接池时不带限制
+# - SQLite：进度回调，超过截止时间后中断当前语句（OperationalError: interrupted）；
+#   aiosqlite 的连接只能在其工作线程中访问，通过其异步接口设置（需在 run_sync 中调用）
+
+# SQLite 每执行多少条虚拟机指令检查一次截止时间
+SQLITE_PROGRESS_STEPS = 1000
+
+
+def _set_progress_handler(raw: Any, handler: Optional[Callable[[], int]], steps: int) -> None:
+    if isinstance(raw, sqlite3.Connection):
+        raw.set_progress_handler(handler, steps)
+    else:
+        await_only(raw.set_progress_handler(handler, steps))
+
+
+@contextmanager
+def statement_timeout(db: Session, timeout_ms: int) -> Iterator[None]:
+    """在 Session 当前使用的连接上限制语句执行时间，超时的语句由数据库报错终止"""
+    connection = db.connection()
+    dialect = connection.dialect
+    if dialect.name == "mysql":
+        if dialect.is_mariadb:
+            variable, value = "max_statement_time", f"{timeout_ms / 1000:.3f}"
+        else:
+            variable, value = "max_execution_time", str(int(timeout_ms))
+        connection.exec_driver_sql(f"SET SESSION {variable} = {value}")
+        try:
+            yield
+        finally:
+            connection.exec_driver_sql(f"SET SESSION {variable} = DEFAULT")
+        return
+
+    if dialect.name == "sqlite":
+        raw = connection.connection.driver_connection
+        deadline = time.monotonic() + timeout_ms / 1000
+        _set_progress_handler(raw, lambda: int(time.monotonic() > deadline), SQLITE_PROGRESS_STEPS)
+        try:
+            yield
+        finally:
+            _set_progress_handler(raw, None, 0)
+        return
+    yield
@@ -0,0 +1,117 @@
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.recipe import Recipe, RecipeIngredient
+
+# 食材清单分隔符：逗号、顿号、分号、换行
+_SEPARATOR_RE = re.compile(r"[,，、;；\n]+")
+# 食材名称：取用量（数字/空格）之前的部分，如 "五花肉 500g" -> "五花肉"
+_NAME_RE = re.compile(r"^[^\d\s]+")
+# 用量在前的写法先去掉开头的数量和单位，如 "2个鸡蛋"、"两片姜"、"3 tomatoes"、"2 cups of flour"
+# 中文数字后必须跟单位才视为用量，避免误伤 "五花肉"、"三文鱼" 等名称
+_UNIT = (
+    r"(?:毫升|千克|公斤|汤匙|茶匙|小勺|大勺|[个只颗粒根片瓣块条把勺杯碗袋包盒罐克斤两升张]"
+    r"|(?:kg|mg|ml|g|l|oz|lbs?|cups?|tbsp|tsp|pcs|pieces?|cloves?|slices?|cans?)(?![a-z]))"
+)
+_QUANTITY_RE = re.compile(
+    rf"^(?:\d+(?:[./]\d+)?\s*{_UNIT}?|[一二两三四五六七八九十半几]+\s*{_UNIT})\s*(?:of\s+)?",
+    re.IGNORECASE,
+)
+
+
+def normalize_ingredient(name: str) -> str:
+    return name.strip().lower()[:50]
+
+
+def parse_ingredients(text: Optional[str]) -> List[str]:
+    """解析食材清单文本为去重后的食材名称列表"""
+    names = []
+    seen = set()
+    for part in _SEPARATOR_RE.split(text or ""):
+        matched = _NAME_RE.match(_QUANTITY_RE.sub("", part.strip(), count=1))
+        if not matched:
+            continue
+        name = normalize_ingredient(matched.group(0))
+        if name and name not in seen:
+            seen.add(name)
+            names.append(name)
+    return names
+
+
+def sync_recipe_ingredients(db: Session, recipe: Recipe) -> None:
+    """
+    重建单个菜谱的食材索引（需在调用方提交事务前执行，与菜谱写入同事务）
+    已删除的菜谱只清空索引
+    """
+    db.query(RecipeIngredient).filter(
+        RecipeIngredient.recipe_id == recipe.id
+    ).delete(synchronize_session=False)
+    if recipe.is_delete:
+        return
+    db.add_all([
+        RecipeIngredient(user_id=recipe.user_id, recipe_id=recipe.id, ingredient=name)
+        for name in parse_ingredients(recipe.ingredients)
+    ])
+
+
+def search_by_ingredients(
+    db: Session, user_id: int, ingredients: List[str], match_all: bool = False, limit: int = 20
+) -> List[Tuple[int, Set[str], int]]:
+    """
+    按食材检索菜谱，按覆盖度排序
+
+    返回 [(recipe_id, 命中的食材, 菜谱食材总数)]：
+    命中数多的在前；命中数相同时，菜谱所需食材越少（缺的越少）越靠前
+    """
+    wanted = [normalize_ingredient(name) for name in ingredients if name.strip()]
+    if not wanted:
+        return []
+
+    hits = db.query(RecipeIngredient.recipe_id, RecipeIngredient.ingredient).join(
+        Recipe, Recipe.id == RecipeIngredient.recipe_id
+    ).filter(
+        RecipeIngredient.user_id == user_id,
+        RecipeIngredient.ingredient.in_(wanted),
+        Recipe.is_delete == 0,
+    ).all()
+    matched: Dict[int, Set[str]] = {}
+    for recipe_id, ingredient in hits:
+        matched.setdefault(recipe_id, set()).add(ingredient)
+    if match_all:
+        matched = {rid: names for rid, names in matched.items() if len(names) == len(set(wanted))}
+    if not matched:
+        return []
+
+    totals = dict(
+        db.query(RecipeIngredient.recipe_id, func.count(RecipeIngredient.id)).filter(
+            RecipeIngredient.recipe_id.in_(list(matched))
+        ).group_by(RecipeIngredient.recipe_id).all()
+    )
+    ranked = sorted(
+        matched.items(),
+        key=lambda item: (-len(item[1]), totals.get(item[0], 0), -item[0]),
+    )
+    return [(rid, names, totals.get(rid, 0)) for rid, names in ranked[:limit]]
+
+
+def rebuild_ingredient_index(db: Session, batch_size: int = 500) -> int:
+    """全量重建食材索引（初始化/数据迁移后执行），按主键分批处理，返回处理的菜谱数"""
+    db.query(RecipeIngredient).delete(synchronize_session=False)
+    count = 0
+    last_id = 0
+    while True:
+        rows = db.query(Recipe.id, Recipe.user_id, Recipe.ingredients).filter(
+            Recipe.is_delete == 0, Recipe.id > last_id
+        ).order_by(Recipe.id).limit(batch_size).all()
+        if not rows:
+            break
+        db.bulk_insert_mappings(RecipeIngredient, [
+            {"user_id": user_id, "recipe_id": recipe_id, "ingredient": name}
+            for recipe_id, user_id, text in rows
+            for name in parse_ingredients(text)
+        ])
+        count += len(rows)
+        last_id = rows[-1][0]
+    db.commit()
+    return count
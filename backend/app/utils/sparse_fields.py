@@ -0,0 +1,56 @@
+from typing import Any, Iterable, List, Optional, Sequence, Type
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import func
+from sqlalchemy.orm import load_only, with_expression
+from app.utils.fast_json import FastJSONResponse, json_response
+
+# 稀疏字段集 / 摘要模式：列表接口只加载和返回请求的字段，大字段（TEXT）在 ORM 层延迟加载
+
+
+def select_fields(
+    fields: Optional[str], schema: Type[BaseModel], excerpt: Optional[int], large_fields: Sequence[str]
+) -> Optional[List[str]]:
+    """
+    解析 fields 参数，返回需要输出的字段；未传 fields 且未开启摘要时返回 None（走原有完整输出）
+    - fields：逗号分隔，必须是输出 Schema 中的字段，id 总是返回
+    - 仅开启摘要模式时：输出除大字段外的全部字段
+    """
+    if not fields and not excerpt:
+        return None
+    if not fields:
+        return [name for name in schema.model_fields if name not in large_fields]
+    selected = ["id"]
+    for name in (f.strip() for f in fields.split(",")):
+        if not name or name in selected:
+            continue
+        if name not in schema.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+        selected.append(name)
+    return selected
+
+
+def sparse_options(
+    model: Any, fields: Iterable[str], extra_columns: Iterable[str],
+    excerpt_column: Any, excerpt: Optional[int],
+) -> list:
+    """
+    ORM 加载选项：只加载请求字段及排序所需的列；摘要在 SQL 中截取，原大字段不加载
+    模型需声明 excerpt = query_expression()
+    """
+    columns = {name for name in list(fields) + list(extra_columns) if hasattr(model, name)}
+    options = [load_only(*[getattr(model, name) for name in sorted(columns)])]
+    if excerpt:
+        options.append(with_expression(model.excerpt, func.substr(excerpt_column, 1, excerpt)))
+    return options
+
+
+def sparse_response(rows: Iterable[Any], fields: List[str], excerpt: Optional[int], response: Response) -> FastJSONResponse:
+    """直接输出请求字段组成的 JSON，沿用依赖注入 Response 上设置的响应头（如 X-Next-Cursor）"""
+    content = []
+    for row in rows:
+        item = {name: getattr(row, name) for name in fields}
+        if excerpt:
+            item["excerpt"] = row.excerpt
+        content.append(item)
+    return json_response(content, response)
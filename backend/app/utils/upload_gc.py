@@ -0,0 +1,201 @@
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# 支持直接运行：python app/utils/upload_gc.py
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.note import Note
+from app.models.recipe import Recipe
+from app.models.upload import StoredObject, UserUpload
+from app.models.user import User
+from app.utils.image_derivatives import DERIVED_DIR, evict_derivatives
+from app.utils.upload_store import (
+    OBJECTS_DIR, TMP_DIR, legacy_path, release_upload, upload_path_cache, upload_refs,
+)
+from app.utils.uploads import remove_quietly
+
+# 孤儿上传文件回收：
+# 1. 流式扫描菜谱图片、用户头像、笔记内容中的图片 URL，得到被引用的 (user_id, filename)
+# 2. 超过宽限期、引用数为 0 且未被引用的上传映射：释放（映射数归零的存储对象连同衍生图一起删除）
+# 3. 流式遍历上传目录：删除超过宽限期且未被引用的旧文件、无数据库记录的对象文件、残留的临时文件、失去原图的衍生图
+#
+# 被引用过的映射在引用数归零时已由写入路径释放，这里主要回收上传后从未保存的文件；
+# 宽限期保护刚上传但尚未保存到菜谱/笔记/头像的文件，因此可以在上传进行中运行
+# 引用数可按当前数据重新统计（升级后首次执行，或数据被接口之外的方式修改后）：--recount，需在停止写入时执行
+
+BATCH_SIZE = 500
+
+
+def reference_counts(db: Session) -> Counter:
+    """分批流式读取，统计每个 (user_id, filename) 被引用的次数"""
+    counts: Counter = Counter()
+    sources = (
+        db.query(Recipe.image_url).filter(Recipe.is_delete == 0, Recipe.image_url.isnot(None)),
+        db.query(User.avatar).filter(User.avatar.isnot(None)),
+        db.query(Note.content).filter(Note.is_delete == 0, Note.content.contains("/images/file/")),
+    )
+    for query in sources:
+        for (text,) in query.yield_per(BATCH_SIZE):
+            counts.update(upload_refs(text))
+    return counts
+
+
+def referenced_uploads(db: Session) -> Set[Tuple[int, str]]:
+    """所有被引用的 (user_id, filename)"""
+    return set(reference_counts(db))
+
+
+def recount_references(db: Session) -> int:
+    """按当前数据重写全部映射的引用数，返回被引用的映射数"""
+    counts = reference_counts(db)
+    db.query(UserUpload).update({UserUpload.ref_count: 0}, synchronize_session=False)
+    updated = 0
+    for (user_id, filename), count in counts.items():
+        updated += db.query(UserUpload).filter(
+            UserUpload.user_id == user_id, UserUpload.filename == filename
+        ).update({UserUpload.ref_count: count}, synchronize_session=False)
+    db.commit()
+    return updated
+
+
+def _candidate_uploads(db: Session, referenced: Set[Tuple[int, str]], created_before: datetime) -> List[int]:
+    """超过宽限期、引用数为 0 且扫描时未被引用的上传映射 ID"""
+    return [
+        upload_id
+        for upload_id, user_id, filename in db.query(
+            UserUpload.id, UserUpload.user_id, UserUpload.filename
+        ).filter(UserUpload.create_time < created_before, UserUpload.ref_count == 0).yield_per(BATCH_SIZE)
+        if (user_id, filename) not in referenced
+    ]
+
+
+def _walk_files(directory: str) -> Iterator[os.DirEntry]:
+    """流式遍历目录树中的文件"""
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _delete(entry: os.DirEntry, report: Dict[str, int], key: str, dry_run: bool) -> None:
+    try:
+        size = entry.stat().st_size
+    except FileNotFoundError:
+        return
+    report[key] += 1
+    report["bytes_reclaimed"] += size
+    if not dry_run:
+        remove_quietly(entry.path)
+
+
+def collect_garbage(db: Session, grace_hours: Optional[float] = None, dry_run: bool = False) -> Dict[str, int]:
+    """执行一次回收，返回回收报告"""
+    if grace_hours is None:
+        grace_hours = settings.UPLOAD_GC_GRACE_HOURS
+    cutoff = time.time() - grace_hours * 3600
+    report = {
+        "referenced": 0,
+        "released_uploads": 0,
+        "deleted_legacy_files": 0,
+        "deleted_stray_objects": 0,
+        "deleted_temp_files": 0,
+        "deleted_derivatives": 0,
+        "bytes_reclaimed": 0,
+    }
+    referenced = referenced_uploads(db)
+    report["referenced"] = len(referenced)
+
+    # 1. 上传映射：先收集候选 ID（释放过程中会提交事务，不能边流式读取边释放）
+    # 宽限期按数据库时钟计算：create_time 由数据库写入（SQLite 的 CURRENT_TIMESTAMP 为 UTC）
+    created_before = db.query(func.now()).scalar() - timedelta(hours=grace_hours)
+    for upload_id in _candidate_uploads(db, referenced, created_before):
+        if dry_run:
+            report["released_uploads"] += 1
+            continue
+        # 加行锁后复核引用数：扫描之后并发保存的菜谱/笔记/头像可能已重新引用该上传
+        upload = db.query(UserUpload).filter(
+            UserUpload.id == upload_id, UserUpload.ref_count == 0
+        ).with_for_update().first()
+        if upload is None:
+            db.rollback()
+            continue
+        report["released_uploads"] += 1
+        report["bytes_reclaimed"] += release_upload(db, upload)
+
+    # 2. 流式遍历上传目录
+    upload_dir = settings.UPLOAD_DIR
+    objects_prefix = os.path.join(upload_dir, OBJECTS_DIR) + os.sep
+    tmp_prefix = os.path.join(upload_dir, TMP_DIR) + os.sep
+    derived_prefix = os.path.join(upload_dir, DERIVED_DIR) + os.sep
+    known_objects = {sha256 for (sha256,) in db.query(StoredObject.sha256).yield_per(BATCH_SIZE)}
+    for entry in _walk_files(upload_dir):
+        path = entry.path
+        try:
+            # 不使用 DirEntry 缓存的 stat：文件可能刚被并发上传重新放置
+            if os.stat(path).st_mtime >= cutoff:
+                continue
+        except FileNotFoundError:
+            continue
+        if path.startswith(tmp_prefix) or entry.name.endswith((".part", ".deleting")):
+            _delete(entry, report, "deleted_temp_files", dry_run)
+        elif path.startswith(objects_prefix):
+            # 对象记录在扫描开始后才创建的文件，其修改时间必然在宽限期内，已在上面跳过
+            if os.path.splitext(entry.name)[0] not in known_objects:
+                _delete(entry, report, "deleted_stray_objects", dry_run)
+        elif path.startswith(derived_prefix):
+            stem, ext = os.path.splitext(os.path.relpath(path, derived_prefix))
+            source = os.path.join(upload_dir, stem.rsplit("_w", 1)[0] + ext)
+            if not os.path.exists(source):
+                _delete(entry, report, "deleted_derivatives", dry_run)
+        else:
+            parent = os.path.basename(os.path.dirname(path))
+            if not parent.isdigit() or os.path.dirname(os.path.dirname(path)) != upload_dir.rstrip(os.sep):
+                continue
+            user_id = int(parent)
+            if (user_id, entry.name) in referenced:
+                continue
+            # 已迁移到内容寻址存储的文件不会留在旧目录；这里是未迁移且未被引用的旧文件
+            if db.query(UserUpload.id).filter(
+                UserUpload.user_id == user_id, UserUpload.filename == entry.name
+            ).first():
+                continue
+            _delete(entry, report, "deleted_legacy_files", dry_run)
+            if not dry_run:
+                report["bytes_reclaimed"] += evict_derivatives(legacy_path(user_id, entry.name))
+                upload_path_cache.invalidate((user_id, entry.name))
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.db import base  # noqa: F401  注册全部模型
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="回收未被引用的上传文件")
+    parser.add_argument("--grace-hours", type=float, default=None, help="宽限期（小时），默认取配置 UPLOAD_GC_GRACE_HOURS")
+    parser.add_argument("--dry-run", action="store_true", help="只统计，不删除")
+    parser.add_argument("--recount", action="store_true", help="回收前按当前数据重新统计引用数（需停止写入）")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        if args.recount and not args.dry_run:
+            print(f"已重新统计引用数，被引用的上传 {recount_references(session)} 个")
+        result = collect_garbage(session, args.grace_hours, args.dry_run)
+    finally:
+        session.close()
+    for name, value in result.items():
+        print(f"{name}: {value}")
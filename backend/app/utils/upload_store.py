@@ -0,0 +1,269 @@
+import hashlib
+import os
+import re
+import secrets
+import shutil
+from collections import Counter
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import event, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, SessionTransaction
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.upload import StoredObject, UserUpload
+from app.utils.image_derivatives import evict_derivatives
+from app.utils.uploads import remove_quietly
+
+# 内容寻址上传存储：
+# - 文件按 SHA-256 存放于 <UPLOAD_DIR>/.objects/<hash 前两位>/<hash><扩展名>，相同内容只存一份
+# - 对外 URL 仍为 /images/file/{user_id}/{filename}，通过 user_upload 映射到存储对象
+# - user_upload.ref_count 为该 URL 被菜谱图片、笔记内容、头像引用的次数，由这些写入路径调用 update_references 维护；
+#   从正数降为 0 时立即释放映射。从未被引用过的映射（上传后未保存）由回收任务在宽限期后释放
+# - stored_object.upload_count 为映射条数，降为 0 时删除文件及其衍生图（文件在事务提交后删除，回滚则恢复）
+# - 用户配额按其引用的去重后对象大小计算
+
+OBJECTS_DIR = ".objects"
+TMP_DIR = os.path.join(OBJECTS_DIR, "tmp")
+IMAGE_URL_RE = re.compile(r"/images/file/(\d+)/([^/\s\"'?#<>()\\]+)")
+# Session.info 中的键：本事务内已释放、待提交后清理的映射；提交后累计释放的字节数
+RELEASED_KEY = "released_uploads"
+FREED_KEY = "upload_bytes_freed"
+
+# (user_id, filename) -> 文件路径；映射创建后不变，释放时主动失效
+upload_path_cache = TTLCache(max_size=4096, ttl=300)
+
+
+def objects_tmp_dir() -> str:
+    """上传临时目录（与对象目录同一文件系统，保证原子重命名）"""
+    return os.path.join(settings.UPLOAD_DIR, TMP_DIR)
+
+
+def object_path(sha256: str, ext: str) -> str:
+    return os.path.join(settings.UPLOAD_DIR, OBJECTS_DIR, sha256[:2], f"{sha256}{ext}")
+
+
+def legacy_path(user_id: int, filename: str) -> str:
+    """内容寻址存储之前的上传路径"""
+    return os.path.join(settings.UPLOAD_DIR, str(user_id), filename)
+
+
+def user_usage(db: Session, user_id: int) -> int:
+    """用户已用空间（字节）：其引用的去重后存储对象大小之和"""
+    object_ids = db.query(UserUpload.object_id).filter(UserUpload.user_id == user_id).distinct()
+    used = db.query(func.coalesce(func.sum(StoredObject.size), 0)).filter(
+        StoredObject.id.in_(object_ids.scalar_subquery())
+    ).scalar()
+    return int(used)
+
+
+def quota_bytes() -> int:
+    return settings.UPLOAD_QUOTA_MB * 1024 * 1024
+
+
+def _check_quota(db: Session, user_id: int, obj: Optional[StoredObject], size: int) -> None:
+    if not settings.UPLOAD_QUOTA_MB:
+        return
+    # 用户已引用相同内容时不占用额外空间
+    if obj is not None and db.query(UserUpload.id).filter(
+        UserUpload.user_id == user_id, UserUpload.object_id == obj.id
+    ).first():
+        return
+    if user_usage(db, user_id) + size > quota_bytes():
+        raise HTTPException(status_code=413, detail=f"存储空间不足，配额为 {settings.UPLOAD_QUOTA_MB}MB")
+
+
+def register_upload(
+    db: Session, user_id: int, filename: str, ext: str, src_path: str, size: int, sha256: str,
+    enforce_quota: bool = True, src_is_temp: bool = True,
+) -> bool:
+    """
+    将已写入磁盘的文件登记到内容寻址存储（同步数据库操作，在线程池中执行）
+    返回是否命中已有对象（去重）
+    成功后源文件被移入对象目录或删除；失败时仅删除临时文件，非临时源文件保持不动
+    """
+    ext = ext[:10]
+    try:
+        for _ in range(2):
+            obj = db.query(StoredObject).filter(StoredObject.sha256 == sha256).with_for_update().first()
+            if enforce_quota:
+                _check_quota(db, user_id, obj, size)
+            deduplicated = obj is not None
+            if obj is None:
+                obj = StoredObject(sha256=sha256, size=size, ext=ext, upload_count=0)
+                db.add(obj)
+                try:
+                    db.flush()
+                except IntegrityError:
+                    # 并发上传了相同内容，重新读取已存在的对象
+                    db.rollback()
+                    continue
+            path = object_path(sha256, obj.ext)
+            # 对象文件已存在时不覆盖：内容相同，且保持修改时间不变（图片的强 ETag 由大小 + 修改时间生成）
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if src_is_temp:
+                    os.replace(src_path, path)
+                else:
+                    # 非临时文件（旧上传）先硬链接，提交成功后再删除原文件
+                    try:
+                        os.link(src_path, path)
+                    except OSError:
+                        shutil.copyfile(src_path, path)
+            obj.upload_count = StoredObject.upload_count + 1
+            db.add(UserUpload(user_id=user_id, filename=filename, object_id=obj.id))
+            db.commit()
+            remove_quietly(src_path)
+            return deduplicated
+        raise HTTPException(status_code=409, detail="上传冲突，请重试")
+    except BaseException:
+        db.rollback()
+        if src_is_temp:
+            remove_quietly(src_path)
+        raise
+
+
+def cached_upload_path(user_id: int, filename: str) -> Optional[str]:
+    return upload_path_cache.get((user_id, filename))
+
+
+def resolve_upload_path(db: Session, user_id: int, filename: str) -> str:
+    """
+    对外文件名 -> 实际文件路径；没有映射的旧文件按原路径访问
+    只缓存确定的结果（有映射，或旧文件存在）：从库延迟时刚上传的文件暂时查不到映射，不能缓存为 404
+    """
+    row = db.query(StoredObject.sha256, StoredObject.ext).join(
+        UserUpload, UserUpload.object_id == StoredObject.id
+    ).filter(UserUpload.user_id == user_id, UserUpload.filename == filename).first()
+    path = object_path(*row) if row else legacy_path(user_id, filename)
+    if row or os.path.exists(path):
+        upload_path_cache.set((user_id, filename), path)
+    return path
+
+
+def upload_refs(text: Optional[str]) -> Iterator[Tuple[int, str]]:
+    """文本（图片 URL、笔记内容）中引用的上传 (user_id, filename)"""
+    for user_id, filename in IMAGE_URL_RE.findall(text or ""):
+        yield int(user_id), filename
+
+
+def _release(db: Session, upload: UserUpload) -> None:
+    """删除上传映射，存储对象映射数减一；降为 0 时删除对象，文件在事务提交后删除"""
+    obj = db.query(StoredObject).filter(StoredObject.id == upload.object_id).with_for_update().one()
+    db.delete(upload)
+    obj.upload_count = StoredObject.upload_count - 1
+    db.flush()
+    db.refresh(obj)
+    path = object_path(obj.sha256, obj.ext)
+    orphaned = obj.upload_count <= 0
+    trash_path = None
+    if orphaned:
+        db.delete(obj)
+        # 提交前（仍持有行锁）先把文件移出对象路径：并发上传相同内容时会等待行锁释放，
+        # 之后按新对象重新放置文件，不会被这里的删除误伤；事务未提交则移回
+        if os.path.exists(path):
+            trash_path = f"{path}.{secrets.token_hex(4)}.deleting"
+            os.replace(path, trash_path)
+    db.info.setdefault(RELEASED_KEY, []).append(((upload.user_id, upload.filename), path, orphaned, trash_path))
+
+
+@event.listens_for(Session, "after_commit")
+def _finish_releases(session: Session) -> None:
+    freed = 0
+    for cache_key, path, orphaned, trash_path in session.info.pop(RELEASED_KEY, []):
+        upload_path_cache.invalidate(cache_key)
+        if orphaned:
+            freed += evict_derivatives(path)
+        if trash_path:
+            freed += os.path.getsize(trash_path)
+            remove_quietly(trash_path)
+    if freed:
+        session.info[FREED_KEY] = session.info.get(FREED_KEY, 0) + freed
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _undo_releases(session: Session, transaction: SessionTransaction) -> None:
+    # 提交时已清空；走到这里说明事务回滚或未提交即关闭，把文件移回对象路径
+    if transaction.parent is not None:
+        return
+    for _, path, _, trash_path in reversed(session.info.pop(RELEASED_KEY, [])):
+        if trash_path:
+            os.replace(trash_path, path)
+
+
+def update_references(db: Session, before: Iterable[Optional[str]], after: Iterable[Optional[str]]) -> None:
+    """
+    菜谱图片、笔记内容、头像变更时调用（在调用方事务中执行，由调用方提交）
+    按变更前后文本中的图片 URL 调整映射的引用数，引用数由正数降为 0 的映射随事务一起释放
+    """
+    changes: Counter = Counter()
+    for text in after:
+        changes.update(upload_refs(text))
+    for text in before:
+        changes.subtract(upload_refs(text))
+    # 按固定顺序加锁，避免并发编辑时死锁
+    for (user_id, filename), change in sorted(changes.items()):
+        if not change:
+            continue
+        upload = db.query(UserUpload).filter(
+            UserUpload.user_id == user_id, UserUpload.filename == filename
+        ).with_for_update().first()
+        if upload is None:
+            # 未迁移的旧文件或已释放的 URL
+            continue
+        previous = upload.ref_count
+        upload.ref_count = max(previous + change, 0)
+        if previous > 0 and upload.ref_count == 0:
+            _release(db, upload)
+
+
+def release_upload(db: Session, upload: UserUpload) -> int:
+    """回收任务调用：释放上传映射并提交，返回释放的磁盘字节数"""
+    freed_before = db.info.get(FREED_KEY, 0)
+    _release(db, upload)
+    db.commit()
+    return db.info.get(FREED_KEY, 0) - freed_before
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def import_legacy_uploads(db: Session) -> Dict[str, int]:
+    """
+    将 <UPLOAD_DIR>/<user_id>/ 下的旧文件迁移到内容寻址存储（可重复执行）
+    旧 URL 通过映射继续可用；重复内容只保留一份
+    """
+    stats = {"files": 0, "deduplicated": 0, "bytes_saved": 0}
+    if not os.path.isdir(settings.UPLOAD_DIR):
+        return stats
+    for entry in os.scandir(settings.UPLOAD_DIR):
+        if not entry.is_dir() or not entry.name.isdigit():
+            continue
+        user_id = int(entry.name)
+        for file_entry in os.scandir(entry.path):
+            if not file_entry.is_file() or file_entry.name.startswith("."):
+                continue
+            filename = file_entry.name
+            if db.query(UserUpload.id).filter(
+                UserUpload.user_id == user_id, UserUpload.filename == filename
+            ).first():
+                continue
+            size = file_entry.stat().st_size
+            sha256 = _file_sha256(file_entry.path)
+            # 旧文件按用户目录生成的衍生图不再使用
+            evict_derivatives(file_entry.path)
+            deduplicated = register_upload(
+                db, user_id, filename, os.path.splitext(filename)[1].lower(), file_entry.path, size, sha256,
+                enforce_quota=False, src_is_temp=False,
+            )
+            upload_path_cache.invalidate((user_id, filename))
+            stats["files"] += 1
+            if deduplicated:
+                stats["deduplicated"] += 1
+                stats["bytes_saved"] += size
+    return stats
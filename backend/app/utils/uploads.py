@@ -0,0 +1,61 @@
+import hashlib
+import os
+import secrets
+from functools import partial
+from typing import Optional, Tuple
+import anyio
+from fastapi import HTTPException, UploadFile
+from app.core.config import settings
+
+# 上传文件落盘：固定大小分块拷贝到临时文件（异步文件 I/O，不阻塞事件循环），
+# 边写边校验大小上限并计算内容哈希；失败时清理临时文件
+
+CHUNK_SIZE = 256 * 1024
+# multipart 表单除文件内容外的边界、字段头等开销
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+def max_upload_bytes() -> int:
+    return settings.UPLOAD_MAX_SIZE_MB * 1024 * 1024
+
+
+def too_large_detail(max_bytes: int) -> str:
+    return f"文件大小不能超过 {max_bytes // (1024 * 1024)}MB"
+
+
+def content_length_exceeds(content_length: Optional[str], max_bytes: int) -> bool:
+    """根据 Content-Length 判断请求是否明显超限（在接收请求体之前拒绝）"""
+    return bool(content_length and content_length.isdigit() and int(content_length) > max_bytes + MULTIPART_OVERHEAD)
+
+
+async def stream_to_temp(file: UploadFile, directory: str, max_bytes: int) -> Tuple[str, int, str]:
+    """
+    将上传文件分块写入 directory 下的临时文件，同时计算 SHA-256
+    返回 (临时文件路径, 字节数, sha256)；超限或失败时删除临时文件并抛出异常
+    """
+    await anyio.to_thread.run_sync(partial(os.makedirs, directory, exist_ok=True))
+    tmp_path = os.path.join(directory, f".{secrets.token_hex(8)}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as f:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=too_large_detail(max_bytes))
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        await anyio.to_thread.run_sync(partial(remove_quietly, tmp_path))
+        raise
+    return tmp_path, size, digest.hexdigest()
+
+
+def remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,29 @@
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy.orm import Session
+
+
+def upsert(
+    db: Session, model: Any, rows: List[Dict[str, Any]], index_elements: Sequence[str], update_columns: Sequence[str],
+    update_values: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    批量插入，唯一键冲突时更新指定列（单条语句，在调用方事务中执行）
+    MySQL 使用 INSERT ... ON DUPLICATE KEY UPDATE，SQLite 使用 INSERT ... ON CONFLICT DO UPDATE
+    index_elements：冲突判定的唯一键列（仅 SQLite 需要，MySQL 按表上的唯一索引判定）
+    update_values：冲突时额外设置的列值（如 update_time=func.now()）
+    """
+    if not rows:
+        return
+    extra = update_values or {}
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(index_elements),
+            set_={**{name: stmt.excluded[name] for name in update_columns}, **extra},
+        )
+    else:
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update({**{name: stmt.inserted[name] for name in update_columns}, **extra})
+    db.execute(stmt)
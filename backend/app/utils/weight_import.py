@@ -0,0 +1,105 @@
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, BinaryIO, Dict, List, Optional
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.weight import WeightRecord
+from app.schemas.weight import WeightCreate
+from app.utils.upsert import upsert
+from app.utils.weight_stats import get_week_num, refresh_rollups
+
+# 体重记录批量导入（CSV 格式与导出一致：日期,体重(kg),备注,所属周,录入时间）：
+# - 逐行流式解析与校验（校验规则与 WeightCreate 一致），出错的行记入报告并跳过
+# - 有效行按批写入：多行 INSERT ... ON DUPLICATE KEY UPDATE（uk_user_date），已有日期覆盖体重与备注
+# - 所属周由日期重新计算，录入时间列忽略；文件内重复的日期以最后一行为准
+# - 全部行写入后在同一事务内刷新受影响周期的汇总
+
+IMPORT_BATCH_SIZE = 500
+# 报告中最多列出的错误行数
+MAX_REPORTED_ERRORS = 100
+DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d")
+DATE_COLUMN = "日期"
+WEIGHT_COLUMN = "体重(kg)"
+REMARK_COLUMN = "备注"
+FIELD_COLUMNS = {"record_date": DATE_COLUMN, "weight": WEIGHT_COLUMN, "remark": REMARK_COLUMN}
+
+
+def _parse_date(text: str) -> date:
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"日期格式错误：{text}")
+
+
+def _cell(row: List[str], index: Optional[int]) -> str:
+    return row[index].strip() if index is not None and index < len(row) else ""
+
+
+def _flush(db: Session, pending: Dict[date, Dict[str, Any]]) -> None:
+    upsert(
+        db, WeightRecord, list(pending.values()),
+        index_elements=("user_id", "record_date"),
+        update_columns=("weight", "remark", "week_num"),
+        update_values={"update_time": func.now()},
+    )
+    pending.clear()
+
+
+def import_weight_csv(db: Session, user_id: int, stream: BinaryIO) -> Dict[str, Any]:
+    """导入 CSV 并提交，返回导入报告"""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    errors: List[Dict[str, Any]] = []
+    failed = 0
+    dates = set()
+    pending: Dict[date, Dict[str, Any]] = {}
+    try:
+        header = [name.strip() for name in next(reader, [])]
+        if DATE_COLUMN not in header or WEIGHT_COLUMN not in header:
+            raise HTTPException(status_code=400, detail=f"CSV 表头需包含“{DATE_COLUMN}”和“{WEIGHT_COLUMN}”列")
+        date_index = header.index(DATE_COLUMN)
+        weight_index = header.index(WEIGHT_COLUMN)
+        remark_index = header.index(REMARK_COLUMN) if REMARK_COLUMN in header else None
+
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            try:
+                record = WeightCreate(
+                    record_date=_parse_date(_cell(row, date_index)),
+                    weight=_cell(row, weight_index),
+                    remark=_cell(row, remark_index) or None,
+                )
+            except (ValueError, ValidationError) as e:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    if isinstance(e, ValidationError):
+                        detail = e.errors()[0]
+                        message = f"{FIELD_COLUMNS.get(detail['loc'][0], detail['loc'][0])}：{detail['msg']}"
+                    else:
+                        message = str(e)
+                    errors.append({"line": reader.line_num, "error": message})
+                continue
+            pending[record.record_date] = {
+                "user_id": user_id,
+                "record_date": record.record_date,
+                "weight": round(record.weight, 1),
+                "remark": record.remark,
+                "week_num": get_week_num(record.record_date),
+            }
+            dates.add(record.record_date)
+            if len(pending) >= IMPORT_BATCH_SIZE:
+                _flush(db, pending)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV 文件需为 UTF-8 编码")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"CSV 格式错误（第 {reader.line_num} 行）：{e}")
+
+    _flush(db, pending)
+    refresh_rollups(db, user_id, dates)
+    db.commit()
+    return {"imported": len(dates), "failed": failed, "errors": errors}
@@ -0,0 +1,173 @@
+import os
+import sys
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 支持直接运行：python app/utils/weight_stats.py
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from sqlalchemy import String, cast, extract, func, insert, literal, select
+from sqlalchemy.orm import Session
+from app.models.weight import WeightRecord, WeightRollup
+from app.utils.upsert import upsert
+
+# 体重周期统计：
+# - weight_rollup 为每个用户每周（YYYYWW）/ 每月（YYYYMM）保存 记录数、体重和、最低、最高
+# - 体重记录增删改时，在同一事务内按受影响周期重新聚合（周期内最多 31 条记录，走索引），写回汇总行
+# - 周期视图、全年序列只读取汇总行，平均值 = 体重和 / 记录数
+# - 汇总表缺失或不一致时可全量重建：python app/utils/weight_stats.py [--user-id N]
+
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+
+# (平均值, 最小值, 最大值, 记录数)
+PeriodStat = Tuple[float, float, float, int]
+
+
+def get_week_num(d: date) -> str:
+    """获取日期所属自然周 (ISO标准)"""
+    isoyear, week, _ = d.isocalendar()
+    return f"{isoyear}{week:02d}"
+
+
+def month_key(d: date) -> str:
+    return f"{d.year}{d.month:02d}"
+
+
+def month_key_column():
+    """月份键 YYYYMM（extract 在 MySQL / SQLite 上均可用）"""
+    key = extract("year", WeightRecord.record_date) * 100 + extract("month", WeightRecord.record_date)
+    return cast(key, String)
+
+
+def month_range(year: int, month: int) -> Tuple[date, date]:
+    """月份的首尾日期"""
+    start = date(year, month, 1)
+    next_start = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, next_start - timedelta(days=1)
+
+
+def previous_month(year: int, month: int) -> Tuple[int, int]:
+    return (year - 1, 12) if month == 1 else (year, month - 1)
+
+
+# --- 读取 ---
+
+def _read(db: Session, user_id: int, period: str, *conditions) -> Dict[str, PeriodStat]:
+    rows = db.query(
+        WeightRollup.period_key, WeightRollup.record_count, WeightRollup.weight_sum,
+        WeightRollup.min_weight, WeightRollup.max_weight,
+    ).filter(
+        WeightRollup.user_id == user_id, WeightRollup.period_type == period, *conditions
+    ).all()
+    return {
+        key: (float(total) / count, float(min_weight), float(max_weight), count)
+        for key, count, total, min_weight, max_weight in rows
+        if count
+    }
+
+
+def period_stats(db: Session, user_id: int, period: str, keys: List[str]) -> Dict[str, PeriodStat]:
+    """读取指定周期的统计，键为周期；无记录的周期不出现在结果中"""
+    return _read(db, user_id, period, WeightRollup.period_key.in_(keys))
+
+
+def year_series(db: Session, user_id: int, period: str, year: int) -> Dict[str, PeriodStat]:
+    """全年各周（ISO 周年）或各月的统计"""
+    last = f"{year}53" if period == PERIOD_WEEK else f"{year}12"
+    return _read(db, user_id, period, WeightRollup.period_key.between(f"{year}01", last))
+
+
+def stat_from_weights(weights: Iterable[float]) -> Optional[PeriodStat]:
+    """由已加载的记录直接计算统计（汇总行缺失时的兜底，如尚未重建或只读副本滞后）"""
+    values = [float(w) for w in weights]
+    if not values:
+        return None
+    return (sum(values) / len(values), min(values), max(values), len(values))
+
+
+def diff_from(current: Optional[PeriodStat], previous: Optional[PeriodStat]) -> float:
+    """与上一周期平均体重的差值（当前平均值先保留一位小数，与原有计算保持一致）"""
+    if current is None or previous is None:
+        return 0.0
+    return round(round(current[0], 1) - previous[0], 1)
+
+
+# --- 维护 ---
+
+def _aggregates():
+    return (
+        func.count(WeightRecord.id),
+        func.sum(WeightRecord.weight),
+        func.min(WeightRecord.weight),
+        func.max(WeightRecord.weight),
+    )
+
+
+def refresh_rollups(db: Session, user_id: int, dates: Iterable[date]) -> None:
+    """
+    重新计算这些日期所属周、月的汇总行，在调用方事务中执行，由调用方提交
+    聚合使用加锁读：读取最新已提交数据，并与同周期的并发写入串行化
+    """
+    db.flush()
+    periods = set()
+    for d in dates:
+        periods.add((PERIOD_WEEK, get_week_num(d)))
+        periods.add((PERIOD_MONTH, month_key(d)))
+    for period, key in sorted(periods):
+        if period == PERIOD_WEEK:
+            condition = WeightRecord.week_num == key
+        else:
+            start_date, end_date = month_range(int(key[:4]), int(key[4:]))
+            condition = WeightRecord.record_date.between(start_date, end_date)
+        count, total, min_weight, max_weight = db.query(*_aggregates()).filter(
+            WeightRecord.user_id == user_id, condition
+        ).with_for_update().one()
+        if not count:
+            db.query(WeightRollup).filter(
+                WeightRollup.user_id == user_id,
+                WeightRollup.period_type == period,
+                WeightRollup.period_key == key,
+            ).delete(synchronize_session=False)
+            continue
+        upsert(
+            db, WeightRollup,
+            [{
+                "user_id": user_id, "period_type": period, "period_key": key,
+                "record_count": count, "weight_sum": total, "min_weight": min_weight, "max_weight": max_weight,
+            }],
+            index_elements=("user_id", "period_type", "period_key"),
+            update_columns=("record_count", "weight_sum", "min_weight", "max_weight"),
+        )
+
+
+def rebuild_rollups(db: Session, user_id: Optional[int] = None) -> int:
+    """全量重建汇总表（初始化/数据迁移后执行），每种周期一条 INSERT ... SELECT，返回汇总行数"""
+    rollups = db.query(WeightRollup)
+    if user_id is not None:
+        rollups = rollups.filter(WeightRollup.user_id == user_id)
+    rollups.delete(synchronize_session=False)
+    columns = ["user_id", "period_type", "period_key", "record_count", "weight_sum", "min_weight", "max_weight"]
+    for period, key in ((PERIOD_WEEK, WeightRecord.week_num), (PERIOD_MONTH, month_key_column())):
+        source = select(WeightRecord.user_id, literal(period), key, *_aggregates()).group_by(WeightRecord.user_id, key)
+        if user_id is not None:
+            source = source.where(WeightRecord.user_id == user_id)
+        db.execute(insert(WeightRollup).from_select(columns, source))
+    db.commit()
+    return rollups.count()
+
+
+if __name__ == "__main__":
+    import argparse
+    from app.db import base  # noqa: F401  注册全部模型
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="重建体重周期汇总表")
+    parser.add_argument("--user-id", type=int, default=None, help="只重建指定用户，默认全部用户")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        print(f"已重建 {rebuild_rollups(session, args.user_id)} 条周期汇总")
+    finally:
+        session.close()
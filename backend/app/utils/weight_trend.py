@@ -0,0 +1,115 @@
+import math
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.cache import weight_trend_cache
+from app.models.weight import WeightRecord
+
+# 体重趋势（基于用户全部体重记录，按日期排序，每天至多一条）：
+# - 7 / 30 天移动平均：以记录日为终点的自然日窗口内已有记录的平均值（缺失的日期不补值）
+# - 指数平滑：按相隔天数衰减，间隔越久新记录权重越大
+# - 变化速率：最近 30 天记录的线性回归斜率（kg/周）
+# - 预计达成日期：按当前平滑体重与变化速率推算到达活跃目标的日期
+# 计算结果按用户缓存，本进程内的体重写入后失效
+
+MOVING_AVERAGE_WINDOWS = (7, 30)
+# 每间隔一天的平滑系数
+SMOOTHING_ALPHA = 0.1
+REGRESSION_DAYS = 30
+# 距离目标在该范围内视为已达成（kg）
+TARGET_TOLERANCE = 0.1
+# 超过该天数的推算没有参考意义，不返回
+MAX_PROJECTION_DAYS = 3650
+
+
+def _moving_averages(days: List[int], weights: List[float], window: int) -> List[float]:
+    # 前缀和 + 二分查找窗口起点，O(n log n)
+    day_arr = np.asarray(days)
+    sums = np.concatenate(([0.0], np.cumsum(weights)))
+    end = np.arange(1, len(days) + 1)
+    start = np.searchsorted(day_arr, day_arr - window + 1, side="left")
+    return ((sums[end] - sums[start]) / (end - start)).tolist()
+
+
+def _smooth(days: List[int], weights: List[float]) -> List[float]:
+    # 不等间隔的递推，逐条计算（O(n)）
+    result = []
+    value = weights[0]
+    previous = days[0]
+    for day, weight in zip(days, weights):
+        value += (1 - (1 - SMOOTHING_ALPHA) ** (day - previous)) * (weight - value)
+        previous = day
+        result.append(value)
+    return result
+
+
+def _slope(days: List[int], weights: List[float]) -> Optional[float]:
+    """最小二乘斜率（kg/天）；少于两个不同日期时返回 None"""
+    if len(days) < 2:
+        return None
+    x = np.asarray(days, dtype=float)
+    y = np.asarray(weights, dtype=float)
+    x -= x.mean()
+    return float((x * (y - y.mean())).sum() / (x * x).sum())
+
+
+def compute_trend(dates: List[date], weights: List[float]) -> Dict[str, Any]:
+    """根据按日期升序的记录计算趋势（不含目标推算）"""
+    if not dates:
+        return {"points": [], "rate_per_week": None, "last_date": None, "smoothed_weight": None}
+    first = dates[0]
+    days = [(d - first).days for d in dates]
+    averages = [_moving_averages(days, weights, window) for window in MOVING_AVERAGE_WINDOWS]
+    smoothed = _smooth(days, weights)
+
+    recent = bisect_left(days, days[-1] - REGRESSION_DAYS + 1)
+    slope = _slope(days[recent:], weights[recent:])
+
+    points = [
+        {
+            "record_date": d,
+            "weight": weight,
+            "ma7": round(ma7, 2),
+            "ma30": round(ma30, 2),
+            "smoothed": round(value, 2),
+        }
+        for d, weight, ma7, ma30, value in zip(dates, weights, *averages, smoothed)
+    ]
+    return {
+        "points": points,
+        "rate_per_week": round(slope * 7, 2) if slope is not None else None,
+        "last_date": dates[-1],
+        "smoothed_weight": round(smoothed[-1], 2),
+        "_slope": slope,
+    }
+
+
+def project_target_date(trend: Dict[str, Any], target_weight: float) -> Optional[date]:
+    """按当前平滑体重与回归斜率推算达成目标的日期；趋势背离目标或过于平缓时返回 None"""
+    current = trend["smoothed_weight"]
+    if current is None:
+        return None
+    remaining = target_weight - current
+    if abs(remaining) <= TARGET_TOLERANCE:
+        return trend["last_date"]
+    slope = trend["_slope"]
+    if not slope or remaining / slope <= 0:
+        return None
+    days = math.ceil(remaining / slope)
+    if days > MAX_PROJECTION_DAYS:
+        return None
+    return trend["last_date"] + timedelta(days=days)
+
+
+def get_trend(db: Session, user_id: int) -> Dict[str, Any]:
+    """读取（或计算并缓存）用户的体重趋势"""
+    trend = weight_trend_cache.get(user_id)
+    if trend is None:
+        rows = db.query(WeightRecord.record_date, WeightRecord.weight).filter(
+            WeightRecord.user_id == user_id
+        ).order_by(WeightRecord.record_date.asc()).all()
+        trend = compute_trend([d for d, _ in rows], [float(w) for _, w in rows])
+        weight_trend_cache.set(user_id, trend)
+    return trend
@@ -0,0 +1,89 @@
+"""
+列表接口序列化基准：FastAPI response_model 校验路径 vs 快速序列化路径
+
+运行（backend 目录下）：python -m benchmarks.list_serialization [行数] [轮数]
+"""
+import json
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Callable, List
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.db import base  # noqa: F401  注册全部模型
+from app.models.checkin import CheckinRecord
+from app.models.note import Note
+from app.models.weight import WeightRecord
+from app.schemas.checkin import CheckinRecordOut
+from app.schemas.note import NoteOut
+from app.schemas.weight import WeightOut
+from app.utils.fast_json import fast_response
+
+
+def make_notes(n: int) -> List[Note]:
+    now = datetime(2024, 1, 1, 8, 0, 0)
+    return [
+        Note(id=i, user_id=1, category_path="/notes/daily", title=f"笔记 {i}",
+             content="今天的记录内容。" * 40, content_type=0, is_delete=0,
+             create_time=now, update_time=now + timedelta(minutes=i))
+        for i in range(n)
+    ]
+
+
+def make_weights(n: int) -> List[WeightRecord]:
+    now = datetime(2024, 1, 1, 8, 0, 0)
+    return [
+        WeightRecord(id=i, user_id=1, weight=Decimal("70.5"), record_date=date(2020, 1, 1) + timedelta(days=i),
+                     week_num="202001", remark=None, create_time=now, update_time=now)
+        for i in range(n)
+    ]
+
+
+def make_checkins(n: int) -> List[CheckinRecord]:
+    now = datetime(2024, 1, 1, 8, 0, 0)
+    return [
+        CheckinRecord(id=i, user_id=1, item_id=i % 5, check_date=date(2020, 1, 1) + timedelta(days=i // 5),
+                      check_status=1, item_remark="完成", create_time=now, update_time=now)
+        for i in range(n)
+    ]
+
+
+def validated(schema, rows) -> bytes:
+    """FastAPI 默认路径：按 response_model 逐行校验（from_attributes），转 JSON 兼容对象后再编码"""
+    adapter = TypeAdapter(List[schema])
+    content = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    return JSONResponse(content).body
+
+
+def fast(schema, rows) -> bytes:
+    return fast_response(rows, schema).body
+
+
+def bench(label: str, func: Callable[[], bytes], rounds: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    elapsed = (time.perf_counter() - start) / rounds * 1000
+    print(f"  {label:<10} {elapsed:8.2f} ms")
+    return elapsed
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    for name, schema, data in (
+        ("notes", NoteOut, make_notes(rows)),
+        ("weight", WeightOut, make_weights(rows)),
+        ("checkin", CheckinRecordOut, make_checkins(rows)),
+    ):
+        assert json.loads(validated(schema, data)) == json.loads(fast(schema, data)), "两种路径输出不一致"
+        print(f"{name} ({rows} rows, {rounds} rounds)")
+        slow = bench("validated", lambda: validated(schema, data), rounds)
+        quick = bench("fast", lambda: fast(schema, data), rounds)
+        print(f"  speedup    {slow / quick:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
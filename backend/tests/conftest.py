@@ -0,0 +1,56 @@
+import itertools
+import os
+import tempfile
+
+# 测试使用临时 SQLite 数据库与上传目录（需在导入 app 之前设置）
+_tmp_dir = tempfile.mkdtemp(prefix="life-record-hub-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "upload")
+
+import pytest
+from fastapi.testclient import TestClient
+from app.core import security
+from app.db.base import Base
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.user import User
+
+Base.metadata.create_all(bind=engine)
+
+PASSWORD = "123456"
+_password_hash = security.get_password_hash(PASSWORD)
+_user_seq = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def user(db):
+    """每个用例一个新用户，数据按 user_id 互相隔离"""
+    obj = User(username=f"user{next(_user_seq)}", password=_password_hash, nickname="测试")
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+@pytest.fixture
+def auth_headers(client, user):
+    resp = client.post(
+        "/api/v1/login/access-token", data={"username": user.username, "password": PASSWORD}
+    )
+    assert resp.status_code == 200, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, FastAPI, Header, HTTPException
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.api.async_router import to_async_router
+
+
+class Item(BaseModel):
+    name: str
+    note: Optional[str] = None
+
+
+def require_token(x_token: str = Header(None)) -> None:
+    if x_token != "ok":
+        raise HTTPException(status_code=403)
+
+
+def _running_on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/item", response_model=Item, response_model_exclude_none=True, tags=["demo"],
+    dependencies=[Depends(require_token)],
+)
+def read_item():
+    return {"name": "a", "note": None, "on_loop": _running_on_event_loop()}
+
+
+@router.get("/loop")
+def read_loop():
+    return {"on_loop": _running_on_event_loop()}
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(to_async_router(router))
+    return TestClient(app)
+
+
+def test_route_options_are_copied():
+    client = _client()
+    assert client.get("/item").status_code == 403
+    resp = client.get("/item", headers={"X-Token": "ok"})
+    assert resp.json() == {"name": "a"}
+
+    route = next(r for r in to_async_router(router).routes if r.path == "/item")
+    assert route.tags == ["demo"]
+    assert route.response_model_exclude_none is True
+
+
+def test_sync_endpoint_without_db_runs_in_threadpool():
+    assert _client().get("/loop").json() == {"on_loop": False}
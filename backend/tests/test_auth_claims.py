@@ -0,0 +1,27 @@
+import pytest
+
+from app.api import deps
+from app.core.config import settings
+
+
+@pytest.fixture
+def claims_mode(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_CLAIMS_MODE", True)
+
+
+def test_claims_only_carry_immutable_identity(claims_mode, client, db, user, auth_headers):
+    token = auth_headers["Authorization"].split()[1]
+    payload = deps.decode_token(token)
+    assert payload.sub == user.id
+    assert payload.username == user.username
+    assert payload.ver == user.token_version
+
+    resp = client.put("/api/v1/users/me", headers=auth_headers, json={"nickname": "新昵称"})
+    assert resp.status_code == 200
+
+    # 修改资料后原令牌仍然有效，且读取到的是最新昵称
+    claims_user = deps.get_current_user_claims(db=db, token=token)
+    assert claims_user.id == user.id
+    assert claims_user.nickname is None
+    assert client.get("/api/v1/users/me", headers=auth_headers).json()["nickname"] == "新昵称"
+    assert client.get("/api/v1/todos/", headers=auth_headers).status_code == 200
@@ -0,0 +1,32 @@
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.models.checkin import CheckinRecord
+from app.schemas.checkin import CheckinRecordOut
+
+URL = "/api/v1/checkin"
+
+
+def test_history_matches_response_model(client, db, user, auth_headers):
+    item = client.post(f"{URL}/item/add", headers=auth_headers, json={"item_name": "跑步"}).json()
+    for day in ("2026-01-01", "2026-01-02", "2026-01-03"):
+        client.post(f"{URL}/record/save", headers=auth_headers, json={
+            "item_id": item["id"], "check_date": day, "check_status": 1, "item_remark": f"备注 {day}",
+        })
+
+    resp = client.get(f"{URL}/record/history", headers=auth_headers, params={"limit": 2})
+    assert resp.status_code == 200
+    assert resp.headers["x-next-cursor"]
+
+    rows = db.query(CheckinRecord).filter(CheckinRecord.user_id == user.id).order_by(
+        CheckinRecord.check_date.desc()
+    ).limit(2).all()
+    adapter = TypeAdapter(List[CheckinRecordOut])
+    expected = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    assert resp.json() == expected
+
+    resp = client.get(f"{URL}/record/history", headers=auth_headers, params={
+        "limit": 2, "cursor": resp.headers["x-next-cursor"],
+    })
+    assert [record["check_date"] for record in resp.json()] == ["2026-01-01"]
@@ -0,0 +1,59 @@
+import csv
+import io
+
+from app.models.note import Note
+from app.utils import csv_export
+from app.utils.csv_export import stream_csv
+
+
+def _rows(body: bytes):
+    text = body.decode("utf-8")
+    assert text.startswith("\ufeff")
+    return list(csv.reader(io.StringIO(text[1:])))
+
+
+def test_stream_csv_is_lazy_and_chunked(db, user, monkeypatch):
+    for i in range(50):
+        db.add(Note(user_id=user.id, title=f"笔记{i}", content="x" * 20))
+    db.commit()
+    monkeypatch.setattr(csv_export, "CHUNK_SIZE", 200)
+    monkeypatch.setattr(csv_export, "BATCH_SIZE", 7)
+    queries = []
+
+    def build_query(session):
+        queries.append(session)
+        return session.query(Note.title, Note.content).filter(Note.user_id == user.id).order_by(Note.id)
+
+    chunks = stream_csv(["标题", "内容"], build_query, user.id)
+    # 生成器在迭代时才查询（响应发送阶段），使用独立的只读 Session
+    assert queries == []
+    chunks = list(chunks)
+    assert len(queries) == 1 and queries[0].info["read_only"] is True
+    assert len(chunks) > 5
+    rows = _rows(b"".join(chunks))
+    assert rows[0] == ["标题", "内容"]
+    assert [row[0] for row in rows[1:]] == [f"笔记{i}" for i in range(50)]
+
+
+def test_export_endpoints(client, auth_headers):
+    client.post("/api/v1/notes/", headers=auth_headers, json={"title": "保留", "content": "a"})
+    deleted = client.post("/api/v1/notes/", headers=auth_headers, json={"title": "删除", "content": "b"}).json()
+    client.delete(f"/api/v1/notes/{deleted['id']}", headers=auth_headers)
+    client.post("/api/v1/todos/", headers=auth_headers, json={"title": "买牛奶"})
+    client.post("/api/v1/weight/record/add", headers=auth_headers, json={"record_date": "2026-03-02", "weight": 70.5})
+
+    resp = client.get("/api/v1/notes/export", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="notes_' in resp.headers["content-disposition"]
+    rows = _rows(resp.content)
+    assert rows[0][0] == "标题" and [row[0] for row in rows[1:]] == ["保留"]
+
+    rows = _rows(client.get("/api/v1/todos/export", headers=auth_headers).content)
+    assert [row[0] for row in rows[1:]] == ["买牛奶"]
+    rows = _rows(client.get("/api/v1/weight/record/export", headers=auth_headers).content)
+    assert rows[1][:2] == ["2026-03-02", "70.5"]
+    for path in ("/api/v1/checkin/record/export", "/api/v1/recipes/export"):
+        assert len(_rows(client.get(path, headers=auth_headers).content)) == 1
+
+    assert client.get("/api/v1/notes/export").status_code == 401
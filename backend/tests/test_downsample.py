@@ -0,0 +1,52 @@
+import math
+from datetime import date, timedelta
+
+from app.models.weight import WeightRecord
+from app.utils.downsample import lttb
+from app.utils.weight_stats import get_week_num
+
+
+def test_lttb_returns_all_points_under_threshold():
+    assert lttb([0, 1, 2], [1.0, 2.0, 3.0], 5) == [0, 1, 2]
+    assert lttb([0, 1, 2, 3], [1.0, 2.0, 3.0, 4.0], 2) == [0, 1, 2, 3]
+
+
+def test_lttb_keeps_endpoints_and_threshold():
+    n = 1000
+    xs = list(range(n))
+    ys = [math.sin(x / 50) for x in xs]
+    selected = lttb(xs, ys, 100)
+    assert len(selected) == 100
+    assert selected[0] == 0 and selected[-1] == n - 1
+    assert selected == sorted(set(selected))
+
+
+def test_lttb_keeps_spikes():
+    n = 500
+    xs = list(range(n))
+    ys = [70.0] * n
+    ys[137] = 80.0
+    ys[311] = 60.0
+    selected = lttb(xs, ys, 20)
+    assert 137 in selected and 311 in selected
+
+
+def test_series_endpoint_downsamples(client, db, user, auth_headers):
+    start = date(2025, 1, 1)
+    for i in range(200):
+        d = start + timedelta(days=i)
+        weight = 90.0 if i == 123 else 70.0 + (i % 7) * 0.1
+        db.add(WeightRecord(user_id=user.id, record_date=d, weight=weight, week_num=get_week_num(d)))
+    db.commit()
+
+    body = client.get("/api/v1/weight/record/series", headers=auth_headers, params={"points": 50}).json()
+    assert len(body) == 50
+    assert body[0]["record_date"] == "2025-01-01"
+    assert body[-1]["record_date"] == (start + timedelta(days=199)).isoformat()
+    assert {"record_date": (start + timedelta(days=123)).isoformat(), "weight": 90.0} in body
+
+    body = client.get(
+        "/api/v1/weight/record/series", headers=auth_headers,
+        params={"start_date": "2025-02-01", "end_date": "2025-02-10", "points": 50},
+    ).json()
+    assert [p["record_date"] for p in body] == [f"2025-02-{day:02d}" for day in range(1, 11)]
@@ -0,0 +1,61 @@
+import secrets
+
+import pytest
+
+from app.utils.file_response import IMMUTABLE_CACHE_CONTROL
+
+
+@pytest.fixture
+def upload(client, auth_headers):
+    # 每个用例上传不同内容，避免去重后共用同一文件
+    data = b"GIF89a" + secrets.token_bytes(100)
+    resp = client.post("/api/v1/images/upload", headers=auth_headers, files={"file": ("a.gif", data, "image/gif")})
+    assert resp.status_code == 200, resp.text
+    return resp.json()["url"], data
+
+
+def test_full_response_has_validators(client, upload):
+    url, data = upload
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert resp.content == data
+    assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.headers["etag"].startswith('"')
+    assert resp.headers["last-modified"]
+
+
+def test_conditional_requests(client, upload):
+    url, _ = upload
+    first = client.get(url)
+    etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_range_requests(client, upload):
+    url, data = upload
+    size = len(data)
+    resp = client.get(url, headers={"Range": "bytes=0-9"})
+    assert resp.status_code == 206
+    assert resp.content == data[:10]
+    assert resp.headers["content-range"] == f"bytes 0-9/{size}"
+
+    resp = client.get(url, headers={"Range": "bytes=-5"})
+    assert resp.status_code == 206 and resp.content == data[-5:]
+
+    resp = client.get(url, headers={"Range": f"bytes={size}-"})
+    assert resp.status_code == 416
+    assert resp.headers["content-range"] == f"bytes */{size}"
+
+    # 多段范围不支持，返回完整文件
+    resp = client.get(url, headers={"Range": "bytes=0-1,4-5"})
+    assert resp.status_code == 200 and resp.content == data
+
+    # If-Range 不匹配时忽略 Range
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag}).status_code == 206
+    resp = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert resp.status_code == 200 and resp.content == data
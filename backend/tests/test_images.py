@@ -0,0 +1,53 @@
+import io
+import secrets
+
+from PIL import Image
+
+from app.utils.file_response import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL
+
+
+def _png(width, height):
+    buffer = io.BytesIO()
+    # 随机颜色，避免与其它用例的上传内容去重
+    Image.new("RGB", (width, height), tuple(secrets.token_bytes(3))).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _upload(client, headers, filename, data, content_type):
+    resp = client.post("/api/v1/images/upload", headers=headers, files={"file": (filename, data, content_type)})
+    assert resp.status_code == 200, resp.text
+    return resp.json()["url"]
+
+
+def test_derivative_is_served_with_immutable_cache(client, auth_headers):
+    url = _upload(client, auth_headers, "a.png", _png(1000, 500), "image/png")
+
+    resp = client.get(url, params={"w": 100})
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    with Image.open(io.BytesIO(resp.content)) as image:
+        assert image.size == (160, 80)
+
+    resp = client.get(url)
+    assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    with Image.open(io.BytesIO(resp.content)) as image:
+        assert image.width == 1000
+
+
+def test_fallback_to_original_is_not_immutable(client, auth_headers):
+    original = b"GIF89a" + secrets.token_bytes(32)
+    url = _upload(client, auth_headers, "a.gif", original, "image/gif")
+
+    resp = client.get(url, params={"w": 160})
+    assert resp.status_code == 200
+    assert resp.content == original
+    assert resp.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+    # 仍可用 ETag 重新验证
+    resp = client.get(url, params={"w": 160}, headers={"If-None-Match": resp.headers["etag"]})
+    assert resp.status_code == 304
+
+    broken = _upload(client, auth_headers, "b.png", secrets.token_bytes(64), "image/png")
+    resp = client.get(broken, params={"w": 160})
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
@@ -0,0 +1,19 @@
+from app.core.config import settings
+
+URL = "/internal/stats"
+
+
+def test_internal_stats_disabled_by_default(client, monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_STATS_TOKEN", None)
+    assert client.get(URL).status_code == 404
+    assert client.get(URL, headers={"X-Internal-Token": ""}).status_code == 404
+
+
+def test_internal_stats_requires_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_STATS_TOKEN", "s3cret")
+    assert client.get(URL).status_code == 403
+    assert client.get(URL, headers={"X-Internal-Token": "wrong"}).status_code == 403
+
+    resp = client.get(URL, headers={"X-Internal-Token": "s3cret"})
+    assert resp.status_code == 200
+    assert set(resp.json()) == {"user_cache", "token_version_cache", "password_hash", "db_pool"}
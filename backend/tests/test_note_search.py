@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+
+from app.main import app
+from app.models.note import Note
+from app.utils import note_search
+from app.utils.note_search import NoteSearchIndex
+
+URL = "/api/v1/notes/"
+
+
+def test_fallback_search_pages_in_rank_order(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(note_search, "RANKED_BATCH_SIZE", 2)
+    ids = []
+    for i in range(6):
+        # 关键词出现次数越多相关度越高；奇数条放到另一个分类
+        resp = client.post(URL, headers=auth_headers, json={
+            "title": f"n{i}", "content": "牛奶 " * (i + 1), "category_path": "b" if i % 2 else "a",
+        })
+        ids.append(resp.json()["id"])
+
+    def page(**params):
+        resp = client.get(URL, headers=auth_headers, params={"keyword": "牛奶", **params})
+        return [note["id"] for note in resp.json()]
+
+    ranked = page(limit=10)
+    assert ranked == ids[::-1]
+    assert page(skip=1, limit=2) == ranked[1:3]
+    assert page(skip=4, limit=5) == ranked[4:]
+    assert page(skip=6, limit=5) == []
+    # 过滤条件在数据库执行，分页作用于过滤后的结果
+    assert page(category_path="a", skip=1, limit=1) == [ids[2]]
+    assert page(category_path="a", fields="id,title") == [ids[4], ids[2], ids[0]]
+
+
+def test_index_follows_writes_from_other_processes(db, user):
+    # 两个索引实例模拟两个 worker 进程
+    index, other = NoteSearchIndex(), NoteSearchIndex()
+    note = Note(user_id=user.id, title="苹果", content="内容")
+    db.add(note)
+    db.commit()
+    assert index.search(db, user.id, "苹果") == [note.id]
+    assert other.search(db, user.id, "苹果") == [note.id]
+
+    note.title = "香蕉"
+    db.commit()
+    assert index.search(db, user.id, "香蕉") == [note.id]
+    assert index.search(db, user.id, "苹果") == []
+
+    note.is_delete = 1
+    db.commit()
+    assert other.search(db, user.id, "香蕉") == []
+    # 词表随笔记一起移除
+    assert "香蕉" not in other._users[user.id]["postings"]
+
+    # 硬删除不会留下 update_time，由条数校验触发重建
+    fresh = Note(user_id=user.id, title="葡萄", content="内容")
+    db.add(fresh)
+    db.commit()
+    assert index.search(db, user.id, "葡萄") == [fresh.id]
+    db.delete(fresh)
+    db.commit()
+    assert index.search(db, user.id, "葡萄") == []
+
+
+def test_concurrent_keyword_searches_do_not_block(client, auth_headers):
+    for i in range(3):
+        client.post(URL, headers=auth_headers, json={"title": f"hello {i}", "content": "hello world"})
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            requests = [
+                http.get(URL, headers=auth_headers, params={"keyword": "hello"}) for _ in range(4)
+            ]
+            return await asyncio.wait_for(asyncio.gather(*requests), 20)
+
+    for resp in asyncio.run(run()):
+        assert resp.status_code == 200
+        assert len(resp.json()) == 3
@@ -0,0 +1,78 @@
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import text
+
+from app.models.todo import Todo
+from app.models.weight import WeightRecord
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, paginate
+
+
+def _page_through(fetch, limit, max_pages=50):
+    """按游标逐页读取直到没有下一页，返回全部 id"""
+    ids, cursor = [], None
+    for _ in range(max_pages):
+        rows, cursor = fetch(cursor, limit)
+        ids.extend(rows)
+        if not cursor:
+            return ids
+    pytest.fail("游标没有前进")
+
+
+def test_cursor_round_trip():
+    sort_keys = [(Todo.deadline, True), (WeightRecord.record_date, False), (Todo.id, True)]
+    values = [datetime(2026, 1, 2, 3, 4, 5), date(2026, 1, 2), 42]
+    assert decode_cursor(encode_cursor(values), sort_keys) == values
+    assert decode_cursor(encode_cursor([None, None, 1]), sort_keys) == [None, None, 1]
+
+
+@pytest.mark.parametrize("cursor", ["zz", encode_cursor([1]), encode_cursor(["not-a-date", 1])])
+def test_invalid_cursor(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, [(Todo.deadline, True), (Todo.id, True)])
+    assert exc.value.status_code == 400
+
+
+def test_notes_cursor_advances_over_tied_timestamps(client, db, user, auth_headers):
+    for i in range(7):
+        client.post("/api/v1/notes/", headers=auth_headers, json={"title": f"n{i}", "content": "c"})
+    # 与 server_default 写入的格式一致：所有行同一秒
+    db.execute(
+        text("UPDATE note SET update_time = '2026-10-17 19:40:38' WHERE user_id = :uid"), {"uid": user.id}
+    )
+    db.commit()
+
+    def fetch(cursor, limit):
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get("/api/v1/notes/", headers=auth_headers, params=params)
+        assert resp.status_code == 200, resp.text
+        return [note["id"] for note in resp.json()], resp.headers.get(NEXT_CURSOR_HEADER)
+
+    ids = _page_through(fetch, 3)
+    assert len(ids) == 7
+    assert ids == sorted(ids, reverse=True)
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_with_null_sort_values(db, user, descending):
+    deadlines = [None, datetime(2026, 1, 1, 8), None, datetime(2026, 1, 1, 8), datetime(2025, 5, 5), None]
+    for i, deadline in enumerate(deadlines):
+        db.add(Todo(user_id=user.id, title=f"t{i}", deadline=deadline))
+    db.commit()
+    sort_keys = [(Todo.deadline, descending), (Todo.id, False)]
+    query = db.query(Todo).filter(Todo.user_id == user.id)
+    expected = [todo.id for todo in paginate(query, sort_keys, Response(), None, 0, 100)]
+
+    def fetch(cursor, limit):
+        response = Response()
+        rows = paginate(query, sort_keys, response, cursor, 0, limit)
+        return [todo.id for todo in rows], response.headers.get(NEXT_CURSOR_HEADER)
+
+    for limit in (1, 2, 4):
+        assert _page_through(fetch, limit) == expected
+    # NULL 视为最小值
+    nulls = [todo.id for todo in db.query(Todo).filter(Todo.user_id == user.id, Todo.deadline.is_(None))]
+    assert (expected[:3] if not descending else expected[-3:]) == sorted(nulls)
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import threading
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.db.pool_stats import InstrumentedQueuePool, PoolStats, instrument_engine
+
+
+@pytest.fixture
+def engine_and_stats():
+    path = os.path.join(tempfile.mkdtemp(prefix="pool-"), "pool.db")
+    engine = create_engine(
+        f"sqlite:///{path}", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.1,
+    )
+    stats = PoolStats()
+    instrument_engine(engine, stats)
+    yield engine, stats
+    engine.dispose()
+
+
+def test_snapshot_reports_usage_and_timeouts(engine_and_stats):
+    engine, stats = engine_and_stats
+    first, second = engine.connect(), engine.connect()
+    snapshot = stats.snapshot()
+    assert snapshot["pool_size"] == 1 and snapshot["max_overflow"] == 1
+    assert snapshot["in_use"] == 2 and snapshot["overflow"] == 1
+    assert snapshot["checkouts"] == 2
+
+    # 池已满：等待 pool_timeout 后超时并计数
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    assert stats.snapshot()["timeouts"] == 1
+
+    # 等待其他请求归还连接：记录等待耗时
+    releaser = threading.Timer(0.05, first.close)
+    releaser.start()
+    third = engine.connect()
+    releaser.join()
+    assert stats.snapshot()["max_wait_ms"] >= 40
+
+    second.close()
+    third.close()
+    assert stats.snapshot()["in_use"] == 0
+
+
+def test_recreated_pool_keeps_stats(engine_and_stats):
+    engine, stats = engine_and_stats
+    engine.dispose()
+    with engine.connect():
+        snapshot = stats.snapshot()
+    assert stats.pool is engine.pool
+    assert snapshot["max_overflow"] == 1 and snapshot["in_use"] == 1
@@ -0,0 +1,29 @@
+import pytest
+
+from app.utils.recipe_ingredients import parse_ingredients
+
+
+@pytest.mark.parametrize("text, names", [
+    ("五花肉 500g、冰糖 30克", ["五花肉", "冰糖"]),
+    ("鸡蛋2个，番茄", ["鸡蛋", "番茄"]),
+    ("2个鸡蛋、3 tomatoes", ["鸡蛋", "tomatoes"]),
+    ("两片姜，半个洋葱；一把葱", ["姜", "洋葱", "葱"]),
+    ("500g 五花肉\n3g盐", ["五花肉", "盐"]),
+    ("2 cups of flour, 1.5 tbsp sugar, 3 lemons", ["flour", "sugar", "lemons"]),
+    # 数字开头但不带单位的中文名称保持不变
+    ("三文鱼 200g、五香粉", ["三文鱼", "五香粉"]),
+    ("200", []),
+])
+def test_parse_ingredients(text, names):
+    assert parse_ingredients(text) == names
+
+
+def test_quantity_first_recipe_matches_ingredient_search(client, auth_headers):
+    recipe = client.post("/api/v1/recipes/", headers=auth_headers, json={
+        "name": "番茄炒蛋", "category": "家常菜", "ingredients": "2个鸡蛋、3个番茄", "steps": "炒",
+    })
+    assert recipe.status_code == 200, recipe.text
+    resp = client.get("/api/v1/recipes/search/ingredients", headers=auth_headers, params={
+        "items": "鸡蛋,番茄", "match_all": True,
+    })
+    assert [item["recipe"]["id"] for item in resp.json()] == [recipe.json()["id"]]
@@ -0,0 +1,81 @@
+import itertools
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.routing import make_routing_session, sticky_users
+from app.models.todo import Todo
+
+_user_ids = itertools.count(100000)
+
+
+@pytest.fixture(scope="module")
+def session_factory():
+    tmp_dir = tempfile.mkdtemp(prefix="routing-")
+    primary = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'primary.db')}")
+    replica = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'replica.db')}")
+    for engine in (primary, replica):
+        Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(class_=make_routing_session(primary, replica))
+    yield factory, primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _session(factory, user_id, read_only):
+    session = factory()
+    session.info.update(read_only=read_only, user_id=user_id)
+    return session
+
+
+def _read_bind(factory, user_id):
+    session = _session(factory, user_id, True)
+    try:
+        return session.get_bind(clause=session.query(Todo).statement)
+    finally:
+        session.close()
+
+
+@pytest.mark.parametrize("write", [
+    lambda db, user_id: db.add(Todo(user_id=user_id, title="a")),
+    lambda db, user_id: db.query(Todo).filter(Todo.user_id == user_id).update({"title": "b"}),
+    lambda db, user_id: db.query(Todo).filter(Todo.user_id == user_id).delete(),
+    lambda db, user_id: db.execute(insert(Todo).values(user_id=user_id, title="c")),
+], ids=["flush", "query_update", "query_delete", "execute_insert"])
+def test_writes_make_later_reads_sticky(session_factory, write):
+    factory, primary, replica = session_factory
+    user_id = next(_user_ids)
+    assert _read_bind(factory, user_id) is replica
+
+    db = _session(factory, user_id, False)
+    write(db, user_id)
+    sticky_users.invalidate(user_id)
+    db.commit()
+    db.close()
+    # 提交时重新标记，之后的读请求走主库
+    assert _read_bind(factory, user_id) is primary
+
+
+def test_read_only_session_sends_writes_to_primary(session_factory):
+    factory, primary, replica = session_factory
+    user_id = next(_user_ids)
+    db = _session(factory, user_id, True)
+    try:
+        assert db.get_bind(clause=insert(Todo).values(user_id=user_id, title="x")) is primary
+    finally:
+        db.close()
+    assert _read_bind(factory, user_id) is replica
+
+
+def test_commit_without_writes_is_not_sticky(session_factory):
+    factory, primary, replica = session_factory
+    user_id = next(_user_ids)
+    db = _session(factory, user_id, False)
+    db.query(Todo).filter(Todo.user_id == user_id).all()
+    db.commit()
+    db.close()
+    assert _read_bind(factory, user_id) is replica
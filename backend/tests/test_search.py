@@ -0,0 +1,51 @@
+import logging
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.api.v1.endpoints import search
+from app.utils.query_timeout import statement_timeout
+
+# 约数秒的纯计算查询
+SLOW_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 100000000) SELECT count(*) FROM c"
+)
+
+
+def test_statement_timeout_interrupts_sqlite_query(db):
+    started = time.monotonic()
+    with pytest.raises(OperationalError, match="interrupted"):
+        with statement_timeout(db, 50):
+            db.execute(SLOW_QUERY).scalar()
+    assert time.monotonic() - started < 2
+    db.rollback()
+
+    # 离开上下文后不再限制
+    with statement_timeout(db, 50):
+        pass
+    assert db.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_search_reports_slow_and_failing_modules(client, auth_headers, monkeypatch, caplog):
+    def slow(db, user_id, keyword, limit):
+        db.execute(SLOW_QUERY).scalar()
+        return []
+
+    def broken(db, user_id, keyword, limit):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(search.SEARCHERS, "recipe", slow)
+    monkeypatch.setitem(search.SEARCHERS, "checkin", broken)
+    client.post("/api/v1/todos/", headers=auth_headers, json={"title": "买牛奶"})
+
+    with caplog.at_level(logging.WARNING, logger=search.__name__):
+        resp = client.get("/api/v1/search/", headers=auth_headers, params={"q": "牛奶", "budget_ms": 200})
+    body = resp.json()
+    assert body["partial"] is True
+    assert body["timed_out"] == ["recipe"]
+    assert body["failed"] == ["checkin"]
+    assert [hit["title"] for hit in body["items"]] == ["买牛奶"]
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("checkin" in m for m in messages) and any("recipe" in m for m in messages)
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from app.core import security
+from app.core.config import settings
+
+
+def test_hash_and_verify_in_process_pool():
+    async def run():
+        hashed = await security.get_password_hash_async("secret")
+        return hashed, await security.verify_password_async("secret", hashed), \
+            await security.verify_password_async("wrong", hashed)
+
+    hashed, ok, wrong = asyncio.run(run())
+    assert hashed != "secret" and security.verify_password("secret", hashed)
+    assert ok is True and wrong is False
+
+
+def test_hash_pool_is_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 2)
+    before = security.hash_pool_stats()
+
+    async def run():
+        in_flight = []
+
+        async def monitor():
+            while True:
+                in_flight.append(security.hash_pool_stats()["in_flight"])
+                await asyncio.sleep(0.01)
+
+        watcher = asyncio.create_task(monitor())
+        await asyncio.gather(*(security._run_in_hash_pool(time.sleep, 0.2) for _ in range(5)))
+        watcher.cancel()
+        return in_flight
+
+    in_flight = asyncio.run(run())
+    after = security.hash_pool_stats()
+    # 同时最多 PASSWORD_HASH_WORKERS 个任务在进程池中执行，其余排队
+    assert max(in_flight) == 2
+    assert after["max_waiting"] >= 3
+    assert after["completed"] - before["completed"] == 5
+    assert after["in_flight"] == 0 and after["waiting"] == 0
@@ -0,0 +1,88 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, text
+
+from app.models.todo import Todo
+
+URL = "/api/v1/todos/"
+
+
+def _todos(db, user_id, rows):
+    for title, status, category, priority in rows:
+        db.add(Todo(user_id=user_id, title=title, status=status, category_path=category, priority=priority))
+    db.commit()
+
+
+def test_page_and_counts(client, db, user, auth_headers):
+    _todos(db, user.id, [
+        ("a", 0, "工作", 2), ("b", 0, "工作", 1), ("c", 0, "生活", 3), ("d", 1, "工作", 2),
+    ])
+
+    body = client.get(URL, headers=auth_headers, params={"status": 0, "limit": 2}).json()
+    assert [t["title"] for t in body["items"]] == ["b", "a"]
+    assert body["total"] == 3
+    assert body["status_counts"] == {"0": 3, "1": 1}
+    assert body["category_counts"] == {"工作": 3, "生活": 1}
+
+    body = client.get(URL, headers=auth_headers, params={"status": 0, "skip": 2, "limit": 2}).json()
+    assert [t["title"] for t in body["items"]] == ["c"]
+
+    body = client.get(URL, headers=auth_headers, params={"category_path": "工作", "created_order": "desc"}).json()
+    assert [t["title"] for t in body["items"]] == ["d", "b", "a"]
+    assert body["total"] == 3
+
+
+def test_old_completed_todos_hidden_by_default(client, db, user, auth_headers):
+    _todos(db, user.id, [("recent", 1, None, 2), ("old", 1, None, 2), ("open", 0, None, 2)])
+    old = datetime.now() - timedelta(days=30)
+    db.execute(
+        text("UPDATE todo SET update_time = :t WHERE user_id = :u AND title = 'old'"),
+        {"t": old.strftime("%Y-%m-%d %H:%M:%S"), "u": user.id},
+    )
+    db.commit()
+
+    body = client.get(URL, headers=auth_headers).json()
+    assert sorted(t["title"] for t in body["items"]) == ["open", "recent"]
+    assert body["status_counts"] == {"0": 1, "1": 1}
+
+    body = client.get(URL, headers=auth_headers, params={"status": 1, "completed_within_days": 0}).json()
+    assert body["total"] == 2
+
+
+def test_etag(client, db, user, auth_headers):
+    _todos(db, user.id, [("a", 0, None, 2)])
+    db.execute(text("UPDATE todo SET update_time = '2026-01-01 00:00:00' WHERE user_id = :u"), {"u": user.id})
+    db.commit()
+
+    resp = client.get(URL, headers=auth_headers)
+    etag = resp.headers["etag"]
+    resp = client.get(URL, headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+
+    # 查询参数不同，版本不同
+    resp = client.get(URL, headers={**auth_headers, "If-None-Match": etag}, params={"limit": 10})
+    assert resp.status_code == 200
+
+
+@pytest.mark.parametrize("tz", ["Etc/GMT-14", "Etc/GMT+12"])
+def test_completed_window_uses_database_date(client, db, user, auth_headers, monkeypatch, tz):
+    _todos(db, user.id, [("inside", 1, None, 2), ("outside", 1, None, 2)])
+    boundary = datetime.combine(db.query(func.now()).scalar().date() - timedelta(days=7), datetime.min.time())
+    for title, moment in (("inside", boundary + timedelta(minutes=1)), ("outside", boundary - timedelta(minutes=1))):
+        db.execute(
+            text("UPDATE todo SET update_time = :t WHERE user_id = :u AND title = :title"),
+            {"t": moment.strftime("%Y-%m-%d %H:%M:%S"), "u": user.id, "title": title},
+        )
+    db.commit()
+
+    # 本地时区与数据库（SQLite 为 UTC）相差一天时，窗口边界仍按数据库日期计算
+    monkeypatch.setenv("TZ", tz)
+    time.tzset()
+    try:
+        body = client.get(URL, headers=auth_headers).json()
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert [t["title"] for t in body["items"]] == ["inside"]
@@ -0,0 +1,72 @@
+import asyncio
+import hashlib
+import io
+import os
+import secrets
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.api.v1.endpoints import images
+from app.core.config import settings
+from app.utils import uploads
+from app.utils.upload_store import objects_tmp_dir
+from app.utils.uploads import MULTIPART_OVERHEAD, stream_to_temp
+
+URL = "/api/v1/images/upload"
+MB = 1024 * 1024
+
+
+def _post(client, headers, data, content_type="image/gif"):
+    return client.post(URL, headers=headers, files={"file": ("a.gif", data, content_type)})
+
+
+def _temp_files():
+    directory = objects_tmp_dir()
+    return [name for name in os.listdir(directory) if name.endswith(".part")] if os.path.isdir(directory) else []
+
+
+def test_stream_to_temp_hashes_in_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "CHUNK_SIZE", 1000)
+    data = secrets.token_bytes(4500)
+    path, size, sha256 = asyncio.run(stream_to_temp(UploadFile(io.BytesIO(data)), str(tmp_path), len(data)))
+    assert size == len(data) and sha256 == hashlib.sha256(data).hexdigest()
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(stream_to_temp(UploadFile(io.BytesIO(data)), str(tmp_path), len(data) - 1))
+    assert error.value.status_code == 413
+    assert os.listdir(tmp_path) == [os.path.basename(path)]
+
+
+def test_upload_at_limit_is_accepted(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_SIZE_MB", 1)
+    data = b"GIF89a" + secrets.token_bytes(MB - 6)
+    resp = _post(client, auth_headers, data)
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["size"] == MB
+
+
+def test_oversized_body_is_rejected_while_streaming(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_SIZE_MB", 1)
+    # 超出上限但仍在 multipart 开销余量内：Content-Length 预检放行，由分块写入时拒绝
+    resp = _post(client, auth_headers, secrets.token_bytes(MB + 1))
+    assert resp.status_code == 413
+    assert _temp_files() == []
+
+
+def test_oversized_content_length_is_rejected_before_reading(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_SIZE_MB", 1)
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("请求体不应被读取")
+
+    monkeypatch.setattr(images, "stream_to_temp", unexpected)
+    resp = _post(client, auth_headers, secrets.token_bytes(MB + MULTIPART_OVERHEAD + 1))
+    assert resp.status_code == 413
+    assert resp.json()["detail"] == uploads.too_large_detail(MB)
+
+
+def test_non_image_is_rejected(client, auth_headers):
+    assert _post(client, auth_headers, b"hello", content_type="text/plain").status_code == 400
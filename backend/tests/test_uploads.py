@@ -0,0 +1,172 @@
+import io
+import os
+import secrets
+import time
+from datetime import datetime, timedelta
+
+from PIL import Image
+
+from app.models.upload import StoredObject, UserUpload
+from app.utils import upload_gc
+from app.utils.upload_gc import collect_garbage, recount_references
+from app.utils.upload_store import (
+    cached_upload_path, legacy_path, object_path, resolve_upload_path, update_references,
+)
+
+
+def _png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), tuple(secrets.token_bytes(3))).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _upload(client, headers, data=None):
+    resp = client.post(
+        "/api/v1/images/upload", headers=headers, files={"file": ("a.png", data or _png(), "image/png")}
+    )
+    assert resp.status_code == 200, resp.text
+    return resp.json()["url"]
+
+
+def _mapping(db, url):
+    db.expire_all()
+    user_id, filename = url.rsplit("/", 2)[-2:]
+    return db.query(UserUpload).filter(UserUpload.user_id == int(user_id), UserUpload.filename == filename).first()
+
+
+def _object_file(db, upload):
+    obj = db.query(StoredObject).filter(StoredObject.id == upload.object_id).one()
+    return object_path(obj.sha256, obj.ext)
+
+
+def test_recipe_image_change_and_delete_release_uploads(client, db, auth_headers):
+    first, second = _upload(client, auth_headers), _upload(client, auth_headers)
+    first_file = _object_file(db, _mapping(db, first))
+    recipe = client.post("/api/v1/recipes/", headers=auth_headers, json={
+        "name": "菜", "category": "家常", "ingredients": "蛋", "steps": "炒", "image_url": first,
+    }).json()
+    assert _mapping(db, first).ref_count == 1
+
+    client.put(f"/api/v1/recipes/{recipe['id']}", headers=auth_headers, json={"image_url": second})
+    assert _mapping(db, first) is None
+    assert not os.path.exists(first_file)
+    assert client.get(first).status_code == 404
+    assert _mapping(db, second).ref_count == 1
+
+    client.delete(f"/api/v1/recipes/{recipe['id']}", headers=auth_headers)
+    assert _mapping(db, second) is None
+
+
+def test_note_references_are_counted(client, db, auth_headers):
+    url = _upload(client, auth_headers)
+    content = f"![a]({url})\n![b]({url})"
+    note = client.post("/api/v1/notes/", headers=auth_headers, json={"title": "t", "content": content}).json()
+    assert _mapping(db, url).ref_count == 2
+
+    client.put(f"/api/v1/notes/{note['id']}", headers=auth_headers, json={"content": f"![a]({url})"})
+    assert _mapping(db, url).ref_count == 1
+    assert client.get(url).status_code == 200
+
+    client.delete(f"/api/v1/notes/{note['id']}", headers=auth_headers)
+    assert _mapping(db, url) is None
+
+
+def test_avatar_change_releases_old_avatar(client, db, auth_headers):
+    old, new = _upload(client, auth_headers), _upload(client, auth_headers)
+    client.put("/api/v1/users/me", headers=auth_headers, json={"avatar": old})
+    client.put("/api/v1/users/me", headers=auth_headers, json={"avatar": new})
+    assert _mapping(db, old) is None
+    assert _mapping(db, new).ref_count == 1
+
+
+def test_shared_content_is_kept_until_last_mapping(client, db, auth_headers):
+    data = _png()
+    first, second = _upload(client, auth_headers, data), _upload(client, auth_headers, data)
+    client.put("/api/v1/users/me", headers=auth_headers, json={"avatar": first})
+    client.put("/api/v1/users/me", headers=auth_headers, json={"avatar": second})
+    upload = _mapping(db, second)
+    assert _mapping(db, first) is None
+    assert os.path.exists(_object_file(db, upload))
+    assert client.get(second).content == data
+
+
+def test_rollback_restores_released_file(client, db, auth_headers):
+    url = _upload(client, auth_headers)
+    update_references(db, [], [url])
+    db.commit()
+    path = _object_file(db, _mapping(db, url))
+
+    update_references(db, [url], [])
+    assert not os.path.exists(path)
+    db.rollback()
+    assert os.path.exists(path)
+    assert _mapping(db, url).ref_count == 1
+
+
+def test_gc_releases_only_unreferenced_uploads(client, db, user, auth_headers):
+    kept, saved, dropped = (_upload(client, auth_headers) for _ in range(3))
+    client.put("/api/v1/users/me", headers=auth_headers, json={"avatar": saved})
+    # 直接写入、未经接口维护引用数的引用
+    client.post("/api/v1/notes/", headers=auth_headers, json={"title": "t", "content": f"![]({kept})"})
+    db.query(UserUpload).filter(UserUpload.user_id == user.id).update(
+        {UserUpload.ref_count: 0, UserUpload.create_time: datetime.now() - timedelta(days=2)},
+        synchronize_session=False,
+    )
+    db.commit()
+
+    assert recount_references(db) >= 2
+    assert _mapping(db, kept).ref_count == 1 and _mapping(db, saved).ref_count == 1
+    collect_garbage(db, grace_hours=1)
+    assert _mapping(db, dropped) is None
+    assert _mapping(db, kept) is not None and _mapping(db, saved) is not None
+
+
+def test_gc_skips_upload_relinked_after_scan(client, db, user, auth_headers, monkeypatch):
+    url = _upload(client, auth_headers)
+    db.query(UserUpload).filter(UserUpload.user_id == user.id).update(
+        {UserUpload.create_time: datetime.now() - timedelta(days=2)}, synchronize_session=False,
+    )
+    db.commit()
+    scan = upload_gc._candidate_uploads
+
+    def scan_then_relink(*args):
+        candidates = scan(*args)
+        # 扫描之后、释放之前，另一个请求保存了引用该图片的笔记
+        update_references(db, [], [f"![]({url})"])
+        db.commit()
+        return candidates
+
+    monkeypatch.setattr(upload_gc, "_candidate_uploads", scan_then_relink)
+    upload = _mapping(db, url)
+    path = _object_file(db, upload)
+    collect_garbage(db, grace_hours=1)
+    assert _mapping(db, url) is not None
+    assert os.path.exists(path)
+
+
+def test_gc_grace_period_uses_database_clock(client, db, user, auth_headers, monkeypatch):
+    url = _upload(client, auth_headers)
+    # 本地时区快于 UTC 时，宽限期不能因 SQLite 以 UTC 保存 create_time 而缩短
+    monkeypatch.setenv("TZ", "Asia/Shanghai")
+    time.tzset()
+    try:
+        collect_garbage(db, grace_hours=1)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert _mapping(db, url) is not None
+
+
+def test_unresolved_upload_path_is_not_cached(db, user):
+    # 从库尚未同步映射时查不到记录：不能把旧路径（不存在）缓存下来
+    assert resolve_upload_path(db, user.id, "missing.png") == legacy_path(user.id, "missing.png")
+    assert cached_upload_path(user.id, "missing.png") is None
+
+
+def test_duplicate_upload_keeps_object_etag(client, auth_headers):
+    data = _png()
+    first = _upload(client, auth_headers, data)
+    etag = client.get(first).headers["etag"]
+    second = _upload(client, auth_headers, data)
+    assert client.get(second).headers["etag"] == etag
+    assert client.get(first, headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+
+from app.models.weight import WeightRecord
+from app.utils import weight_import
+from app.utils.weight_stats import PERIOD_MONTH, period_stats
+
+IMPORT_URL = "/api/v1/weight/record/import"
+
+
+def _import(client, headers, content, encoding="utf-8-sig"):
+    data = content.encode(encoding) if isinstance(content, str) else content
+    return client.post(IMPORT_URL, headers=headers, files={"file": ("weight.csv", data, "text/csv")})
+
+
+def _weights(db, user_id):
+    return {
+        r.record_date: (float(r.weight), r.remark)
+        for r in db.query(WeightRecord).filter(WeightRecord.user_id == user_id)
+    }
+
+
+def test_import_reports_row_errors_with_line_numbers(client, db, user, auth_headers):
+    content = (
+        "日期,体重(kg),备注\n"
+        "2026-03-01,70.5,早\n"
+        "2026/03/02,71\n"
+        "03-03-2026,70\n"        # 第 4 行：日期格式错误
+        "2026-03-04,abc\n"       # 第 5 行：体重不是数字
+        "\n"
+        "2026-03-05,250\n"       # 第 7 行：超出范围
+        "2026-03-01,70.2,覆盖\n"  # 文件内重复日期以最后一行为准
+    )
+    resp = _import(client, auth_headers, content)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["imported"] == 2
+    assert body["failed"] == 3
+    assert [e["line"] for e in body["errors"]] == [4, 5, 7]
+    assert body["errors"][0]["error"].startswith("日期格式错误")
+    assert body["errors"][1]["error"].startswith("体重(kg)：")
+
+    assert _weights(db, user.id) == {date(2026, 3, 1): (70.2, "覆盖"), date(2026, 3, 2): (71.0, None)}
+    assert period_stats(db, user.id, PERIOD_MONTH, ["202603"])["202603"][3] == 2
+
+
+def test_import_overwrites_existing_dates(client, db, user, auth_headers):
+    client.post("/api/v1/weight/record/add", headers=auth_headers, json={"record_date": "2026-03-01", "weight": 75.0})
+    resp = _import(client, auth_headers, "日期,体重(kg)\n2026-03-01,74.0\n2026-03-02,73.5\n")
+    assert resp.json()["imported"] == 2
+    assert _weights(db, user.id) == {date(2026, 3, 1): (74.0, None), date(2026, 3, 2): (73.5, None)}
+
+    body = client.get("/api/v1/weight/record/month", headers=auth_headers, params={"year": 2026, "month": 3}).json()
+    assert body["avg_weight"] == 73.8
+
+
+def test_import_writes_in_batches(client, db, user, auth_headers, monkeypatch):
+    monkeypatch.setattr(weight_import, "IMPORT_BATCH_SIZE", 3)
+    rows = "".join(f"2026-01-{day:02d},{60 + day}\n" for day in range(1, 11))
+    resp = _import(client, auth_headers, "日期,体重(kg)\n" + rows)
+    assert resp.json() == {"imported": 10, "failed": 0, "errors": []}
+    assert len(_weights(db, user.id)) == 10
+
+
+@pytest.mark.parametrize("content,detail", [
+    ("date,weight\n2026-03-01,70\n", "表头"),
+    ("日期,体重(kg)\n2026-03-01,70,备注\n".encode("gbk"), "UTF-8"),
+])
+def test_import_rejects_malformed_files(client, db, user, auth_headers, content, detail):
+    resp = _import(client, auth_headers, content)
+    assert resp.status_code == 400
+    assert detail in resp.json()["detail"]
+    assert _weights(db, user.id) == {}
+
+
+def test_export_round_trip(client, db, user, auth_headers):
+    for d, weight, remark in (("2026-03-01", 70.5, "早, 空腹"), ("2026-03-02", 71.0, None)):
+        client.post(
+            "/api/v1/weight/record/add", headers=auth_headers,
+            json={"record_date": d, "weight": weight, "remark": remark},
+        )
+    exported = client.get("/api/v1/weight/record/export", headers=auth_headers).content
+    expected = _weights(db, user.id)
+
+    db.query(WeightRecord).filter(WeightRecord.user_id == user.id).delete()
+    db.commit()
+    resp = _import(client, auth_headers, exported)
+    assert resp.json()["imported"] == 2
+    assert _weights(db, user.id) == expected
@@ -0,0 +1,45 @@
+import pytest
+
+URL = "/api/v1/weight/record"
+
+# ISO 周年与自然年不一致：2025-12-29 属 2026 年第 1 周，2027-01-01 属 2026 年第 53 周
+RECORDS = (("2025-12-29", 70.0), ("2026-01-05", 71.0), ("2026-01-07", 72.0), ("2027-01-01", 69.0))
+
+
+@pytest.fixture
+def records(client, auth_headers):
+    for record_date, weight in RECORDS:
+        resp = client.post(f"{URL}/add", headers=auth_headers, json={"record_date": record_date, "weight": weight})
+        assert resp.status_code == 200, resp.text
+
+
+def _range(client, headers, **params):
+    resp = client.get(f"{URL}/range", headers=headers, params=params)
+    assert resp.status_code == 200, resp.text
+    return [(p["period"], p["avg_weight"], p["min_weight"], p["max_weight"], p["count"]) for p in resp.json()]
+
+
+def test_year_range_by_iso_week_and_month(client, auth_headers, records):
+    assert _range(client, auth_headers, year=2026, period="week") == [
+        ("202601", 70.0, 70.0, 70.0, 1),
+        ("202602", 71.5, 71.0, 72.0, 2),
+        ("202653", 69.0, 69.0, 69.0, 1),
+    ]
+    assert _range(client, auth_headers, year=2026, period="month") == [("202601", 71.5, 71.0, 72.0, 2)]
+    assert _range(client, auth_headers, year=2025, period="month") == [("202512", 70.0, 70.0, 70.0, 1)]
+    assert client.get(f"{URL}/range", headers=auth_headers, params={"year": 2026, "period": "day"}).status_code == 422
+
+
+def test_period_views_compare_with_previous_period(client, auth_headers, records):
+    week = client.get(f"{URL}/week", headers=auth_headers, params={"week_num": "202602"}).json()
+    assert (week["avg_weight"], week["min_weight"], week["max_weight"]) == (71.5, 71.0, 72.0)
+    assert week["diff_last_week"] == 1.5
+
+    # 1 月与上一年 12 月比较
+    month = client.get(f"{URL}/month", headers=auth_headers, params={"year": 2026, "month": 1}).json()
+    assert [r["record_date"] for r in month["records"]] == ["2026-01-05", "2026-01-07"]
+    assert month["avg_weight"] == 71.5 and month["diff_last_week"] == 1.5
+
+    # 上一周期没有记录时差值为 0
+    first = client.get(f"{URL}/week", headers=auth_headers, params={"week_num": "202601"}).json()
+    assert first["diff_last_week"] == 0.0
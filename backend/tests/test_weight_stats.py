@@ -0,0 +1,109 @@
+from datetime import date
+
+import pytest
+
+from app.models.weight import WeightRecord, WeightRollup
+from app.utils.weight_stats import (
+    PERIOD_MONTH, PERIOD_WEEK, get_week_num, period_stats, rebuild_rollups, refresh_rollups, stat_from_weights,
+)
+
+# 2026-03-02 为周一：02、04 同属 202610 周，09 属 202611 周，均在 202603 月
+WEEK = "202610"
+NEXT_WEEK = "202611"
+
+
+def _add(db, user_id, d, weight):
+    db.add(WeightRecord(user_id=user_id, record_date=d, weight=weight, week_num=get_week_num(d)))
+
+
+def _rollups(db, user_id):
+    return {
+        (r.period_type, r.period_key): (r.record_count, float(r.weight_sum), float(r.min_weight), float(r.max_weight))
+        for r in db.query(WeightRollup).filter(WeightRollup.user_id == user_id)
+    }
+
+
+def test_refresh_rollups_upserts_and_removes_periods(db, user):
+    _add(db, user.id, date(2026, 3, 2), 70.0)
+    _add(db, user.id, date(2026, 3, 4), 71.0)
+    refresh_rollups(db, user.id, [date(2026, 3, 2), date(2026, 3, 4)])
+    db.commit()
+    assert _rollups(db, user.id) == {
+        (PERIOD_WEEK, WEEK): (2, 141.0, 70.0, 71.0),
+        (PERIOD_MONTH, "202603"): (2, 141.0, 70.0, 71.0),
+    }
+
+    # 已有汇总行被覆盖，新周期插入
+    _add(db, user.id, date(2026, 3, 9), 69.0)
+    record = db.query(WeightRecord).filter_by(user_id=user.id, record_date=date(2026, 3, 2)).one()
+    record.weight = 72.0
+    refresh_rollups(db, user.id, [date(2026, 3, 2), date(2026, 3, 9)])
+    db.commit()
+    assert _rollups(db, user.id) == {
+        (PERIOD_WEEK, WEEK): (2, 143.0, 71.0, 72.0),
+        (PERIOD_WEEK, NEXT_WEEK): (1, 69.0, 69.0, 69.0),
+        (PERIOD_MONTH, "202603"): (3, 212.0, 69.0, 72.0),
+    }
+
+    # 周期内记录全部删除后汇总行随之删除
+    db.query(WeightRecord).filter_by(user_id=user.id, record_date=date(2026, 3, 9)).delete()
+    refresh_rollups(db, user.id, [date(2026, 3, 9)])
+    db.commit()
+    assert (PERIOD_WEEK, NEXT_WEEK) not in _rollups(db, user.id)
+    assert period_stats(db, user.id, PERIOD_MONTH, ["202603"])["202603"] == (71.5, 71.0, 72.0, 2)
+
+
+def test_rebuild_rollups_matches_incremental(db, user):
+    for day, weight in ((2, 70.0), (4, 71.0), (9, 69.0)):
+        _add(db, user.id, date(2026, 3, day), weight)
+    refresh_rollups(db, user.id, [date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 9)])
+    db.commit()
+    expected = _rollups(db, user.id)
+
+    db.query(WeightRollup).filter(WeightRollup.user_id == user.id).delete()
+    db.commit()
+    assert rebuild_rollups(db, user.id) == 3
+    assert _rollups(db, user.id) == expected
+
+
+def test_stat_from_weights():
+    assert stat_from_weights([]) is None
+    assert stat_from_weights([70.0, 72.0, 71.0]) == (71.0, 70.0, 72.0, 3)
+
+
+def test_api_writes_keep_rollups_in_sync(client, db, user, auth_headers):
+    for day, weight in ((2, 70.0), (4, 71.0)):
+        resp = client.post(
+            "/api/v1/weight/record/add", headers=auth_headers,
+            json={"record_date": f"2026-03-0{day}", "weight": weight},
+        )
+        assert resp.status_code == 200, resp.text
+    record_id = resp.json()["id"]
+    client.put(f"/api/v1/weight/record/update/{record_id}", headers=auth_headers, json={"weight": 73.0})
+
+    resp = client.get("/api/v1/weight/record/week", headers=auth_headers, params={"week_num": WEEK})
+    assert resp.json()["avg_weight"] == 71.5
+    assert (resp.json()["min_weight"], resp.json()["max_weight"]) == (70.0, 73.0)
+
+    client.delete(f"/api/v1/weight/record/delete/{record_id}", headers=auth_headers)
+    resp = client.get("/api/v1/weight/record/range", headers=auth_headers, params={"year": 2026, "period": "month"})
+    assert resp.json() == [
+        {"period": "202603", "avg_weight": 70.0, "min_weight": 70.0, "max_weight": 70.0, "count": 1}
+    ]
+
+
+@pytest.mark.parametrize("path,params", [
+    ("/api/v1/weight/record/week", {"week_num": WEEK}),
+    ("/api/v1/weight/record/month", {"year": 2026, "month": 3}),
+])
+def test_period_view_without_rollup_rows(client, db, user, auth_headers, path, params):
+    # 汇总行缺失（尚未重建 / 刷新失败 / 副本滞后）时由记录计算，而不是 500
+    _add(db, user.id, date(2026, 3, 2), 70.0)
+    _add(db, user.id, date(2026, 3, 4), 71.0)
+    db.commit()
+
+    resp = client.get(path, headers=auth_headers, params=params)
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert (body["avg_weight"], body["min_weight"], body["max_weight"]) == (70.5, 70.0, 71.0)
+    assert body["diff_last_week"] == 0.0
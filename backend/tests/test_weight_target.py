@@ -0,0 +1,25 @@
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.api.v1.endpoints import weight
+
+URL = "/api/v1/weight/target/set"
+
+
+def test_set_target_replaces_active_target(client, auth_headers):
+    first = client.post(URL, headers=auth_headers, json={"target_weight": 60}).json()
+    second = client.post(URL, headers=auth_headers, json={"target_weight": 58}).json()
+    assert second["is_active"] == 1 and second["id"] != first["id"]
+    assert client.get("/api/v1/weight/target/get", headers=auth_headers).json()["id"] == second["id"]
+
+
+def test_set_target_failure_is_logged(client, auth_headers, monkeypatch, caplog):
+    def broken_refresh(self, instance, *args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(Session, "refresh", broken_refresh)
+    with caplog.at_level(logging.ERROR, logger=weight.__name__):
+        resp = client.post(URL, headers=auth_headers, json={"target_weight": 60})
+    assert resp.status_code == 500
+    assert any(record.exc_info for record in caplog.records)
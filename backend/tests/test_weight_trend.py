@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.utils.weight_trend import compute_trend, project_target_date
+
+DATES = [date(2026, 1, 1), date(2026, 1, 2), date(2026, 1, 3), date(2026, 1, 10)]
+WEIGHTS = [80.0, 79.0, 78.0, 77.0]
+
+
+def test_moving_averages_use_calendar_windows():
+    points = compute_trend(DATES, WEIGHTS)["points"]
+    # 1-10 的 7 天窗口（1-4 ~ 1-10）内只有当天一条记录
+    assert [p["ma7"] for p in points] == pytest.approx([80.0, 79.5, 79.0, 77.0])
+    assert [p["ma30"] for p in points] == pytest.approx([80.0, 79.5, 79.0, 78.5])
+
+
+def test_smoothing_decays_by_gap():
+    trend = compute_trend(DATES, WEIGHTS)
+    # 相隔 7 天的记录权重为 1 - 0.9^7
+    expected_last = 79.71 + (1 - 0.9 ** 7) * (77.0 - 79.71)
+    assert [p["smoothed"] for p in trend["points"]] == pytest.approx([80.0, 79.9, 79.71, round(expected_last, 2)])
+    assert trend["smoothed_weight"] == pytest.approx(78.3)
+
+
+def test_rate_uses_recent_regression_window():
+    trend = compute_trend(DATES, WEIGHTS)
+    # 斜率 -14 / 50 = -0.28 kg/天
+    assert trend["rate_per_week"] == pytest.approx(-1.96)
+
+    # 30 天之前的记录不参与回归
+    old = [date(2025, 10, 1)]
+    trend = compute_trend(old + DATES, [60.0] + WEIGHTS)
+    assert trend["rate_per_week"] == pytest.approx(-1.96)
+
+
+def test_empty_and_single_record():
+    assert compute_trend([], [])["points"] == []
+    trend = compute_trend([date(2026, 1, 1)], [70.0])
+    assert trend["rate_per_week"] is None
+    assert project_target_date(trend, 65.0) is None
+
+
+def test_project_target_date():
+    trend = compute_trend(DATES, WEIGHTS)
+    # (75 - 78.3) / -0.28 = 11.8 天，向上取整
+    assert project_target_date(trend, 75.0) == DATES[-1] + timedelta(days=12)
+    # 趋势背离目标
+    assert project_target_date(trend, 85.0) is None
+    # 已在目标范围内
+    assert project_target_date(trend, 78.35) == DATES[-1]
+    # 趋势过于平缓（-0.001 kg/天，需 10000 天）
+    flat = compute_trend(DATES[:2], [80.0, 79.999])
+    assert project_target_date(flat, 70.0) is None
+
+
+def test_trend_endpoint(client, auth_headers):
+    for d, weight in zip(DATES, WEIGHTS):
+        client.post(
+            "/api/v1/weight/record/add", headers=auth_headers,
+            json={"record_date": d.isoformat(), "weight": weight},
+        )
+    client.post("/api/v1/weight/target/set", headers=auth_headers, json={"target_weight": 75.0})
+
+    body = client.get("/api/v1/weight/stat/trend", headers=auth_headers).json()
+    assert len(body["points"]) == 4
+    assert body["rate_per_week"] == pytest.approx(-1.96)
+    assert body["target_weight"] == 75.0
+    assert body["projected_date"] == (DATES[-1] + timedelta(days=12)).isoformat()
+
+    # 写入后缓存失效，趋势包含新记录
+    client.post("/api/v1/weight/record/add", headers=auth_headers, json={"record_date": "2026-01-11", "weight": 76.5})
+    body = client.get("/api/v1/weight/stat/trend", headers=auth_headers).json()
+    assert len(body["points"]) == 5
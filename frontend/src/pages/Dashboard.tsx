@@ -27,6 +27,7 @@ const Dashboard: React.FC = () => {
     const [stats, setStats] = useState({
         notes: [],
         todos: [],
+        todoTotal: 0,
         recipes: [],
         checkinProgress: 0,
         checkinStats: { completed: 0, total: 0 },
@@ -45,7 +46,7 @@ const Dashboard: React.FC = () => {
         try {
             const [notes, todos, dailyCheckinData, weightRecords, recipes]: any = await Promise.all([
                 getNotes({ limit: 3 }),
-                getTodos({ status: 0 }),
+                getTodos({ status: 0, limit: 3 }),
                 getDailyCheckin(dayjs().format('YYYY-MM-DD')),
                 getWeightRecords({ limit: 5 }),
                 getRecipes({ limit: 3 })
@@ -57,7 +58,8 @@ const Dashboard: React.FC = () => {
 
             setStats({
                 notes: notes,
-                todos: todos.slice(0, 3),
+                todos: todos.items,
+                todoTotal: todos.total,
                 recipes: recipes,
                 checkinProgress: totalCheckin > 0 ? Math.round((completedCheckin / totalCheckin) * 100) : 0,
                 checkinStats: { completed: completedCheckin, total: totalCheckin },
@@ -107,7 +109,7 @@ const Dashboard: React.FC = () => {
                     <Card hoverable className="rounded-2xl">
                         <Statistic
                             title="待办事项"
-                            value={stats.todos.length}
+                            value={stats.todoTotal}
                             suffix="项待办"
                             valueStyle={{ color: '#faad14' }}
                             prefix={<ArrowRightOutlined />}
@@ -18,6 +18,9 @@ const { Title, Paragraph, Text } = Typography;
 
 const categories = ["全部", "素菜系列", "荤菜系列", "汤羹系列", "面食系列", "早餐系列"];
 
+// 本站上传的图片在列表卡片中使用缩略尺寸
+const cardImageUrl = (url: string) => (url.includes("/images/file/") ? `${url}?w=480` : url);
+
 const RecipeList: React.FC = () => {
   const { primaryColor, theme } = useTheme();
   const { message: messageApi, modal } = App.useApp();
@@ -257,7 +260,7 @@ const RecipeList: React.FC = () => {
                     </div>
                     <img
                       alt={item.name}
-                      src={item.image_url || "https://images.unsplash.com/photo-1495521821757-a1efb6729352?q=80&w=500&auto=format&fit=crop"}
+                      src={item.image_url ? cardImageUrl(item.image_url) : "https://images.unsplash.com/photo-1495521821757-a1efb6729352?q=80&w=500&auto=format&fit=crop"}
                     />
                   </div>
                 }
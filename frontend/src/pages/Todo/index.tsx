@@ -69,6 +69,11 @@ const priorityMap: any = {
     3: { label: '较低', color: '#bfbfbf' },
 };
 
+/**
+ * 每页加载的待办条数
+ */
+const PAGE_SIZE = 50;
+
 /**
  * 侧边栏筛选类型
  */
@@ -82,7 +87,10 @@ const TodoList: React.FC = () => {
     const { primaryColor } = useTheme();
     // 状态：数据与界面
     const [todos, setTodos] = useState<any[]>([]);
+    const [total, setTotal] = useState(0);
+    const [pendingCount, setPendingCount] = useState(0);
     const [loading, setLoading] = useState(false);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [isModalOpen, setIsModalOpen] = useState(false);
     const [isDrawerOpen, setIsDrawerOpen] = useState(false);
     const [selectedTodo, setSelectedTodo] = useState<any>(null);
@@ -116,52 +124,72 @@ const TodoList: React.FC = () => {
     };
 
     /**
-     * 根据筛选与搜索拉取待办数据
+     * 根据筛选与搜索生成查询参数（排序由服务端完成，保证分页结果一致）
+     */
+    const buildParams = useCallback(() => {
+        const params: any = { q: searchQuery, created_order: sortDesc ? 'desc' : 'asc' };
+
+        switch (activeFilter) {
+            case 'todo':
+                params.status = 0;
+                break;
+            case 'priority':
+                params.status = 0;
+                params.priority = 1;
+                break;
+            case 'starred':
+                params.is_starred = 1;
+                break;
+            case 'done':
+                params.status = 1;
+                // 已处理列表显示全部历史（默认只保留最近 7 天完成的）
+                params.completed_within_days = 0;
+                break;
+            case 'later':
+                // Just a placeholder filter
+                break;
+            default:
+                break;
+        }
+
+        if (headerPriority) {
+            params.priority = headerPriority;
+        }
+        if (starOnly) {
+            params.is_starred = 1;
+        }
+
+        return params;
+    }, [activeFilter, searchQuery, headerPriority, sortDesc, starOnly]);
+
+    /**
+     * 拉取第一页待办数据
      */
     const fetchData = useCallback(async () => {
         setLoading(true);
         try {
-            const params: any = { q: searchQuery };
-
-            switch (activeFilter) {
-                case 'todo':
-                    params.status = 0;
-                    break;
-                case 'priority':
-                    params.status = 0;
-                    params.priority = 1;
-                    break;
-                case 'starred':
-                    params.is_starred = 1;
-                    break;
-                case 'done':
-                    params.status = 1;
-                    break;
-                case 'later':
-                    // Just a placeholder filter
-                    break;
-                default:
-                    break;
-            }
-
-            if (headerPriority) {
-                params.priority = headerPriority;
-            }
-            if (starOnly) {
-                params.is_starred = 1;
-            }
-
-            const data: any = await getTodos(params);
-            const sorted = [...data].sort((a, b) => {
-                const av = dayjs(a.create_time).valueOf();
-                const bv = dayjs(b.create_time).valueOf();
-                return sortDesc ? bv - av : av - bv;
-            });
-            setTodos(sorted);
+            const data: any = await getTodos({ ...buildParams(), skip: 0, limit: PAGE_SIZE });
+            setTodos(data.items);
+            setTotal(data.total);
+            setPendingCount(data.status_counts?.[0] || 0);
         } finally {
             setLoading(false);
         }
-    }, [activeFilter, searchQuery, headerPriority, sortDesc, starOnly]);
+    }, [buildParams]);
+
+    /**
+     * 加载下一页并追加到列表
+     */
+    const loadMore = async () => {
+        setLoadingMore(true);
+        try {
+            const data: any = await getTodos({ ...buildParams(), skip: todos.length, limit: PAGE_SIZE });
+            setTodos(prev => [...prev, ...data.items]);
+            setTotal(data.total);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
 
     /**
      * 初始化用户信息
@@ -287,8 +315,8 @@ const TodoList: React.FC = () => {
                             <span className={styles.icon}>{menu.icon}</span>
                             <span>{menu.label}</span>
                         </div>
-                        {menu.key === 'todo' && todos.length > 0 && activeFilter === 'todo' && (
-                            <span className={styles.count}>{todos.length}</span>
+                        {menu.key === 'todo' && pendingCount > 0 && activeFilter === 'todo' && (
+                            <span className={styles.count}>{pendingCount}</span>
                         )}
                     </div>
                 ))}
@@ -309,8 +337,8 @@ const TodoList: React.FC = () => {
                     <div className="flex justify-between items-center mb-4">
                         <div className={styles.titleWrapper}>
                             <div className={styles.title}>{getFilterTitle()}</div>
-                            {activeFilter === 'todo' && todos.length > 0 && (
-                                <span className={styles.cornerBadge}>{todos.length}</span>
+                            {activeFilter === 'todo' && pendingCount > 0 && (
+                                <span className={styles.cornerBadge}>{pendingCount}</span>
                             )}
                         </div>
                         <Space size={16}>
@@ -427,9 +455,17 @@ const TodoList: React.FC = () => {
                             <Empty description="暂无待办事项" image={Empty.PRESENTED_IMAGE_SIMPLE} />
                         </div>
                     )}
-                    <div className="text-center py-4 text-gray-400 text-xs">
-                        - 已展示全部待办 -
-                    </div>
+                    {!loading && todos.length < total ? (
+                        <div className="text-center py-4">
+                            <Button type="link" loading={loadingMore} onClick={loadMore}>
+                                加载更多（{todos.length}/{total}）
+                            </Button>
+                        </div>
+                    ) : (
+                        <div className="text-center py-4 text-gray-400 text-xs">
+                            - 已展示全部待办 -
+                        </div>
+                    )}
                 </div>
             </div>
 
@@ -66,3 +66,10 @@ export const getCheckinHistory = (params: {
 }) => {
   return api.get("/checkin/record/history", { params });
 };
+
+/**
+ * 导出打卡记录 (返回 Blob)
+ */
+export const exportCheckinRecords = () => {
+  return api.get("/checkin/record/export", { responseType: "blob" });
+};
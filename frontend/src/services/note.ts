@@ -19,3 +19,7 @@ export const updateNote = (id: number, data: any) => {
 export const deleteNote = (id: number) => {
   return api.delete(`/notes/${id}`);
 };
+
+export const exportNotes = () => {
+  return api.get("/notes/export", { responseType: "blob" });
+};
@@ -20,3 +20,7 @@ export const updateRecipe = (id: number, data: any) => {
 export const deleteRecipe = (id: number) => {
   return api.delete(`/recipes/${id}`);
 };
+
+export const exportRecipes = () => {
+  return api.get("/recipes/export", { responseType: "blob" });
+};
@@ -0,0 +1,5 @@
+import api from "./api";
+
+export const searchAll = (params: { q: string; types?: string; limit_per_type?: number; budget_ms?: number }) => {
+  return api.get("/search/", { params });
+};
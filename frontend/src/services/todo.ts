@@ -1,6 +1,19 @@
 import api from "./api";
 
-export const getTodos = (params?: { category_path?: string; status?: number; is_starred?: number; priority?: number; q?: string }) => {
+/**
+ * 分页获取待办，返回 { items, total, status_counts, category_counts }
+ */
+export const getTodos = (params?: {
+  category_path?: string;
+  status?: number;
+  is_starred?: number;
+  priority?: number;
+  q?: string;
+  skip?: number;
+  limit?: number;
+  completed_within_days?: number;
+  created_order?: "asc" | "desc";
+}) => {
   return api.get("/todos/", { params });
 };
 
@@ -15,3 +28,7 @@ export const updateTodo = (id: number, data: any) => {
 export const deleteTodo = (id: number) => {
   return api.delete(`/todos/${id}`);
 };
+
+export const exportTodos = () => {
+  return api.get("/todos/export", { responseType: "blob" });
+};
@@ -34,6 +34,28 @@ export const getMonthlyWeight = (year: number, month: number) => {
   return api.get("/weight/record/month", { params: { year, month } });
 };
 
+/**
+ * 获取全年按周或按月的体重统计序列
+ * @param period week=按周 (YYYYWW), month=按月 (YYYYMM)
+ */
+export const getWeightRange = (year: number, period: "week" | "month" = "week") => {
+  return api.get("/weight/record/range", { params: { year, period } });
+};
+
+/**
+ * 获取日期范围内的体重曲线（服务端降采样，默认最多 500 个点）
+ */
+export const getWeightSeries = (params?: { start_date?: string; end_date?: string; points?: number }) => {
+  return api.get("/weight/record/series", { params });
+};
+
+/**
+ * 获取体重趋势（移动平均、指数平滑、变化速率、目标达成日期推算）
+ */
+export const getWeightTrend = () => {
+  return api.get("/weight/stat/trend");
+};
+
 /**
  * 新增体重记录
  */
@@ -102,6 +124,15 @@ export const exportWeightRecords = () => {
   return api.get("/weight/record/export", { responseType: "blob" });
 };
 
+/**
+ * 批量导入体重记录 (CSV，格式与导出一致)
+ */
+export const importWeightRecords = (file: File) => {
+  const formData = new FormData();
+  formData.append("file", file);
+  return api.post("/weight/record/import", formData);
+};
+
 // 兼容旧接口 (Dashboard 可能在使用)
 export const getWeightRecords = (params?: { 
   start_date?: string; 